@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from scipy.optimize import linear_sum_assignment
+
+# Asignación de jugadores a las posiciones del once (posible 11, campo de demarcaciones).
+# Se construye una matriz jugador x posición con los minutos que cada jugador ha jugado en
+# demarcaciones de esa posición (y, con mucho menos peso, en demarcaciones para las que la posición
+# es una alternativa) y se resuelve como un problema de asignación: cada posición recibe como mucho
+# un jugador y cada jugador como mucho una posición, maximizando los minutos. Sustituye al reparto
+# voraz por orden de minutos, que dejaba posiciones vacías o ponía dos jugadores en la misma.
+
+# Un minuto en una posición alternativa vale PESO_ALTERNATIVA minutos en la posición natural: la
+# alternativa solo se usa para cubrir huecos, nunca para desplazar a un jugador de su posición
+PESO_ALTERNATIVA = 1e-3
+
+# Cada aparición suma un mínimo para que un jugador sin minutos registrados siga siendo candidato
+_PESO_APARICION = 1e-6
+
+def matriz_compatibilidad(posiciones_base, posiciones, alternativas=None):
+    """Peso de jugar en cada posición base (filas) para cubrir cada posición del once (columnas)"""
+    alternativas = alternativas or {}
+    columnas = {posicion: j for j, posicion in enumerate(posiciones)}
+    compatibilidad = np.zeros((len(posiciones_base), len(posiciones)))
+    for i, base in enumerate(posiciones_base):
+        for alternativa in alternativas.get(base, []):
+            if alternativa in columnas:
+                compatibilidad[i, columnas[alternativa]] = PESO_ALTERNATIVA
+        if base in columnas:
+            compatibilidad[i, columnas[base]] = 1.0
+    return compatibilidad
+
+def matriz_puntuaciones(filas, posiciones, demarcacion_a_posicion, alternativas=None,
+                        posicion_defecto=None, clave='Id Jugador', grupos=()):
+    """
+    Puntuación de cada jugador para cada posición a partir de su histórico de demarcaciones
+
+    Args:
+        filas: Filas de partido con clave, 'Demarcacion' y 'Minutos jugados'
+        posiciones: Posiciones del once (columnas de la matriz)
+        demarcacion_a_posicion: Demarcación -> posición base
+        alternativas: Posición base -> posiciones que también puede cubrir
+        posicion_defecto: Posición base de las demarcaciones sin mapear
+        grupos: Columnas adicionales de agrupación (por ejemplo 'Equipo' para varios equipos)
+
+    Returns:
+        DataFrame indexado por (grupos..., clave) con una columna por posición
+    """
+    claves = [*grupos, clave]
+    base = filas['Demarcacion'].map(demarcacion_a_posicion)
+    if posicion_defecto is not None:
+        base = base.fillna(posicion_defecto)
+    if 'Minutos jugados' in filas.columns:
+        minutos = pd.to_numeric(filas['Minutos jugados'], errors='coerce').fillna(0).clip(lower=0)
+    else:
+        minutos = pd.Series(0.0, index=filas.index)
+
+    por_base = (
+        pd.DataFrame({**{c: filas[c] for c in claves}, 'Base': base, 'Peso': minutos + _PESO_APARICION})
+        .groupby([*claves, 'Base'], sort=False)['Peso'].sum()
+        .unstack('Base', fill_value=0.0)
+    )
+    compatibilidad = matriz_compatibilidad(list(por_base.columns), posiciones, alternativas)
+    return pd.DataFrame(por_base.to_numpy() @ compatibilidad, index=por_base.index, columns=list(posiciones))
+
+def asignar_posiciones(puntuaciones):
+    """
+    Resuelve la asignación jugador -> posición que maximiza la puntuación total
+
+    Returns:
+        dict: posición -> jugador (índice de 'puntuaciones'), en el orden de las columnas;
+              las posiciones sin ningún jugador compatible quedan fuera
+    """
+    if puntuaciones.empty:
+        return {}
+    matriz = puntuaciones.to_numpy()
+    filas, columnas = linear_sum_assignment(matriz, maximize=True)
+    asignadas = {columnas[k]: puntuaciones.index[filas[k]] for k in range(len(filas)) if matriz[filas[k], columnas[k]] > 0}
+    return {puntuaciones.columns[j]: asignadas[j] for j in sorted(asignadas)}
+
+def asignar_posiciones_grupos(puntuaciones, nivel='Equipo'):
+    """asignar_posiciones() para cada valor de 'nivel' (un once por equipo en una sola pasada)"""
+    return {
+        grupo: asignar_posiciones(bloque.droplevel(nivel))
+        for grupo, bloque in puntuaciones.groupby(level=nivel, sort=False)
+    }
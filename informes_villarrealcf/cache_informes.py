@@ -0,0 +1,144 @@
+"""
+Caché de informes renderizados.
+
+La clave de cada informe combina: id del informe, versión de su código (hash del fuente del
+módulo y de los módulos compartidos), parámetros y hash de las filas del parquet que el informe
+lee (alcance 'datos' del registro). Si nada de eso cambia, se devuelve el PDF/PNG ya generado sin
+agregar ni renderizar; si cambian los datos de ese equipo/jornadas, la clave cambia sola.
+
+Uso:
+    from cache_informes import generar_informe_cacheado
+    ruta, en_cache = generar_informe_cacheado('minutos', 'Sevilla FC', [33, 34, 35])
+"""
+import hashlib
+import importlib.util
+import json
+import os
+import time
+
+import pandas as pd
+
+from datos_compartidos import cargar_datos_limpios, normalize_jornada, ultimas_jornadas
+from registro_informes import INFORMES, ejecutar_informe, guardar_figura
+
+DIRECTORIO_INFORMES = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(DIRECTORIO_INFORMES, 'cache_informes')
+
+# Código del que dependen todos los informes; un cambio aquí invalida toda la caché
+MODULOS_COMUNES = ['datos_compartidos', 'registro_informes', 'cache_informes', 'registro_assets', 'plantilla_campo',
+                   'tabla_lote', 'ciclo_figuras', 'asignacion_once', 'plan_agregaciones']
+
+_VERSIONES = {}
+
+def _hash_fuente(modulo):
+    spec = importlib.util.find_spec(modulo)
+    with open(spec.origin, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def version_codigo(informe_id):
+    """Hash del código del informe y de los módulos comunes (calculado una vez por proceso)"""
+    if informe_id not in _VERSIONES:
+        h = hashlib.sha256()
+        for modulo in [INFORMES[informe_id]['modulo']] + MODULOS_COMUNES:
+            h.update(_hash_fuente(modulo).encode('utf-8'))
+        _VERSIONES[informe_id] = h.hexdigest()
+    return _VERSIONES[informe_id]
+
+def filas_del_informe(df, informe_id, equipo, jornadas):
+    """Filtra las filas del DataFrame que el informe puede leer según su alcance 'datos'"""
+    alcance_equipos, alcance_jornadas = INFORMES[informe_id]['datos']
+
+    es_villarreal = df['Equipo'].str.contains('Villarreal', case=False, na=False)
+    if alcance_equipos == 'equipo':
+        mask = df['Equipo'] == equipo
+    elif alcance_equipos == 'villarreal':
+        mask = es_villarreal
+    elif alcance_equipos == 'equipo_y_villarreal':
+        mask = (df['Equipo'] == equipo) | es_villarreal
+    else:
+        mask = pd.Series(True, index=df.index)
+
+    if alcance_jornadas == 'seleccion':
+        mask &= df['Jornada'].isin([normalize_jornada(j) for j in jornadas])
+
+    return df[mask]
+
+def huella_datos(df):
+    """Hash del contenido (columnas y valores) de un DataFrame"""
+    h = hashlib.sha256()
+    h.update(json.dumps([str(c) for c in df.columns]).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+def clave_informe(informe_id, equipo, jornadas, jornada_referencia=None, tipo_partido=None, formato='pdf'):
+    """Clave de caché: (informe, versión de código, parámetros, hash del trozo de datos)"""
+    if INFORMES[informe_id]['firma'] == 'jornadas':
+        equipo = None
+    if jornada_referencia is None and jornadas:
+        jornada_referencia = max(jornadas)
+
+    df = cargar_datos_limpios()
+    filas = filas_del_informe(df, informe_id, equipo, jornadas)
+
+    contenido = {
+        'informe': informe_id,
+        'version': version_codigo(informe_id),
+        'parametros': {
+            'equipo': equipo,
+            'jornadas': sorted(jornadas),
+            'jornada_referencia': jornada_referencia,
+            'tipo_partido': tipo_partido,
+            'formato': formato,
+        },
+        'datos': huella_datos(filas),
+    }
+    if 'ventana_liga' in INFORMES[informe_id]:
+        contenido['parametros']['ventana_liga'] = [
+            str(j) for j in ultimas_jornadas(df, jornada_referencia, INFORMES[informe_id]['ventana_liga'])]
+    return hashlib.sha256(json.dumps(contenido, sort_keys=True).encode('utf-8')).hexdigest()[:32]
+
+def generar_informe_cacheado(informe_id, equipo, jornadas, jornada_referencia=None, tipo_partido=None,
+                             formato='pdf'):
+    """
+    Devuelve la ruta del informe renderizado, generándolo solo si no está en caché
+
+    Returns:
+        tuple: (ruta del archivo o None si no hay datos, True si venía de la caché)
+    """
+    from ciclo_figuras import liberar_figura
+
+    clave = clave_informe(informe_id, equipo, jornadas, jornada_referencia, tipo_partido, formato)
+    ruta = os.path.join(CACHE_DIR, f"{informe_id}_{clave}.{formato}")
+    if os.path.exists(ruta):
+        os.utime(ruta)  # Marca de último uso para purgar_cache
+        return ruta, True
+
+    fig = ejecutar_informe(informe_id, equipo, jornadas, jornada_referencia, tipo_partido,
+                           mostrar=False, guardar=False)
+    if fig is None:
+        return None, False
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    ruta_tmp = f"{ruta}.{os.getpid()}.tmp"
+    try:
+        guardar_figura(fig, informe_id, ruta_tmp, formato)
+        os.replace(ruta_tmp, ruta)
+    finally:
+        liberar_figura(fig)
+        if os.path.exists(ruta_tmp):
+            os.remove(ruta_tmp)
+
+    return ruta, False
+
+def purgar_cache(dias=30):
+    """Borra las entradas no usadas en los últimos 'dias' días y devuelve cuántas se borraron"""
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+    limite = time.time() - dias * 86400
+    borradas = 0
+    for nombre in os.listdir(CACHE_DIR):
+        ruta = os.path.join(CACHE_DIR, nombre)
+        if os.path.getmtime(ruta) < limite:
+            os.remove(ruta)
+            borradas += 1
+    return borradas
@@ -0,0 +1,119 @@
+import gc
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Ciclo de vida de las figuras de los informes.
+# plt.figure() registra cada figura en el gestor global de pyplot hasta que alguien llama a
+# plt.close(), así que un proceso que genera muchos informes (lote, paquete, render en memoria)
+# acumulaba figuras de hasta 32x18 pulgadas con todos sus escudos. Cuando el informe no se va a
+# mostrar en pantalla, las figuras se crean con la API orientada a objetos (Figure + lienzo Agg),
+# fuera de pyplot: no dependen del backend del proceso y se liberan en cuanto se suelta la
+# referencia. liberar_figura() además vacía la figura tras guardarla.
+_SIN_PANTALLA = False
+
+@contextmanager
+def figuras_sin_pantalla(activo=True):
+    """Mientras está activo, nueva_figura() crea figuras Agg que no pasan por pyplot"""
+    global _SIN_PANTALLA
+    anterior = _SIN_PANTALLA
+    _SIN_PANTALLA = activo
+    try:
+        yield
+    finally:
+        _SIN_PANTALLA = anterior
+
+def nueva_figura(**kwargs):
+    """plt.figure(**kwargs), o Figure con lienzo Agg dentro de figuras_sin_pantalla()"""
+    if not _SIN_PANTALLA:
+        return plt.figure(**kwargs)
+    fig = Figure(**kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+def nueva_figura_ejes(figsize):
+    """Equivalente a plt.subplots(figsize=figsize) con nueva_figura()"""
+    fig = nueva_figura(figsize=figsize)
+    return fig, fig.add_subplot()
+
+def liberar_figura(fig):
+    """Cierra la figura (si está en pyplot) y suelta sus ejes, artistas e imágenes"""
+    if fig is None:
+        return
+    plt.close(fig)
+    fig.clear()
+
+def memoria_rss_mb():
+    """Memoria residente actual del proceso en MB (pico si el sistema no expone la actual)"""
+    try:
+        with open('/proc/self/statm') as statm:
+            paginas = int(statm.read().split()[1])
+        return paginas * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+def diagnostico_memoria(informe_id, equipo, jornadas, jornada_referencia=None, tipo_partido=None,
+                        repeticiones=500, calentamiento=10, tolerancia_mb=50, formato='pdf'):
+    """
+    Genera el mismo informe muchas veces en este proceso y comprueba que la RSS no crece
+
+    Las primeras 'calentamiento' repeticiones llenan las cachés del proceso (datos, escudos,
+    plantillas de campo, fuentes); a partir de ahí la memoria debe quedarse plana.
+
+    Returns:
+        dict: RSS inicial/final en MB, crecimiento, muestras (repetición, MB) y 'ok'
+    """
+    from registro_informes import renderizar_informe
+
+    if repeticiones < 1:
+        raise ValueError("repeticiones debe ser al menos 1")
+
+    def generar():
+        if renderizar_informe(informe_id, equipo, jornadas, jornada_referencia, tipo_partido,
+                              formato=formato) is None:
+            raise ValueError('Sin datos para la selección')
+
+    for _ in range(calentamiento):
+        generar()
+    gc.collect()
+    rss_inicial = memoria_rss_mb()
+    if rss_inicial is None:
+        print("⚠️ No se puede medir la memoria del proceso en este sistema")
+        return None
+
+    print(f"🔄 {informe_id}: {repeticiones} informes en un proceso (RSS inicial {rss_inicial:.0f} MB)")
+    muestras = []
+    inicio = time.perf_counter()
+    for i in range(1, repeticiones + 1):
+        generar()
+        if i % 50 == 0 or i == repeticiones:
+            gc.collect()
+            rss = memoria_rss_mb()
+            muestras.append((i, rss))
+            print(f"  [{i}/{repeticiones}] RSS {rss:.0f} MB ({rss - rss_inicial:+.0f} MB)")
+
+    rss_final = muestras[-1][1]
+    crecimiento = rss_final - rss_inicial
+    ok = crecimiento <= tolerancia_mb
+    estado = '✅' if ok else '❌'
+    print(f"{estado} Crecimiento de memoria: {crecimiento:+.0f} MB (tolerancia {tolerancia_mb} MB) "
+          f"en {time.perf_counter() - inicio:.0f}s")
+    return {
+        'rss_inicial_mb': rss_inicial,
+        'rss_final_mb': rss_final,
+        'crecimiento_mb': crecimiento,
+        'muestras': muestras,
+        'ok': ok,
+    }
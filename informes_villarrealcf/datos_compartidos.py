@@ -0,0 +1,496 @@
+import os
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+# Datos compartidos por todos los informes físicos de un mismo proceso.
+# El DataFrame se carga y limpia una sola vez por archivo (se recarga si cambia en disco);
+# los informes lo tratan como de solo lectura y trabajan sobre .copy() de sus filtros.
+# Al limpiar se materializan también las columnas de partido (equipos, goles, local/visitante y
+# rival de cada fila), para no parsear el texto de 'Partido' en cada informe.
+# Sobre el DataFrame limpio se construye una vez el índice de partidos por equipo (ordenados por
+# jornada, con su condición local/visitante) para responder "últimos N partidos hasta la jornada J"
+# con una búsqueda binaria en lugar de filtrar, deduplicar y ordenar en cada informe.
+# Igual se materializa la tabla de percentiles de la liga (por ventana de jornadas, demarcación y
+# métrica: valores ordenados, cortes y media) con la que se colorean y clasifican los jugadores
+# respecto a la liga sin recorrer el DataFrame en cada informe. Una temporada = un archivo de datos.
+# Los informes de distancias y sprints construyen sus gráficos desde una matriz densa jugador x
+# jornada x métrica hecha con una sola pivot_table (matriz_jugador_jornada), en vez de filtrar
+# el DataFrame agrupado por cada jugador y cada jornada.
+_DATOS = {}
+_INDICES = {}
+
+EQUIPOS_CONOCIDOS = {
+    'sevillafc': 'Sevilla FC',
+    'getafecf': 'Getafe CF', 
+    'gironafc': 'Girona FC',
+    'villarrealcf': 'Villarreal CF',
+    'realmadrid': 'Real Madrid',
+    'fcbarcelona': 'FC Barcelona',
+    'athleticclub': 'Athletic Club',
+    'atleticodemadrid': 'Atlético de Madrid',
+    'realbetis': 'Real Betis',
+    'realsociedad': 'Real Sociedad',
+    'valenciacf': 'Valencia CF',
+    'rcelta': 'RC Celta',
+    'caosasuna': 'CA Osasuna',
+    'rayovallecano': 'Rayo Vallecano',
+    'udlaspalmas': 'UD Las Palmas',
+    'rcdespanyol': 'RCD Espanyol',
+    'deportivoalaves': 'Deportivo Alavés',
+    'cdleganes': 'CD Leganés',
+    'realvalladolidcf': 'Real Valladolid CF',
+    'rcdmallorca': 'RCD Mallorca'
+}
+
+PERCENTILES_COLOR = [20, 40, 60, 80]
+MAX_VENTANAS_PERCENTILES = 32
+
+COLUMNAS_PARTIDO = ['Equipo Local', 'Goles Local', 'Goles Visitante', 'Equipo Visitante']
+
+# Métricas de las matrices jugador x jornada (clave de los informes -> columna de los datos)
+COLUMNAS_DISTANCIAS = {
+    'total': 'Distancia Total',
+    '14_21': 'Distancia Total 14-21 km / h',
+    '21_24': 'Distancia Total  21-24 km / h',
+    'mas_24': 'Distancia Total >24 km / h',
+}
+COLUMNAS_SPRINTS = {
+    'sprints_21': 'N Total Sprints >21 km / h',
+    'sprints_21_24': 'N Total Sprints 21-24 km / h',
+    'sprints_24': 'N Total Sprints >24 km / h',
+    'sprints_21_1p': 'N Total Sprints >21 km / h 1P',
+    'sprints_21_2p': 'N Total Sprints >21 km / h 2P',
+    'sprints_24_1p': 'N Total Sprints >24 km / h 1P',
+    'sprints_24_2p': 'N Total Sprints >24 km / h 2P',
+}
+
+def _huella_archivo(ruta):
+    st = os.stat(ruta)
+    return (os.path.abspath(ruta), st.st_mtime_ns, st.st_size)
+
+def similarity(a, b):
+    """Calcula la similitud entre dos strings"""
+    return SequenceMatcher(None, a.lower(), b.lower()).ratio()
+
+def mapear_equipos_similares(equipos):
+    """Agrupa nombres de equipo con más de un 70% de similitud bajo el nombre más largo"""
+    team_mapping = {}
+    processed_teams = set()
+
+    for team in equipos:
+        if team in processed_teams:
+            continue
+
+        similar_teams = [team]
+        for other_team in equipos:
+            if other_team != team and other_team not in processed_teams:
+                if similarity(team, other_team) > 0.7:
+                    similar_teams.append(other_team)
+
+        canonical_name = max(similar_teams, key=len)
+        for similar_team in similar_teams:
+            team_mapping[similar_team] = canonical_name
+            processed_teams.add(similar_team)
+
+    return team_mapping
+
+def normalize_jornada(jornada):
+    """'J1' / 'j1' -> 1; el resto se deja igual"""
+    if isinstance(jornada, str) and jornada.startswith(('J', 'j')):
+        try:
+            return int(jornada[1:])
+        except ValueError:
+            return jornada
+    return jornada
+
+def limpiar_nombre_equipo(nombre_raw):
+    """'sevillafc' -> 'Sevilla FC' (equipos conocidos; si no, se reconstruye el nombre)"""
+    nombre_lower = nombre_raw.lower().strip()
+    
+    if nombre_lower in EQUIPOS_CONOCIDOS:
+        return EQUIPOS_CONOCIDOS[nombre_lower]
+    
+    for key, value in EQUIPOS_CONOCIDOS.items():
+        if key in nombre_lower or nombre_lower in key:
+            return value
+    
+    return nombre_raw.replace('fc', ' FC').replace('cf', ' CF').title()
+
+def condicion_partido(equipo, equipo_local, equipo_visitante):
+    """'local', 'visitante' o 'desconocido' según a qué equipo del partido se parece más 'equipo'"""
+    if pd.isna(equipo) or pd.isna(equipo_local) or pd.isna(equipo_visitante):
+        return 'desconocido'
+    sim_local = similarity(equipo, equipo_local)
+    sim_visitante = similarity(equipo, equipo_visitante)
+    if sim_local > sim_visitante:
+        return 'local'
+    elif sim_visitante > sim_local:
+        return 'visitante'
+    return 'desconocido'
+
+def partes_partido(partidos):
+    """
+    Separa textos de partido 'sevillafc2-1realbetis' en equipos limpios y goles (vectorizado)
+
+    Returns:
+        DataFrame indexado por partido con COLUMNAS_PARTIDO; equipos NaN si el texto no tiene
+        exactamente un '-' y goles NaN si no aparecen
+    """
+    partidos = pd.Series(pd.unique(pd.Series(partidos).dropna()), dtype=object)
+    partes = partidos.str.split('-')
+    valido = partes.str.len() == 2
+    local = partes.str[0].str.strip().where(valido)
+    visitante = partes.str[1].str.strip().where(valido)
+
+    goles_local = local.str.extract(r'^(.+?)(\d+)$')
+    goles_visitante = visitante.str.extract(r'^(\d+)(.+)$')
+    local_raw = goles_local[0].fillna(local)
+    visitante_raw = goles_visitante[1].fillna(visitante)
+
+    # Cada nombre distinto se limpia una sola vez
+    nombres = pd.unique(pd.concat([local_raw, visitante_raw]).dropna())
+    limpios = {nombre: limpiar_nombre_equipo(nombre) for nombre in nombres}
+
+    resultado = pd.DataFrame({
+        'Equipo Local': local_raw.map(limpios),
+        'Goles Local': pd.to_numeric(goles_local[1]).astype('Int64'),
+        'Goles Visitante': pd.to_numeric(goles_visitante[0]).astype('Int64'),
+        'Equipo Visitante': visitante_raw.map(limpios),
+    })
+    resultado.index = pd.Index(partidos, name='Partido')
+    return resultado
+
+def materializar_partidos(df):
+    """
+    Añade a cada fila los datos de su partido desde el punto de vista de su equipo
+
+    Columnas: COLUMNAS_PARTIDO, 'Condicion' ('local', 'visitante' o 'desconocido'), 'Es Local'
+    y 'Rival'. La similitud equipo/local/visitante se calcula una vez por (equipo, partido).
+    """
+    info = partes_partido(df['Partido'])
+    for columna in COLUMNAS_PARTIDO:
+        df[columna] = df['Partido'].map(info[columna])
+
+    pares = df[['Equipo', 'Partido', 'Equipo Local', 'Equipo Visitante']].drop_duplicates(['Equipo', 'Partido'])
+    condiciones = [condicion_partido(equipo, local, visitante) for equipo, local, visitante in
+                   zip(pares['Equipo'], pares['Equipo Local'], pares['Equipo Visitante'])]
+    condicion = pd.Series(condiciones, index=pd.MultiIndex.from_frame(pares[['Equipo', 'Partido']]))
+
+    df['Condicion'] = condicion.reindex(pd.MultiIndex.from_frame(df[['Equipo', 'Partido']])).to_numpy()
+    df['Es Local'] = df['Condicion'] == 'local'
+    df['Rival'] = df['Equipo Local'].where(~df['Es Local'], df['Equipo Visitante'])
+    return df
+
+def rellenar_alias(df):
+    """Alias vacío -> Nombre del jugador"""
+    if 'Nombre' in df.columns:
+        mask_empty_alias = df['Alias'].isna() | (df['Alias'] == '') | (df['Alias'].str.strip() == '')
+        df.loc[mask_empty_alias, 'Alias'] = df.loc[mask_empty_alias, 'Nombre']
+    return df
+
+def _demarcacion_vacia(demarcaciones):
+    return demarcaciones.isna() | (demarcaciones == '') | (demarcaciones.str.strip() == '')
+
+def _construir_demarcaciones_habituales(df):
+    """Id Jugador -> demarcación más frecuente (empates: la que aparece antes en los datos)"""
+    validas = df.loc[~_demarcacion_vacia(df['Demarcacion']), ['Id Jugador', 'Demarcacion']]
+    conteos = validas.groupby(['Id Jugador', 'Demarcacion'], sort=False).size().reset_index(name='n')
+    habituales = conteos.loc[conteos.groupby('Id Jugador', sort=False)['n'].idxmax()]
+    return habituales.set_index('Id Jugador')['Demarcacion']
+
+def demarcaciones_habituales(df):
+    """Demarcación más frecuente de cada jugador en toda la temporada (se calcula una vez)"""
+    return _cache_df(df, 'demarcaciones', _construir_demarcaciones_habituales)
+
+def rellenar_demarcaciones(df, filas):
+    """
+    Copia de 'filas' con las demarcaciones vacías rellenas con la más frecuente del jugador en df
+    ('Sin Posición' si no tiene ninguna)
+    """
+    filas = filas.copy()
+    mask_empty = _demarcacion_vacia(filas['Demarcacion'])
+    empty_count = mask_empty.sum()
+    if empty_count > 0:
+        print(f"📝 Encontrados {empty_count} registros con demarcación vacía")
+        rellenas = filas.loc[mask_empty, 'Id Jugador'].map(demarcaciones_habituales(df))
+        for alias, demarcacion in zip(filas.loc[mask_empty, 'Alias'], rellenas):
+            if pd.isna(demarcacion):
+                print(f"   ⚠️  {alias}: Sin posición histórica -> MC Posicional")
+            else:
+                print(f"   ✅ {alias}: {demarcacion} (histórico)")
+        filas.loc[mask_empty, 'Demarcacion'] = rellenas.fillna('Sin Posición')
+    return filas
+
+def limpiar_datos(df):
+    """Limpia y agrupa nombres de equipos similares, normaliza jornadas y materializa los partidos"""
+    df['Equipo'] = df['Equipo'].map(mapear_equipos_similares(df['Equipo'].unique()))
+    df['Jornada'] = df['Jornada'].apply(normalize_jornada)
+    rellenar_alias(df)
+    materializar_partidos(df)
+    print(f"✅ Limpieza completada. Equipos únicos: {len(df['Equipo'].unique())}")
+    return df
+
+def cargar_datos_limpios(data_path="prueba_extraccion/data/rendimiento_fisico.parquet"):
+    """DataFrame de rendimiento limpio, leído una vez por proceso y compartido (solo lectura)"""
+    ruta, *version = _huella_archivo(data_path)
+    if ruta not in _DATOS or _DATOS[ruta][0] != version:
+        if ruta in _DATOS:
+            _INDICES.pop(id(_DATOS[ruta][1]), None)
+        df = limpiar_datos(pd.read_parquet(data_path))
+        indice_partidos(df)
+        tabla_percentiles(df)
+        _DATOS[ruta] = (version, df)
+    return _DATOS[ruta][1]
+
+
+def _construir_indice(df):
+    """Partidos de cada equipo ordenados por jornada, jornadas de la liga y filas de cada partido"""
+    partidos = df[['Equipo', 'Partido', 'Jornada', 'Condicion']].drop_duplicates(['Equipo', 'Partido', 'Jornada'])
+    partidos = partidos.sort_values(['Equipo', 'Jornada'], kind='stable')
+
+    por_equipo = {}
+    jornadas_equipo = {}
+    for equipo, grupo in partidos.groupby('Equipo', sort=False):
+        jornadas = grupo['Jornada'].to_numpy()
+        nombres = grupo['Partido'].to_numpy()
+        condiciones = grupo['Condicion'].to_numpy()
+        por_equipo[equipo] = {None: (jornadas, nombres, condiciones)}
+        for condicion in ('local', 'visitante'):
+            mask = condiciones == condicion
+            por_equipo[equipo][condicion] = (jornadas[mask], nombres[mask], condiciones[mask])
+        jornadas_equipo[equipo] = np.unique(jornadas)
+
+    return {
+        'partidos': por_equipo,
+        'jornadas': np.sort(df['Jornada'].unique()),
+        'jornadas_equipo': jornadas_equipo,
+        'filas': df.groupby(['Equipo', 'Partido', 'Jornada'], sort=False).indices,
+    }
+
+def _cache_df(df, clave, construir):
+    """Resultado de construir(df) guardado junto al DataFrame (se calcula una vez por DataFrame)"""
+    entrada = _INDICES.get(id(df))
+    # Se guarda el propio DataFrame para que su id no pueda reutilizarse mientras esté en caché
+    if entrada is None or entrada[0] is not df or entrada[1] != len(df):
+        entrada = (df, len(df), {})
+        _INDICES[id(df)] = entrada
+    if clave not in entrada[2]:
+        entrada[2][clave] = construir(df)
+    return entrada[2][clave]
+
+def indice_partidos(df):
+    """Índice de partidos del DataFrame (se construye la primera vez y se reutiliza)"""
+    return _cache_df(df, 'partidos', _construir_indice)
+
+def ultimos_partidos(df, equipo, jornada_maxima, n, condicion=None):
+    """
+    Últimos n partidos del equipo hasta jornada_maxima (incluida), del más reciente al más antiguo
+
+    Args:
+        condicion: None (todos), 'local' o 'visitante'
+
+    Returns:
+        list: dicts con 'partido', 'jornada' y 'condicion'
+    """
+    series = indice_partidos(df)['partidos'].get(equipo)
+    if series is None:
+        return []
+    jornadas, partidos, condiciones = series[condicion]
+    fin = np.searchsorted(jornadas, normalize_jornada(jornada_maxima), side='right')
+    inicio = max(fin - n, 0)
+    return [{'partido': partidos[i], 'jornada': jornadas[i], 'condicion': condiciones[i]}
+            for i in range(fin - 1, inicio - 1, -1)]
+
+def ultimas_jornadas(df, jornada_referencia, n=5, equipo=None):
+    """Últimas n jornadas con datos hasta la de referencia (incluida), en orden ascendente"""
+    indice = indice_partidos(df)
+    if equipo is None:
+        jornadas = indice['jornadas']
+    else:
+        jornadas = indice['jornadas_equipo'].get(equipo, np.array([]))
+    fin = np.searchsorted(jornadas, normalize_jornada(jornada_referencia), side='right')
+    return jornadas[max(fin - n, 0):fin].tolist()
+
+def filas_partido(df, equipo, partido, jornada):
+    """Filas del equipo en un partido (vista por posiciones sobre el DataFrame compartido)"""
+    posiciones = indice_partidos(df)['filas'].get((equipo, partido, jornada))
+    if posiciones is None:
+        return df.iloc[0:0]
+    return df.iloc[posiciones]
+
+def matriz_jugador_jornada(filas, jornadas, columnas, clave='Alias'):
+    """
+    Suma de 'columnas' por jugador y jornada como matriz densa (una sola pivot_table)
+
+    Args:
+        filas: Filas ya filtradas (equipo, jornadas) con clave, 'Jornada' y las columnas
+        jornadas: Jornadas pedidas (se normalizan; el orden y las repeticiones se respetan)
+        columnas: Métricas a sumar (NaN cuenta como 0)
+
+    Returns:
+        dict: 'jugadores' (orden alfabético), 'jornadas' (normalizadas), 'dorsales' (de la
+              primera jornada del jugador), 'valores' (ndarray jugadores x jornadas x columnas,
+              0 si el jugador no jugó la jornada) y 'totales' (jugadores x columnas, todas las filas)
+    """
+    jornadas = [normalize_jornada(j) for j in jornadas]
+    columnas = list(columnas)
+    filas = filas[filas[clave].notna()]
+    if len(filas) == 0:
+        return {
+            'jugadores': [],
+            'jornadas': jornadas,
+            'dorsales': [],
+            'valores': np.zeros((0, len(jornadas), len(columnas))),
+            'totales': np.zeros((0, len(columnas))),
+        }
+
+    agregaciones = {columna: 'sum' for columna in columnas}
+    if 'Dorsal' in filas.columns:
+        agregaciones['Dorsal'] = 'first'
+    tabla = filas.pivot_table(index=clave, columns='Jornada', values=list(agregaciones),
+                              aggfunc=agregaciones, dropna=False)
+    jugadores = tabla.index
+    presentes = tabla.columns.unique('Jornada')
+    pedidas = pd.Index(jornadas, dtype=object)
+
+    # jugadores x jornadas presentes x columnas (NaN = el jugador no jugó esa jornada), y luego
+    # las jornadas en el orden pedido
+    base = np.stack([
+        tabla[columna].reindex(columns=presentes).to_numpy(dtype=float) for columna in columnas
+    ], axis=2)
+    jugadas = ~np.isnan(base[:, :, 0])
+    base = np.nan_to_num(base)
+    indices = presentes.get_indexer(pedidas)
+    valores = np.where((indices >= 0)[None, :, None], base[:, indices, :], 0.0)
+
+    # Dorsal: primer valor de la primera jornada jugada (las columnas de la tabla van ordenadas)
+    if 'Dorsal' in agregaciones:
+        por_jornada = tabla['Dorsal'].reindex(columns=presentes).to_numpy()
+        dorsales = por_jornada[np.arange(len(jugadores)), jugadas.argmax(axis=1)].tolist()
+    else:
+        dorsales = ['N/A'] * len(jugadores)
+
+    return {
+        'jugadores': jugadores.tolist(),
+        'jornadas': jornadas,
+        'dorsales': dorsales,
+        'valores': valores,
+        'totales': base.sum(axis=1),
+    }
+
+def cortes_percentiles(valores, percentiles=PERCENTILES_COLOR):
+    """Valores de corte de los percentiles (np.percentile; None si no hay valores)"""
+    valores = np.asarray(valores, dtype=float)
+    if valores.size == 0:
+        return None
+    return np.percentile(valores, percentiles)
+
+def nivel_percentil(valores, cortes):
+    """
+    Nivel de cada valor respecto a los cortes (np.digitize): 0 por debajo del primero,
+    len(cortes) en o por encima del último. NaN (en valores o cortes) -> 0
+    """
+    valores = np.asarray(valores, dtype=float)
+    cortes = np.asarray(cortes, dtype=float)
+    if np.isnan(cortes).any():
+        return np.zeros(valores.shape, dtype=int)
+    niveles = np.digitize(valores, cortes)
+    niveles[np.isnan(valores)] = 0
+    return niveles
+
+def _columnas_metricas(df):
+    """Columnas numéricas de rendimiento (sin jornada, dorsal, identificadores ni goles del partido)"""
+    excluidas = {'Jornada', 'Dorsal', 'Id Jugador', *COLUMNAS_PARTIDO}
+    return [c for c in df.select_dtypes('number').columns if c not in excluidas]
+
+def _entrada_percentiles(valores):
+    """Valores ordenados (sin NaN), cortes de PERCENTILES_COLOR y media de una métrica"""
+    valores = np.sort(valores[~np.isnan(valores)])
+    if valores.size == 0:
+        return {'valores': valores, 'cortes': None, 'media': np.nan}
+    return {'valores': valores, 'cortes': np.percentile(valores, PERCENTILES_COLOR), 'media': valores.mean()}
+
+def _construir_tabla_percentiles(df):
+    """(demarcación, métrica) -> valores ordenados, cortes y media; demarcación None = toda la liga"""
+    grupos = df.groupby('Demarcacion', sort=False).indices if 'Demarcacion' in df.columns else {}
+    tabla = {}
+    for metrica in _columnas_metricas(df):
+        valores = df[metrica].to_numpy(dtype=float)
+        tabla[(None, metrica)] = _entrada_percentiles(valores)
+        for demarcacion, posiciones in grupos.items():
+            tabla[(demarcacion, metrica)] = _entrada_percentiles(valores[posiciones])
+    return tabla
+
+def _clave_ventana(df, jornadas):
+    """None (temporada completa) o tupla ordenada de jornadas normalizadas"""
+    if jornadas is None:
+        return None
+    ventana = tuple(sorted({normalize_jornada(j) for j in jornadas}))
+    if ventana == tuple(indice_partidos(df)['jornadas'].tolist()):
+        return None
+    return ventana
+
+def tabla_percentiles(df, jornadas=None):
+    """
+    Tabla de percentiles de la liga para una ventana de jornadas (por defecto la temporada)
+
+    La temporada completa se materializa al cargar los datos; cada ventana distinta se calcula la
+    primera vez que se pide y se reutiliza (hasta MAX_VENTANAS_PERCENTILES ventanas por DataFrame).
+
+    Returns:
+        dict: (demarcación o None, métrica) -> {'valores': ndarray ordenado, 'cortes', 'media'}
+    """
+    ventana = _clave_ventana(df, jornadas)
+    if ventana is None:
+        return _cache_df(df, 'percentiles', _construir_tabla_percentiles)
+
+    ventanas = _cache_df(df, 'percentiles_ventanas', lambda _: {})
+    if ventana not in ventanas:
+        if len(ventanas) >= MAX_VENTANAS_PERCENTILES:
+            ventanas.pop(next(iter(ventanas)))
+        ventanas[ventana] = _construir_tabla_percentiles(df[df['Jornada'].isin(ventana)])
+    return ventanas[ventana]
+
+def estadisticas_liga(df, metrica, demarcacion=None, jornadas=None):
+    """Entrada de la tabla de percentiles; si la demarcación no tiene datos, la de toda la liga"""
+    tabla = tabla_percentiles(df, jornadas)
+    return tabla.get((demarcacion, metrica)) or tabla.get((None, metrica))
+
+def cortes_liga(df, metrica, demarcacion=None, jornadas=None):
+    """Cortes de percentil de la métrica en toda la liga, o entre los jugadores de una demarcación"""
+    entrada = estadisticas_liga(df, metrica, demarcacion, jornadas)
+    return None if entrada is None else entrada['cortes']
+
+def media_liga(df, metrica, demarcacion=None, jornadas=None):
+    """Media de la métrica en la liga (o en una demarcación) para la ventana de jornadas"""
+    entrada = estadisticas_liga(df, metrica, demarcacion, jornadas)
+    return np.nan if entrada is None else entrada['media']
+
+def percentil_liga(df, metrica, valores, demarcacion=None, jornadas=None):
+    """
+    Percentil (0-100) de cada valor en la liga: % de registros de la liga con valor <= al dado
+
+    Búsqueda binaria sobre los valores ordenados de la tabla (O(log n) por valor). NaN -> NaN
+    """
+    valores = np.asarray(valores, dtype=float)
+    entrada = estadisticas_liga(df, metrica, demarcacion, jornadas)
+    if entrada is None or entrada['valores'].size == 0:
+        return np.full(valores.shape, np.nan)
+    liga = entrada['valores']
+    percentiles = np.searchsorted(liga, valores, side='right') * 100.0 / liga.size
+    percentiles[np.isnan(valores)] = np.nan
+    return percentiles
+
+def percentil_jugadores(df, jugadores, metrica, jornadas=None, por_demarcacion=True):
+    """percentil_liga() de cada fila de 'jugadores', contra su demarcación o contra toda la liga"""
+    valores = jugadores[metrica].to_numpy(dtype=float)
+    if not por_demarcacion or 'Demarcacion' not in jugadores.columns:
+        return pd.Series(percentil_liga(df, metrica, valores, None, jornadas), index=jugadores.index)
+
+    # Las filas sin demarcación se comparan con toda la liga
+    percentiles = percentil_liga(df, metrica, valores, None, jornadas)
+    for demarcacion, posiciones in jugadores.groupby('Demarcacion', sort=False).indices.items():
+        percentiles[posiciones] = percentil_liga(df, metrica, valores[posiciones], demarcacion, jornadas)
+    return pd.Series(percentiles, index=jugadores.index)
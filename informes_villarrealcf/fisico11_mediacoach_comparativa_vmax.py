@@ -1,10 +1,15 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from matplotlib.offsetbox import AnnotationBbox
 import numpy as np
 import os
 from difflib import SequenceMatcher
+from datos_compartidos import cargar_datos_limpios, rellenar_demarcaciones
+from plan_agregaciones import agregar_seleccion, registrar_especificacion
+from registro_assets import cargar_imagen, imagen_offset, ruta_escudo
+from ciclo_figuras import figuras_sin_pantalla
+from modo_borrador import guardar_borrador, resolucion_borrador
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -26,12 +31,36 @@ plt.rcParams.update({
 
 # Instalar mplsoccer si no está instalado
 try:
-    from mplsoccer import Pitch
+    from plantilla_campo import crear_figura_campo
 except ImportError:
     print("Instalando mplsoccer...")
     import subprocess
     subprocess.check_call(["pip", "install", "mplsoccer"])
-    from mplsoccer import Pitch
+    from plantilla_campo import crear_figura_campo
+
+# Métricas acumuladas por jugador (partidos de 60+ minutos; registro más reciente, todos los
+# partidos); ver plan_agregaciones
+ESPECIFICACION = registrar_especificacion('campo_barras', {
+    'umbral_minutos': 60,
+    'registro': 'todas',
+    'metricas': {
+        # Minutos: promedio de los partidos sobre el umbral
+        'Minutos jugados': ('Minutos jugados', 'mean', 'umbral'),
+        # Distancias: suma total de los partidos sobre el umbral
+        'Distancia Total': ('Distancia Total', 'sum', 'umbral'),
+        'Distancia Total 14-21 km / h': ('Distancia Total 14-21 km / h', 'sum', 'umbral'),
+        'Distancia Total >21 km / h': ('Distancia Total >21 km / h', 'sum', 'umbral'),
+        'Distancia Total >24 km / h': ('Distancia Total >24 km / h', 'sum', 'umbral'),
+        # Distancias por minuto: promedio
+        'Distancia Total / min': ('Distancia Total / min', 'mean', 'umbral'),
+        'Distancia Total 14-21 km / h / min': ('Distancia Total 14-21 km / h / min', 'mean', 'umbral'),
+        'Distancia Total >21 km / h / min': ('Distancia Total >21 km / h / min', 'mean', 'umbral'),
+        # Velocidades: máximo de los partidos sobre el umbral
+        'Velocidad Máxima Total': ('Velocidad Máxima Total', 'max', 'umbral'),
+        'Velocidad Máxima 1P': ('Velocidad Máxima 1P', 'max', 'umbral'),
+        'Velocidad Máxima 2P': ('Velocidad Máxima 2P', 'max', 'umbral'),
+    },
+})
 
 class CampoFutbolBarras:
     def __init__(self, data_path="prueba_extraccion/data/rendimiento_fisico.parquet"):
@@ -41,7 +70,6 @@ class CampoFutbolBarras:
         self.data_path = data_path
         self.df = None
         self.load_data()
-        self.clean_team_names()
         
         # 🎨 COLORES ESPECÍFICOS POR EQUIPO
         self.team_colors = {
@@ -157,9 +185,9 @@ class CampoFutbolBarras:
         ]
         
     def load_data(self):
-        """Carga los datos del archivo parquet"""
+        """Carga los datos limpios del parquet (compartidos por los informes del proceso)"""
         try:
-            self.df = pd.read_parquet(self.data_path)
+            self.df = cargar_datos_limpios(self.data_path)
             print(f"✅ Datos cargados exitosamente: {self.df.shape[0]} filas, {self.df.shape[1]} columnas")
         except Exception as e:
             print(f"❌ Error al cargar los datos: {e}")
@@ -168,55 +196,6 @@ class CampoFutbolBarras:
         """Calcula la similitud entre dos strings"""
         return SequenceMatcher(None, a.lower(), b.lower()).ratio()
     
-    def clean_team_names(self):
-        """Limpia y agrupa nombres de equipos similares"""
-        if self.df is None:
-            return
-        
-        # Limpiar nombres de equipos
-        unique_teams = self.df['Equipo'].unique()
-        team_mapping = {}
-        processed_teams = set()
-        
-        for team in unique_teams:
-            if team in processed_teams:
-                continue
-                
-            # Buscar equipos similares
-            similar_teams = [team]
-            for other_team in unique_teams:
-                if other_team != team and other_team not in processed_teams:
-                    if self.similarity(team, other_team) > 0.7:
-                        similar_teams.append(other_team)
-            
-            # Elegir el nombre más largo como representativo
-            canonical_name = max(similar_teams, key=len)
-            
-            # Mapear todos los nombres similares al canónico
-            for similar_team in similar_teams:
-                team_mapping[similar_team] = canonical_name
-                processed_teams.add(similar_team)
-        
-        # Aplicar el mapeo
-        self.df['Equipo'] = self.df['Equipo'].map(team_mapping)
-        
-        # Normalizar jornadas
-        def normalize_jornada(jornada):
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            return jornada
-        
-        self.df['Jornada'] = self.df['Jornada'].apply(normalize_jornada)
-        print(f"✅ Limpieza completada. Equipos únicos: {len(self.df['Equipo'].unique())}")
-        
     def get_available_teams(self):
         """Retorna la lista de equipos disponibles"""
         if self.df is None:
@@ -237,131 +216,28 @@ class CampoFutbolBarras:
     def fill_missing_demarcaciones(self, df):
         """Rellena demarcaciones vacías con la más frecuente para cada jugador"""
         print("🔄 Rellenando demarcaciones vacías...")
-        
-        # Crear copia para trabajar
-        df_work = df.copy()
-        
-        # Identificar registros con demarcación vacía
-        mask_empty = df_work['Demarcacion'].isna() | (df_work['Demarcacion'] == '') | (df_work['Demarcacion'].str.strip() == '')
-        empty_count = mask_empty.sum()
-        
-        if empty_count > 0:
-            print(f"📝 Encontrados {empty_count} registros con demarcación vacía")
-            
-            # Para cada jugador con demarcación vacía, buscar su demarcación más frecuente
-            for idx in df_work[mask_empty].index:
-                jugador_id = df_work.loc[idx, 'Id Jugador']
-                jugador_alias = df_work.loc[idx, 'Alias']
-                
-                # Buscar todas las demarcaciones de este jugador (no vacías)
-                jugador_demarcaciones = self.df[
-                    (self.df['Id Jugador'] == jugador_id) & 
-                    (self.df['Demarcacion'].notna()) & 
-                    (self.df['Demarcacion'] != '') &
-                    (self.df['Demarcacion'].str.strip() != '')
-                ]['Demarcacion']
-                
-                if len(jugador_demarcaciones) > 0:
-                    # Usar la demarcación más frecuente
-                    demarcacion_mas_frecuente = jugador_demarcaciones.value_counts().index[0]
-                    df_work.loc[idx, 'Demarcacion'] = demarcacion_mas_frecuente
-                    print(f"   ✅ {jugador_alias}: {demarcacion_mas_frecuente} (histórico)")
-                else:
-                    # Si no hay datos históricos, asignar "Sin Posición"
-                    df_work.loc[idx, 'Demarcacion'] = 'Sin Posición'
-                    print(f"   ⚠️  {jugador_alias}: Sin posición histórica -> MC Posicional")
-        
-        return df_work
+        return rellenar_demarcaciones(self.df, df)
     
-    def filter_and_accumulate_data(self, equipo, jornadas, min_avg_minutes=60):
-        """Filtra por promedio de minutos y acumula datos por jugador"""
+    def filter_and_accumulate_data(self, equipo, jornadas, min_avg_minutes=60, equipos=None):
+        """
+        Filtra por promedio de minutos y acumula datos por jugador
+        
+        Args:
+            equipos: Equipos de la selección compartida con otros informes (por defecto solo 'equipo')
+        """
         if self.df is None:
             return None
         
-        # Normalizar jornadas
-        normalized_jornadas = []
-        for jornada in jornadas:
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            else:
-                normalized_jornadas.append(jornada)
-        
-        # Filtrar por equipo y jornadas
-        filtered_df = self.df[
-            (self.df['Equipo'] == equipo) & 
-            (self.df['Jornada'].isin(normalized_jornadas))
-        ].copy()
-        
-        # Rellenar demarcaciones vacías
-        filtered_df = self.fill_missing_demarcaciones(filtered_df)
-        
-        # Verificar si Alias está vacío y usar Nombre en su lugar
-        if 'Nombre' in filtered_df.columns:
-            mask_empty_alias = filtered_df['Alias'].isna() | (filtered_df['Alias'] == '') | (filtered_df['Alias'].str.strip() == '')
-            filtered_df.loc[mask_empty_alias, 'Alias'] = filtered_df.loc[mask_empty_alias, 'Nombre']
-        
-        if 'Minutos jugados' not in filtered_df.columns:
+        if 'Minutos jugados' not in self.df.columns:
             print("⚠️  Columna 'Minutos jugados' no encontrada.")
             return None
         
-        # Agrupar por jugador y calcular estadísticas acumuladas
+        # Agregados de la especificación del informe (pasada compartida por selección)
         print(f"🔄 Procesando datos acumulados por jugador para {equipo}...")
+        especificacion = dict(ESPECIFICACION, umbral_minutos=min_avg_minutes)
+        result_df = agregar_seleccion(self.df, equipos or (equipo,), jornadas, especificacion)[equipo]
         
-        accumulated_data = []
-        
-        for jugador in filtered_df['Alias'].unique():
-            jugador_data = filtered_df[filtered_df['Alias'] == jugador]
-    
-            # NUEVO: Filtrar solo partidos donde jugó 60+ minutos
-            jugador_data_filtered = jugador_data[jugador_data['Minutos jugados'] >= min_avg_minutes]
-            
-            # Solo incluir jugadores que tengan al menos 1 partido con 60+ minutos
-            if len(jugador_data_filtered) > 0:
-                # Tomar datos básicos del jugador (usar el registro más reciente)
-                latest_record = jugador_data.iloc[-1]
-                
-                # Crear registro acumulado
-                accumulated_record = {
-                    'Id Jugador': latest_record['Id Jugador'],
-                    'Dorsal': latest_record['Dorsal'],
-                    'Nombre': latest_record['Nombre'],
-                    'Alias': latest_record['Alias'],
-                    'Demarcacion': jugador_data_filtered['Demarcacion'].mode().iloc[0] if len(jugador_data_filtered['Demarcacion'].mode()) > 0 else latest_record['Demarcacion'],
-                    'Equipo': latest_record['Equipo'],
-                    
-                    # Minutos: promedio SOLO de partidos 60+
-                    'Minutos jugados': jugador_data_filtered['Minutos jugados'].mean(),
-                    
-                    # Distancias: suma total SOLO de partidos 60+
-                    'Distancia Total': jugador_data_filtered['Distancia Total'].fillna(0).sum(),
-                    'Distancia Total 14-21 km / h': jugador_data_filtered['Distancia Total 14-21 km / h'].fillna(0).sum(),
-                    'Distancia Total >21 km / h': jugador_data_filtered['Distancia Total >21 km / h'].fillna(0).sum(),
-                    'Distancia Total >24 km / h': jugador_data_filtered.get('Distancia Total >24 km / h', pd.Series([0])).fillna(0).sum(),
-                    
-                    # Distancias por minuto: promedio
-                    'Distancia Total / min': jugador_data_filtered['Distancia Total / min'].mean(),
-                    'Distancia Total 14-21 km / h / min': jugador_data_filtered.get('Distancia Total 14-21 km / h / min', pd.Series([0])).mean(),
-                    'Distancia Total >21 km / h / min': jugador_data_filtered.get('Distancia Total >21 km / h / min', pd.Series([0])).mean(),
-                    
-                    # Velocidades: máximo
-                    'Velocidad Máxima Total': jugador_data_filtered['Velocidad Máxima Total'].max(),
-                    'Velocidad Máxima 1P': jugador_data_filtered.get('Velocidad Máxima 1P', pd.Series([0])).max(),
-                    'Velocidad Máxima 2P': jugador_data_filtered.get('Velocidad Máxima 2P', pd.Series([0])).max(),
-                }
-                
-                accumulated_data.append(accumulated_record)
-        
-        # Convertir a DataFrame
-        if accumulated_data:
-            result_df = pd.DataFrame(accumulated_data)
+        if result_df is not None:
             print(f"✅ {len(result_df)} jugadores con promedio {min_avg_minutes}+ minutos")
             print(f"📊 Datos acumulados para {equipo}: {len(result_df)} jugadores únicos")
             return result_df
@@ -370,24 +246,13 @@ class CampoFutbolBarras:
             return None
     
     def load_team_logo(self, equipo):
-        """Carga el escudo del equipo"""
-        possible_names = [
-            equipo,
-            equipo.replace(' ', '_'),
-            equipo.replace(' ', ''),
-            equipo.lower(),
-            equipo.lower().replace(' ', '_'),
-            equipo.lower().replace(' ', '')
-        ]
-        
-        for name in possible_names:
-            logo_path = f"assets/escudos/{name}.png"
-            if os.path.exists(logo_path):
-                try:
-                    return plt.imread(logo_path)
-                except Exception as e:
-                    print(f"⚠️  Error al cargar escudo {logo_path}: {e}")
-                    continue
+        """Carga el escudo del equipo (ruta resuelta con el índice de assets/escudos)"""
+        logo_path = ruta_escudo(equipo)
+        if logo_path:
+            try:
+                return cargar_imagen(logo_path)
+            except Exception as e:
+                print(f"⚠️  Error al cargar escudo {logo_path}: {e}")
         
         print(f"⚠️  No se encontró el escudo para: {equipo}")
         return None
@@ -469,8 +334,9 @@ class CampoFutbolBarras:
         """Crea el campo que ocupe TODA la página sin espacios"""
         print("🎯 Creando campo SIN espacios...")
         
-        # Crear pitch sin padding
-        pitch = Pitch(
+        # Campo sin padding desde la plantilla cacheada (césped y líneas se generan una vez por proceso)
+        fig, ax = crear_figura_campo(
+            figsize,
             pitch_color='grass', 
             line_color='white', 
             stripe=True, 
@@ -478,13 +344,6 @@ class CampoFutbolBarras:
             pad_left=0, pad_right=0, pad_bottom=0, pad_top=0
         )
         
-        # Crear figura sin layouts automáticos
-        fig, ax = pitch.draw(
-            figsize=figsize,
-            tight_layout=False,
-            constrained_layout=False
-        )
-        
         # ✅ CONFIGURACIÓN AGRESIVA PARA ELIMINAR TODOS LOS ESPACIOS
         fig.subplots_adjust(left=0, right=1, top=1, bottom=0, wspace=0, hspace=0)
         ax.set_position([0, 0, 1, 1])
@@ -544,7 +403,7 @@ class CampoFutbolBarras:
                 logo_y = y + graph_height/2 - 1.5
                 zoom_factor = 0.03
                 
-                imagebox = OffsetImage(team_logo, zoom=zoom_factor)
+                imagebox = imagen_offset(team_logo, zoom=zoom_factor)
                 ab = AnnotationBbox(imagebox, (logo_x, logo_y), 
                                 frameon=False, 
                                 boxcoords='data')
@@ -859,9 +718,10 @@ class CampoFutbolBarras:
                 bbox=dict(boxstyle="round,pad=0.8", facecolor='#1e3d59', alpha=0.95,
                          edgecolor='white', linewidth=2))
         
-        # Obtener datos acumulados de ambos equipos
-        villarreal_data = self.filter_and_accumulate_data('Villarreal CF', jornadas, min_avg_minutes=60)
-        rival_data = self.filter_and_accumulate_data(equipo_rival, jornadas, min_avg_minutes=60)
+        # Obtener datos acumulados de ambos equipos (una selección compartida)
+        equipos = ('Villarreal CF', equipo_rival)
+        villarreal_data = self.filter_and_accumulate_data('Villarreal CF', jornadas, min_avg_minutes=60, equipos=equipos)
+        rival_data = self.filter_and_accumulate_data(equipo_rival, jornadas, min_avg_minutes=60, equipos=equipos)
         
         if villarreal_data is None or len(villarreal_data) == 0:
             print("❌ No hay jugadores de Villarreal CF con promedio 60+ minutos")
@@ -877,12 +737,12 @@ class CampoFutbolBarras:
         
         # Posicionar escudos dentro del campo
         if villarreal_logo is not None:
-            imagebox = OffsetImage(villarreal_logo, zoom=0.08)
+            imagebox = imagen_offset(villarreal_logo, zoom=0.08)
             ab = AnnotationBbox(imagebox, (5, 5), frameon=False)
             ax.add_artist(ab)
         
         if rival_logo is not None:
-            imagebox = OffsetImage(rival_logo, zoom=0.08)
+            imagebox = imagen_offset(rival_logo, zoom=0.08)
             ab = AnnotationBbox(imagebox, (115, 5), frameon=False)
             ax.add_artist(ab)
         
@@ -1033,11 +893,12 @@ def main_campo_futbol_barras():
         import traceback
         traceback.print_exc()
 
-def generar_reporte_barras_personalizado(equipo_rival, jornadas, mostrar=True, guardar=True):
+def generar_reporte_barras_personalizado(equipo_rival, jornadas, mostrar=True, guardar=True, borrador=False):
     """Función para generar un reporte personalizado con gráficos de barras"""
     try:
         report_generator = CampoFutbolBarras()
-        fig = report_generator.create_visualization(equipo_rival, jornadas)
+        with resolucion_borrador(borrador), figuras_sin_pantalla(not mostrar):
+            fig = report_generator.create_visualization(equipo_rival, jornadas)
         
         if fig:
             if mostrar:
@@ -1046,6 +907,10 @@ def generar_reporte_barras_personalizado(equipo_rival, jornadas, mostrar=True, g
             if guardar:
                 equipo_filename = equipo_rival.replace(' ', '_').replace('/', '_')
                 output_path = f"reporte_BARRAS_Villarreal_vs_{equipo_filename}.pdf"
+                
+                if borrador:
+                    guardar_borrador(fig, output_path)
+                    return fig
                 report_generator.guardar_sin_espacios(fig, output_path)
             
             return fig
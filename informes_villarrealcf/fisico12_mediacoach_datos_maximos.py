@@ -1,10 +1,16 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from matplotlib.offsetbox import AnnotationBbox
 import numpy as np
 import os
 from difflib import SequenceMatcher
+from datos_compartidos import cargar_datos_limpios, rellenar_demarcaciones
+from plan_agregaciones import agregar_seleccion, registrar_especificacion
+from registro_assets import cargar_imagen, imagen_offset, ruta_escudo
+from ciclo_figuras import figuras_sin_pantalla
+from modo_borrador import guardar_borrador, resolucion_borrador
+from tabla_lote import TablaLote
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -26,12 +32,34 @@ plt.rcParams.update({
 
 # Instalar mplsoccer si no está instalado
 try:
-    from mplsoccer import Pitch
+    from plantilla_campo import crear_figura_campo
 except ImportError:
     print("Instalando mplsoccer...")
     import subprocess
     subprocess.check_call(["pip", "install", "mplsoccer"])
-    from mplsoccer import Pitch
+    from plantilla_campo import crear_figura_campo
+
+# Métricas máximas por jugador (minutos: partidos de 70+; posesión: todos los partidos, sumando
+# 1P + 2P por jornada antes de tomar el máximo); ver plan_agregaciones
+ESPECIFICACION = registrar_especificacion('campo_maximos', {
+    'umbral_minutos': 70,
+    'registro': 'umbral',
+    'metricas': {
+        'Minutos jugados': ('Minutos jugados', 'max', 'umbral'),
+        'Minutos CON posesión': (('Minutos CON posesión',), 'max', 'todas'),
+        'Minutos SIN posesión': (('Minutos SIN posesión',), 'max', 'todas'),
+        'Distancia CON posesión': (('Distancia CON posesión 1P', 'Distancia CON posesión 2P'), 'max', 'todas'),
+        'Distancia SIN posesión': (('Distancia SIN posesión 1P', 'Distancia SIN posesión 2P'), 'max', 'todas'),
+        'Distancia >21 km / h CON posesión': (('Distancia >21 km / h CON posesión 1P',
+                                               'Distancia >21 km / h CON posesión 2P'), 'max', 'todas'),
+        'Distancia >21 km / h SIN posesión': (('Distancia >21 km / h SIN posesión 1P',
+                                               'Distancia >21 km / h SIN posesión 2P'), 'max', 'todas'),
+        'Distancia >24 km / h CON posesión': (('Distancia >24 km / h CON posesión 1P',
+                                               'Distancia >24 km / h CON posesión 2P'), 'max', 'todas'),
+        'Distancia >24 km / h SIN posesión': (('Distancia >24 km / h SIN posesión 1P',
+                                               'Distancia >24 km / h SIN posesión 2P'), 'max', 'todas'),
+    },
+})
 
 class CampoFutbolMaximos:
     def __init__(self, data_path="prueba_extraccion/data/rendimiento_fisico.parquet"):
@@ -41,7 +69,6 @@ class CampoFutbolMaximos:
         self.data_path = data_path
         self.df = None
         self.load_data()
-        self.clean_team_names()
         
         # 🎨 COLORES ESPECÍFICOS POR EQUIPO
         self.team_colors = {
@@ -144,9 +171,9 @@ class CampoFutbolMaximos:
         ]
         
     def load_data(self):
-        """Carga los datos del archivo parquet"""
+        """Carga los datos limpios del parquet (compartidos por los informes del proceso)"""
         try:
-            self.df = pd.read_parquet(self.data_path)
+            self.df = cargar_datos_limpios(self.data_path)
             print(f"✅ Datos cargados exitosamente: {self.df.shape[0]} filas, {self.df.shape[1]} columnas")
         except Exception as e:
             print(f"❌ Error al cargar los datos: {e}")
@@ -155,55 +182,6 @@ class CampoFutbolMaximos:
         """Calcula la similitud entre dos strings"""
         return SequenceMatcher(None, a.lower(), b.lower()).ratio()
     
-    def clean_team_names(self):
-        """Limpia y agrupa nombres de equipos similares"""
-        if self.df is None:
-            return
-        
-        # Limpiar nombres de equipos
-        unique_teams = self.df['Equipo'].unique()
-        team_mapping = {}
-        processed_teams = set()
-        
-        for team in unique_teams:
-            if team in processed_teams:
-                continue
-                
-            # Buscar equipos similares
-            similar_teams = [team]
-            for other_team in unique_teams:
-                if other_team != team and other_team not in processed_teams:
-                    if self.similarity(team, other_team) > 0.7:
-                        similar_teams.append(other_team)
-            
-            # Elegir el nombre más largo como representativo
-            canonical_name = max(similar_teams, key=len)
-            
-            # Mapear todos los nombres similares al canónico
-            for similar_team in similar_teams:
-                team_mapping[similar_team] = canonical_name
-                processed_teams.add(similar_team)
-        
-        # Aplicar el mapeo
-        self.df['Equipo'] = self.df['Equipo'].map(team_mapping)
-        
-        # Normalizar jornadas
-        def normalize_jornada(jornada):
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            return jornada
-        
-        self.df['Jornada'] = self.df['Jornada'].apply(normalize_jornada)
-        print(f"✅ Limpieza completada. Equipos únicos: {len(self.df['Equipo'].unique())}")
-        
     def get_available_teams(self):
         """Retorna la lista de equipos disponibles"""
         if self.df is None:
@@ -224,41 +202,7 @@ class CampoFutbolMaximos:
     def fill_missing_demarcaciones(self, df):
         """Rellena demarcaciones vacías con la más frecuente para cada jugador"""
         print("🔄 Rellenando demarcaciones vacías...")
-        
-        # Crear copia para trabajar
-        df_work = df.copy()
-        
-        # Identificar registros con demarcación vacía
-        mask_empty = df_work['Demarcacion'].isna() | (df_work['Demarcacion'] == '') | (df_work['Demarcacion'].str.strip() == '')
-        empty_count = mask_empty.sum()
-        
-        if empty_count > 0:
-            print(f"📝 Encontrados {empty_count} registros con demarcación vacía")
-            
-            # Para cada jugador con demarcación vacía, buscar su demarcación más frecuente
-            for idx in df_work[mask_empty].index:
-                jugador_id = df_work.loc[idx, 'Id Jugador']
-                jugador_alias = df_work.loc[idx, 'Alias']
-                
-                # Buscar todas las demarcaciones de este jugador (no vacías)
-                jugador_demarcaciones = self.df[
-                    (self.df['Id Jugador'] == jugador_id) & 
-                    (self.df['Demarcacion'].notna()) & 
-                    (self.df['Demarcacion'] != '') &
-                    (self.df['Demarcacion'].str.strip() != '')
-                ]['Demarcacion']
-                
-                if len(jugador_demarcaciones) > 0:
-                    # Usar la demarcación más frecuente
-                    demarcacion_mas_frecuente = jugador_demarcaciones.value_counts().index[0]
-                    df_work.loc[idx, 'Demarcacion'] = demarcacion_mas_frecuente
-                    print(f"   ✅ {jugador_alias}: {demarcacion_mas_frecuente} (histórico)")
-                else:
-                    # Si no hay datos históricos, asignar "Sin Posición"
-                    df_work.loc[idx, 'Demarcacion'] = 'Sin Posición'
-                    print(f"   ⚠️  {jugador_alias}: Sin posición histórica -> MC Posicional")
-        
-        return df_work
+        return rellenar_demarcaciones(self.df, df)
     
     def get_player_position_history(self, jugador_id):
         """Obtiene el historial de posiciones de un jugador"""
@@ -279,168 +223,26 @@ class CampoFutbolMaximos:
         history = self.get_player_position_history(jugador_id)
         return demarcacion in history
     
-    def filter_and_get_maximum_data(self, equipo, jornadas, min_minutes=70):
-        """🔥 NUEVA FUNCIÓN: Filtra por minutos mínimos y obtiene DATOS MÁXIMOS por jugador"""
+    def filter_and_get_maximum_data(self, equipo, jornadas, min_minutes=70, equipos=None):
+        """
+        Filtra por minutos mínimos y obtiene DATOS MÁXIMOS por jugador
+        
+        Args:
+            equipos: Equipos de la selección compartida con otros informes (por defecto solo 'equipo')
+        """
         if self.df is None:
             return None
         
-        # Normalizar jornadas
-        normalized_jornadas = []
-        for jornada in jornadas:
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            else:
-                normalized_jornadas.append(jornada)
-        
-        # Filtrar por equipo y jornadas
-        filtered_df = self.df[
-            (self.df['Equipo'] == equipo) & 
-            (self.df['Jornada'].isin(normalized_jornadas))
-        ].copy()
-        
-        # Rellenar demarcaciones vacías
-        filtered_df = self.fill_missing_demarcaciones(filtered_df)
-        
-        # Verificar si Alias está vacío y usar Nombre en su lugar
-        if 'Nombre' in filtered_df.columns:
-            mask_empty_alias = filtered_df['Alias'].isna() | (filtered_df['Alias'] == '') | (filtered_df['Alias'].str.strip() == '')
-            filtered_df.loc[mask_empty_alias, 'Alias'] = filtered_df.loc[mask_empty_alias, 'Nombre']
-        
-        if 'Minutos jugados' not in filtered_df.columns:
+        if 'Minutos jugados' not in self.df.columns:
             print("⚠️  Columna 'Minutos jugados' no encontrada.")
             return None
         
-        # 🔥 NUEVA LÓGICA: OBTENER DATOS MÁXIMOS por jugador
+        # 🔥 DATOS MÁXIMOS de la especificación del informe (pasada compartida por selección)
         print(f"🔄 Procesando DATOS MÁXIMOS por jugador para {equipo}...")
+        especificacion = dict(ESPECIFICACION, umbral_minutos=min_minutes)
+        result_df = agregar_seleccion(self.df, equipos or (equipo,), jornadas, especificacion)[equipo]
         
-        maximum_data = []
-        
-        for jugador in filtered_df['Alias'].unique():
-            jugador_data = filtered_df[filtered_df['Alias'] == jugador]
-    
-            # NUEVO: Filtrar solo partidos donde jugó 70+ minutos
-            jugador_data_filtered = jugador_data[jugador_data['Minutos jugados'] >= min_minutes]
-    
-            # Solo incluir jugadores que tengan al menos 1 partido con 70+ minutos
-            if len(jugador_data_filtered) > 0:
-                # Tomar datos básicos del jugador (usar el registro más reciente)
-                latest_record = jugador_data_filtered.iloc[-1]
-
-                # 🔥 CREAR REGISTRO CON VALORES MÁXIMOS
-                maximum_record = {
-                    'Id Jugador': latest_record['Id Jugador'],
-                    'Dorsal': latest_record['Dorsal'],
-                    'Nombre': latest_record['Nombre'],
-                    'Alias': latest_record['Alias'],
-                    'Demarcacion': jugador_data_filtered['Demarcacion'].mode().iloc[0] if len(jugador_data_filtered['Demarcacion'].mode()) > 0 else latest_record['Demarcacion'],
-                    'Equipo': latest_record['Equipo'],
-                    
-                    # Minutos: MÁXIMO jugado SOLO en partidos de 70+
-                    'Minutos jugados': jugador_data_filtered['Minutos jugados'].max(),
-                }
-
-                # 🔥 CALCULAR MÉTRICAS COMBINADAS CORRECTAMENTE
-                # Para cada métrica, sumar 1P + 2P por jornada, luego tomar el máximo
-
-                # Minutos CON y SIN posesión
-                maximum_record['Minutos CON posesión'] = pd.to_numeric(
-                    jugador_data.get('Minutos CON posesión', pd.Series([0])), errors='coerce'
-                ).fillna(0).max()
-
-                maximum_record['Minutos SIN posesión'] = pd.to_numeric(
-                    jugador_data.get('Minutos SIN posesión', pd.Series([0])), errors='coerce'
-                ).fillna(0).max()
-
-                # Distancia CON posesión = suma por jornada, luego máximo
-                dist_con_1p = pd.to_numeric(jugador_data.get('Distancia CON posesión 1P', pd.Series([0])), errors='coerce').fillna(0)
-                dist_con_2p = pd.to_numeric(jugador_data.get('Distancia CON posesión 2P', pd.Series([0])), errors='coerce').fillna(0)
-                maximum_record['Distancia CON posesión'] = (dist_con_1p + dist_con_2p).max()
-
-                # Distancia SIN posesión = suma por jornada, luego máximo
-                dist_sin_1p = pd.to_numeric(jugador_data.get('Distancia SIN posesión 1P', pd.Series([0])), errors='coerce').fillna(0)
-                dist_sin_2p = pd.to_numeric(jugador_data.get('Distancia SIN posesión 2P', pd.Series([0])), errors='coerce').fillna(0)
-                maximum_record['Distancia SIN posesión'] = (dist_sin_1p + dist_sin_2p).max()
-
-                # Distancia >21 km/h CON posesión = suma por jornada, luego máximo
-                dist21_con_1p = pd.to_numeric(jugador_data.get('Distancia >21 km / h CON posesión 1P', pd.Series([0])), errors='coerce').fillna(0)
-                dist21_con_2p = pd.to_numeric(jugador_data.get('Distancia >21 km / h CON posesión 2P', pd.Series([0])), errors='coerce').fillna(0)
-                maximum_record['Distancia >21 km / h CON posesión'] = (dist21_con_1p + dist21_con_2p).max()
-
-                # Distancia >21 km/h SIN posesión = suma por jornada, luego máximo
-                dist21_sin_1p = pd.to_numeric(jugador_data.get('Distancia >21 km / h SIN posesión 1P', pd.Series([0])), errors='coerce').fillna(0)
-                dist21_sin_2p = pd.to_numeric(jugador_data.get('Distancia >21 km / h SIN posesión 2P', pd.Series([0])), errors='coerce').fillna(0)
-                maximum_record['Distancia >21 km / h SIN posesión'] = (dist21_sin_1p + dist21_sin_2p).max()
-
-                # Distancia >24 km/h CON posesión = suma por jornada, luego máximo
-                dist24_con_1p = pd.to_numeric(jugador_data.get('Distancia >24 km / h CON posesión 1P', pd.Series([0])), errors='coerce').fillna(0)
-                dist24_con_2p = pd.to_numeric(jugador_data.get('Distancia >24 km / h CON posesión 2P', pd.Series([0])), errors='coerce').fillna(0)
-                maximum_record['Distancia >24 km / h CON posesión'] = (dist24_con_1p + dist24_con_2p).max()
-
-                # Distancia >24 km/h SIN posesión = suma por jornada, luego máximo
-                dist24_sin_1p = pd.to_numeric(jugador_data.get('Distancia >24 km / h SIN posesión 1P', pd.Series([0])), errors='coerce').fillna(0)
-                dist24_sin_2p = pd.to_numeric(jugador_data.get('Distancia >24 km / h SIN posesión 2P', pd.Series([0])), errors='coerce').fillna(0)
-                maximum_record['Distancia >24 km / h SIN posesión'] = (dist24_sin_1p + dist24_sin_2p).max()
-
-                maximum_data.append(maximum_record)
-        
-        # Calcular métricas combinadas CON y SIN posesión - MANEJANDO NaN
-        def safe_max_sum(series1, series2):
-            """Suma dos series manejando NaN y valores vacíos"""
-            s1 = pd.to_numeric(series1, errors='coerce').fillna(0)
-            s2 = pd.to_numeric(series2, errors='coerce').fillna(0)
-            result = s1.max() + s2.max()
-            return result if not pd.isna(result) else 0
-
-        maximum_record['Distancia CON posesión'] = safe_max_sum(
-            jugador_data.get('Distancia CON posesión 1P', pd.Series([0])),
-            jugador_data.get('Distancia CON posesión 2P', pd.Series([0]))
-        )
-
-        maximum_record['Distancia SIN posesión'] = safe_max_sum(
-            jugador_data.get('Distancia SIN posesión 1P', pd.Series([0])),
-            jugador_data.get('Distancia SIN posesión 2P', pd.Series([0]))
-        )
-
-        maximum_record['Distancia >21 km / h CON posesión'] = safe_max_sum(
-            jugador_data.get('Distancia >21 km / h CON posesión 1P', pd.Series([0])),
-            jugador_data.get('Distancia >21 km / h CON posesión 2P', pd.Series([0]))
-        )
-
-        maximum_record['Distancia >21 km / h SIN posesión'] = safe_max_sum(
-            jugador_data.get('Distancia >21 km / h SIN posesión 1P', pd.Series([0])),
-            jugador_data.get('Distancia >21 km / h SIN posesión 2P', pd.Series([0]))
-        )
-
-        maximum_record['Distancia >24 km / h CON posesión'] = safe_max_sum(
-            jugador_data.get('Distancia >24 km / h CON posesión 1P', pd.Series([0])),
-            jugador_data.get('Distancia >24 km / h CON posesión 2P', pd.Series([0]))
-        )
-
-        maximum_record['Distancia >24 km / h SIN posesión'] = safe_max_sum(
-            jugador_data.get('Distancia >24 km / h SIN posesión 1P', pd.Series([0])),
-            jugador_data.get('Distancia >24 km / h SIN posesión 2P', pd.Series([0]))
-        )
-
-        # También agregar las métricas básicas manejando NaN
-        maximum_record['Minutos CON posesión'] = pd.to_numeric(
-            jugador_data.get('Minutos CON posesión', pd.Series([0])), errors='coerce'
-        ).fillna(0).max()
-
-        maximum_record['Minutos SIN posesión'] = pd.to_numeric(
-            jugador_data.get('Minutos SIN posesión', pd.Series([0])), errors='coerce'
-        ).fillna(0).max()
-
-        # Convertir a DataFrame
-        if maximum_data:
-            result_df = pd.DataFrame(maximum_data)
+        if result_df is not None:
             print(f"✅ {len(result_df)} jugadores con al menos {min_minutes} minutos en una jornada")
             print(f"📊 DATOS MÁXIMOS para {equipo}: {len(result_df)} jugadores únicos")
             return result_df
@@ -449,24 +251,13 @@ class CampoFutbolMaximos:
             return None
     
     def load_team_logo(self, equipo):
-        """Carga el escudo del equipo"""
-        possible_names = [
-            equipo,
-            equipo.replace(' ', '_'),
-            equipo.replace(' ', ''),
-            equipo.lower(),
-            equipo.lower().replace(' ', '_'),
-            equipo.lower().replace(' ', '')
-        ]
-        
-        for name in possible_names:
-            logo_path = f"assets/escudos/{name}.png"
-            if os.path.exists(logo_path):
-                try:
-                    return plt.imread(logo_path)
-                except Exception as e:
-                    print(f"⚠️  Error al cargar escudo {logo_path}: {e}")
-                    continue
+        """Carga el escudo del equipo (ruta resuelta con el índice de assets/escudos)"""
+        logo_path = ruta_escudo(equipo)
+        if logo_path:
+            try:
+                return cargar_imagen(logo_path)
+            except Exception as e:
+                print(f"⚠️  Error al cargar escudo {logo_path}: {e}")
         
         print(f"⚠️  No se encontró el escudo para: {equipo}")
         return None
@@ -595,8 +386,9 @@ class CampoFutbolMaximos:
         """Crea el campo que ocupe TODA la página sin espacios"""
         print("🎯 Creando campo SIN espacios...")
         
-        # Crear pitch sin padding
-        pitch = Pitch(
+        # Campo sin padding desde la plantilla cacheada (césped y líneas se generan una vez por proceso)
+        fig, ax = crear_figura_campo(
+            figsize,
             pitch_color='grass', 
             line_color='white', 
             stripe=True, 
@@ -604,13 +396,6 @@ class CampoFutbolMaximos:
             pad_left=0, pad_right=0, pad_bottom=0, pad_top=0
         )
         
-        # Crear figura sin layouts automáticos
-        fig, ax = pitch.draw(
-            figsize=figsize,
-            tight_layout=False,
-            constrained_layout=False
-        )
-        
         # ✅ CONFIGURACIÓN AGRESIVA PARA ELIMINAR TODOS LOS ESPACIOS
         fig.subplots_adjust(left=0, right=1, top=1, bottom=0, wspace=0, hspace=0)
         ax.set_position([0, 0, 1, 1])
@@ -643,20 +428,21 @@ class CampoFutbolMaximos:
         metric_row_height = 1.0  # Altura por fila de métrica
         table_height = header_height + names_height + (num_metrics * metric_row_height)
         
+        # Celdas y textos se acumulan y se dibujan al final como colección (ver tabla_lote)
+        tabla = TablaLote(ax)
+        
         # 🎨 NUEVO FONDO MODERNO - Gradiente simulado con múltiples rectángulos (MÁS COMPACTO)
         # Fondo principal con bordes redondeados simulados
-        main_rect = plt.Rectangle((x - table_width/2, y - table_height/2), 
-                                table_width, table_height,
-                                facecolor='#2c3e50', alpha=0.95, 
-                                edgecolor='white', linewidth=2)  # Reducido de 3 a 2
-        ax.add_patch(main_rect)
+        tabla.celda(x - table_width/2, y - table_height/2, 
+                    table_width, table_height,
+                    facecolor='#2c3e50', alpha=0.95, 
+                    edgecolor='white', linewidth=2)  # Reducido de 3 a 2
         
         # Efecto de borde superior más claro (MÁS FINO)
-        top_rect = plt.Rectangle((x - table_width/2, y + table_height/2 - 0.5), 
-                                table_width, 0.5,  # Reducido de 1 a 0.5
-                                facecolor=team_colors['primary'], alpha=0.8,
-                                edgecolor='none')
-        ax.add_patch(top_rect)
+        tabla.celda(x - table_width/2, y + table_height/2 - 0.5, 
+                    table_width, 0.5,  # Reducido de 1 a 0.5
+                    facecolor=team_colors['primary'], alpha=0.8,
+                    edgecolor='none')
         
         # 📍 FILA 1: DEMARCACIÓN CON ESCUDO
         # Verificar si hay jugadores sin posición en esta tabla
@@ -668,29 +454,27 @@ class CampoFutbolMaximos:
             clean_position_name = position_name.replace('_', ' ').replace('Mc ', 'MC ').replace('Delantero Centro', 'DEL. CENTRO').replace('Segundo Delantero', '2º DELANTERO')
         
         # Crear el rectángulo del header
-        header_rect = plt.Rectangle((x - table_width/2, y + table_height/2 - header_height), 
-                                table_width, header_height,
-                                facecolor=team_colors['primary'], alpha=0.8,
-                                edgecolor='white', linewidth=1)
-        ax.add_patch(header_rect)
+        tabla.celda(x - table_width/2, y + table_height/2 - header_height, 
+                    table_width, header_height,
+                    facecolor=team_colors['primary'], alpha=0.8,
+                    edgecolor='white', linewidth=1)
 
         # Añadir escudo si está disponible
         text_x = x
 
         # Texto de la demarcación
-        ax.text(text_x, y + table_height/2 - header_height/2, clean_position_name, 
-                fontsize=8, weight='bold', color=team_colors['text'],
-                ha='center', va='center')
+        tabla.texto(text_x, y + table_height/2 - header_height/2, clean_position_name, 
+                    fontsize=8, weight='bold', color=team_colors['text'],
+                    ha='center', va='center')
         
         # 📍 FILA 2: NOMBRES + DORSALES
         names_y = y + table_height/2 - header_height - names_height/2
         
         # Fondo especial para la fila de nombres (BORDE MÁS FINO)
-        names_rect = plt.Rectangle((x - table_width/2 + metric_col_width, names_y - names_height/2), 
-                                num_players * player_col_width, names_height,
-                                facecolor='#34495e', alpha=0.7, 
-                                edgecolor='white', linewidth=0.5)  # Reducido de 1 a 0.5
-        ax.add_patch(names_rect)
+        tabla.celda(x - table_width/2 + metric_col_width, names_y - names_height/2, 
+                    num_players * player_col_width, names_height,
+                    facecolor='#34495e', alpha=0.7, 
+                    edgecolor='white', linewidth=0.5)  # Reducido de 1 a 0.5
         
         # 🏆 AÑADIR ESCUDO EN LA COLUMNA DE MÉTRICAS, FILA DE NOMBRES
         if team_logo is not None:
@@ -709,7 +493,7 @@ class CampoFutbolMaximos:
                 zoom_factor = min(metric_col_width / 100, names_height / 100) * 0.8
                 
                 # Crear imagen del escudo
-                imagebox = OffsetImage(team_logo, zoom=zoom_factor)
+                imagebox = imagen_offset(team_logo, zoom=zoom_factor)
                 ab = AnnotationBbox(imagebox, (logo_x, logo_y), 
                                 frameon=False, 
                                 boxcoords='data',
@@ -735,14 +519,14 @@ class CampoFutbolMaximos:
             # (Se elimina el círculo completamente)
             
             # Número del dorsal (MÁS GRANDE Y EN NEGRITA)
-            ax.text(player_x, names_y + 0.4, str(dorsal), 
-                    fontsize=12, weight='bold', color=team_colors['primary'],  # Aumentado a 12 y color del equipo
-                    ha='center', va='center')
+            tabla.texto(player_x, names_y + 0.4, str(dorsal), 
+                        fontsize=12, weight='bold', color=team_colors['primary'],  # Aumentado a 12 y color del equipo
+                        ha='center', va='center')
             
             # Nombre del jugador debajo del dorsal
-            ax.text(player_x, names_y - 0.6, player_name, 
-                    fontsize=5, weight='bold', color='white',
-                    ha='center', va='center')
+            tabla.texto(player_x, names_y - 0.6, player_name, 
+                        fontsize=5, weight='bold', color='white',
+                        ha='center', va='center')
         
         # 📍 FILAS 3+: MÉTRICAS Y VALORES
         for i, metric in enumerate(self.metricas_principales):
@@ -750,18 +534,16 @@ class CampoFutbolMaximos:
             
             # Fondo alternado para las filas de métricas
             if i % 2 == 0:
-                row_rect = plt.Rectangle((x - table_width/2, metric_y - metric_row_height/2), 
-                                    table_width, metric_row_height,
-                                    facecolor='#3c566e', alpha=0.3, 
-                                    edgecolor='none')
-                ax.add_patch(row_rect)
+                tabla.celda(x - table_width/2, metric_y - metric_row_height/2, 
+                            table_width, metric_row_height,
+                            facecolor='#3c566e', alpha=0.3, 
+                            edgecolor='none')
             
             # Columna de métrica (nombre) con fondo destacado (BORDE MÁS FINO)
-            metric_bg = plt.Rectangle((x - table_width/2, metric_y - metric_row_height/2), 
-                                    metric_col_width, metric_row_height,
-                                    facecolor=team_colors['primary'], alpha=0.6,
-                                    edgecolor='white', linewidth=0.3)  # Reducido de 0.5 a 0.3
-            ax.add_patch(metric_bg)
+            tabla.celda(x - table_width/2, metric_y - metric_row_height/2, 
+                        metric_col_width, metric_row_height,
+                        facecolor=team_colors['primary'], alpha=0.6,
+                        edgecolor='white', linewidth=0.3)  # Reducido de 0.5 a 0.3
             
             # Nombre de la métrica (FUENTE MÁS PEQUEÑA)
             metric_name = (metric.replace('Distancia ', 'Dist. ')
@@ -770,9 +552,9 @@ class CampoFutbolMaximos:
                     .replace('SIN posesión', 'S/Pos')
                     .replace('>21 km / h', '>21')
                     .replace('>24 km / h', '>24'))
-            ax.text(x - table_width/2 + metric_col_width/2, metric_y, metric_name, 
-                    fontsize=5, weight='bold', color='white',  # Reducido de 7 a 5
-                    ha='center', va='center')
+            tabla.texto(x - table_width/2 + metric_col_width/2, metric_y, metric_name, 
+                        fontsize=5, weight='bold', color='white',  # Reducido de 7 a 5
+                        ha='center', va='center')
             
             # Valores para cada jugador
             for j, player in enumerate(players_list):
@@ -797,9 +579,11 @@ class CampoFutbolMaximos:
                 max_value = max([p.get(metric, 0) for p in players_list])
                 text_color = '#FFD700' if value == max_value and value > 0 else 'white'
                 
-                ax.text(player_x, metric_y, formatted_value, 
-                        fontsize=6, weight='bold', color=text_color,  # Dorado para valores máximos
-                        ha='center', va='center')
+                tabla.texto(player_x, metric_y, formatted_value, 
+                            fontsize=6, weight='bold', color=text_color,  # Dorado para valores máximos
+                            ha='center', va='center')
+        
+        tabla.dibujar()
         
         # 🔹 LÍNEAS SEPARADORAS ELEGANTES (MÁS FINAS)
         # Línea horizontal debajo de nombres
@@ -913,8 +697,9 @@ class CampoFutbolMaximos:
                          edgecolor='white', linewidth=2))
         
         # 🔥 OBTENER DATOS MÁXIMOS de ambos equipos (en lugar de acumulados)
-        villarreal_data = self.filter_and_get_maximum_data('Villarreal CF', jornadas)
-        rival_data = self.filter_and_get_maximum_data(equipo_rival, jornadas)
+        equipos = ('Villarreal CF', equipo_rival)
+        villarreal_data = self.filter_and_get_maximum_data('Villarreal CF', jornadas, equipos=equipos)
+        rival_data = self.filter_and_get_maximum_data(equipo_rival, jornadas, equipos=equipos)
         
         if villarreal_data is None or len(villarreal_data) == 0:
             print("❌ No hay jugadores de Villarreal CF con al menos 70 minutos en una jornada")
@@ -930,12 +715,12 @@ class CampoFutbolMaximos:
         
         # Posicionar escudos dentro del campo
         if villarreal_logo is not None:
-            imagebox = OffsetImage(villarreal_logo, zoom=0.08)
+            imagebox = imagen_offset(villarreal_logo, zoom=0.08)
             ab = AnnotationBbox(imagebox, (5, 5), frameon=False)
             ax.add_artist(ab)
         
         if rival_logo is not None:
-            imagebox = OffsetImage(rival_logo, zoom=0.08)
+            imagebox = imagen_offset(rival_logo, zoom=0.08)
             ab = AnnotationBbox(imagebox, (115, 5), frameon=False)
             ax.add_artist(ab)
         
@@ -1089,11 +874,12 @@ def main_campo_futbol_maximos():
         import traceback
         traceback.print_exc()
 
-def generar_reporte_campo_maximos(equipo_rival, jornadas, mostrar=True, guardar=True):
+def generar_reporte_campo_maximos(equipo_rival, jornadas, mostrar=True, guardar=True, borrador=False):
     """🔥 FUNCIÓN PARA GENERAR UN REPORTE PERSONALIZADO CON DATOS MÁXIMOS"""
     try:
         report_generator = CampoFutbolMaximos()
-        fig = report_generator.create_visualization(equipo_rival, jornadas)
+        with resolucion_borrador(borrador), figuras_sin_pantalla(not mostrar):
+            fig = report_generator.create_visualization(equipo_rival, jornadas)
         
         if fig:
             if mostrar:
@@ -1102,6 +888,10 @@ def generar_reporte_campo_maximos(equipo_rival, jornadas, mostrar=True, guardar=
             if guardar:
                 equipo_filename = equipo_rival.replace(' ', '_').replace('/', '_')
                 output_path = f"reporte_MAXIMOS_Villarreal_vs_{equipo_filename}.pdf"
+                
+                if borrador:
+                    guardar_borrador(fig, output_path)
+                    return fig
                 report_generator.guardar_sin_espacios(fig, output_path)
             
             return fig
@@ -1,10 +1,18 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.offsetbox import AnnotationBbox
 import numpy as np
 import os
 from difflib import SequenceMatcher
+from datos_compartidos import (cargar_datos_limpios, condicion_partido, filas_partido, limpiar_nombre_equipo,
+                               partes_partido, ultimas_jornadas, ultimos_partidos)
+from registro_assets import cargar_imagen, imagen_offset, ruta_escudo
+from ciclo_figuras import figuras_sin_pantalla, nueva_figura
+from modo_borrador import guardar_borrador, resolucion_borrador
+from tabla_lote import TablaLote
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -25,12 +33,12 @@ plt.rcParams.update({
 })
 
 try:
-    from mplsoccer import Pitch
+    from plantilla_campo import dibujar_campo
 except ImportError:
     print("Instalando mplsoccer...")
     import subprocess
     subprocess.check_call(["pip", "install", "mplsoccer"])
-    from mplsoccer import Pitch
+    from plantilla_campo import dibujar_campo
 
 class ReporteTactico4CamposHorizontalesMejorado:
     def __init__(self, data_path="prueba_extraccion/data/rendimiento_fisico.parquet"):
@@ -41,7 +49,6 @@ class ReporteTactico4CamposHorizontalesMejorado:
         self.data_path = data_path
         self.df = None
         self.load_data()
-        self.clean_team_names()
         
         # 🏟️ COORDENADAS FIJAS PARA CAMPOS HORIZONTALES (Pitch 0-120 x 0-80)
         self.coordenadas_posiciones = {
@@ -117,9 +124,9 @@ class ReporteTactico4CamposHorizontalesMejorado:
         self.default_team_colors = {'primary': '#2c3e50', 'secondary': '#FFFFFF', 'text': 'white'}
         
     def load_data(self):
-        """Carga los datos del archivo parquet"""
+        """Carga los datos limpios del parquet (compartidos por los informes del proceso)"""
         try:
-            self.df = pd.read_parquet(self.data_path)
+            self.df = cargar_datos_limpios(self.data_path)
             print(f"✅ Datos cargados: {self.df.shape[0]} filas, {self.df.shape[1]} columnas")
         except Exception as e:
             print(f"❌ Error al cargar datos: {e}")
@@ -128,45 +135,6 @@ class ReporteTactico4CamposHorizontalesMejorado:
         """Calcula la similitud entre dos strings"""
         return SequenceMatcher(None, a.lower(), b.lower()).ratio()
     
-    def clean_team_names(self):
-        """Limpia y agrupa nombres de equipos similares"""
-        if self.df is None:
-            return
-        
-        # Limpiar nombres de equipos
-        unique_teams = self.df['Equipo'].unique()
-        team_mapping = {}
-        processed_teams = set()
-        
-        for team in unique_teams:
-            if team in processed_teams:
-                continue
-                
-            similar_teams = [team]
-            for other_team in unique_teams:
-                if other_team != team and other_team not in processed_teams:
-                    if self.similarity(team, other_team) > 0.7:
-                        similar_teams.append(other_team)
-            
-            canonical_name = max(similar_teams, key=len)
-            for similar_team in similar_teams:
-                team_mapping[similar_team] = canonical_name
-                processed_teams.add(similar_team)
-        
-        self.df['Equipo'] = self.df['Equipo'].map(team_mapping)
-        
-        # Normalizar jornadas
-        def normalize_jornada(jornada):
-            if isinstance(jornada, str) and jornada.startswith(('J', 'j')):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            return jornada
-        
-        self.df['Jornada'] = self.df['Jornada'].apply(normalize_jornada)
-        print(f"✅ Limpieza completada. Equipos únicos: {len(self.df['Equipo'].unique())}")
-        
     def get_available_teams(self):
         """Retorna equipos disponibles"""
         if self.df is None:
@@ -181,70 +149,26 @@ class ReporteTactico4CamposHorizontalesMejorado:
     
     def determinar_local_visitante(self, partido, equipo):
         """Determina si un partido es local o visitante para un equipo"""
-        if '-' not in partido:
-            return 'desconocido'
-        
-        partes = partido.split('-')
-        if len(partes) != 2:
-            return 'desconocido'
-        
-        equipo_local_partido = partes[0].strip()
-        equipo_visitante_partido = partes[1].strip()
-        
-        sim_local = self.similarity(equipo, equipo_local_partido)
-        sim_visitante = self.similarity(equipo, equipo_visitante_partido)
-        
-        if sim_local > sim_visitante:
-            return 'local'
-        elif sim_visitante > sim_local:
-            return 'visitante'
-        else:
-            return 'desconocido'
+        info = partes_partido([partido]).iloc[0]
+        return condicion_partido(equipo, info['Equipo Local'], info['Equipo Visitante'])
 
     def extraer_rival(self, partido, equipo):
         """Extrae el nombre del equipo rival del partido"""
-        if '-' not in partido:
+        info = partes_partido([partido]).iloc[0]
+        if pd.isna(info['Equipo Local']):
             return 'Rival'
         
-        partes = partido.split('-')
-        if len(partes) != 2:
-            return 'Rival'
-        
-        equipo_local = partes[0].strip()
-        equipo_visitante = partes[1].strip()
-        
-        sim_local = self.similarity(equipo, equipo_local)
-        sim_visitante = self.similarity(equipo, equipo_visitante)
-        
-        if sim_local > sim_visitante:
-            return equipo_visitante
+        if condicion_partido(equipo, info['Equipo Local'], info['Equipo Visitante']) == 'local':
+            return info['Equipo Visitante']
         else:
-            return equipo_local
+            return info['Equipo Local']
     
     def get_last_5_jornadas(self, equipo, jornada_referencia):
         """Obtiene las últimas 5 jornadas incluyendo la de referencia"""
-        jornadas_disponibles = self.get_available_jornadas()
-        
-        # Normalizar jornada de referencia
-        if isinstance(jornada_referencia, str) and jornada_referencia.startswith('J'):
-            try:
-                jornada_referencia = int(jornada_referencia[1:])
-            except ValueError:
-                pass
-        elif isinstance(jornada_referencia, str) and jornada_referencia.startswith('j'):
-            try:
-                jornada_referencia = int(jornada_referencia[1:])
-            except ValueError:
-                pass
-        
-        # Filtrar jornadas menores o iguales a la de referencia
-        jornadas_validas = [j for j in jornadas_disponibles if j <= jornada_referencia]
-        
-        # Tomar las últimas 5
-        if len(jornadas_validas) >= 5:
-            return sorted(jornadas_validas)[-5:]
-        else:
-            return sorted(jornadas_validas)
+        if self.df is None:
+            return []
+        # Jornadas de toda la liga, desde el índice construido al cargar los datos
+        return ultimas_jornadas(self.df, jornada_referencia, 5)
 
     def get_posible_11(self, equipo, jornada):
         """Obtiene el posible 11 inicial basado en minutos jugados en las últimas 5 jornadas"""
@@ -484,82 +408,22 @@ class ReporteTactico4CamposHorizontalesMejorado:
     
     def parsear_partido_completo(self, partido, equipo):
         """Parsea un partido completo manteniendo el orden original"""
-        if '-' not in partido:
-            return equipo, 'Rival', 'N', 'N', 'desconocido'
-        
-        partes = partido.split('-')
-        if len(partes) != 2:
+        info = partes_partido([partido]).iloc[0]
+        if pd.isna(info['Equipo Local']):
             return equipo, 'Rival', 'N', 'N', 'desconocido'
         
-        parte_local = partes[0].strip()
-        parte_visitante = partes[1].strip()
-        
-        import re
-        
-        # Para la parte local
-        match_local = re.match(r'(.+?)(\d+)$', parte_local)
-        if match_local:
-            equipo_local_raw = match_local.group(1)
-            goles_local = match_local.group(2)
-        else:
-            equipo_local_raw = parte_local
-            goles_local = 'N'
-        
-        # Para la parte visitante
-        match_visitante = re.match(r'(\d+)(.+)$', parte_visitante)
-        if match_visitante:
-            goles_visitante = match_visitante.group(1)
-            equipo_visitante_raw = match_visitante.group(2)
-        else:
-            goles_visitante = 'N'
-            equipo_visitante_raw = parte_visitante
-        
-        equipo_local_limpio = self.limpiar_nombre_equipo(equipo_local_raw)
-        equipo_visitante_limpio = self.limpiar_nombre_equipo(equipo_visitante_raw)
-        
-        sim_local = self.similarity(equipo, equipo_local_limpio)
-        sim_visitante = self.similarity(equipo, equipo_visitante_limpio)
+        goles_local = 'N' if pd.isna(info['Goles Local']) else str(info['Goles Local'])
+        goles_visitante = 'N' if pd.isna(info['Goles Visitante']) else str(info['Goles Visitante'])
         
-        if sim_local > sim_visitante:
-            return equipo_local_limpio, equipo_visitante_limpio, goles_local, goles_visitante, 'local'
+        if condicion_partido(equipo, info['Equipo Local'], info['Equipo Visitante']) == 'local':
+            tipo = 'local'
         else:
-            return equipo_local_limpio, equipo_visitante_limpio, goles_local, goles_visitante, 'visitante'
+            tipo = 'visitante'
+        return info['Equipo Local'], info['Equipo Visitante'], goles_local, goles_visitante, tipo
 
     def limpiar_nombre_equipo(self, nombre_raw):
         """Limpia nombres de equipos"""
-        equipos_conocidos = {
-            'sevillafc': 'Sevilla FC',
-            'getafecf': 'Getafe CF', 
-            'gironafc': 'Girona FC',
-            'villarrealcf': 'Villarreal CF',
-            'realmadrid': 'Real Madrid',
-            'fcbarcelona': 'FC Barcelona',
-            'athleticclub': 'Athletic Club',
-            'atleticodemadrid': 'Atlético de Madrid',
-            'realbetis': 'Real Betis',
-            'realsociedad': 'Real Sociedad',
-            'valenciacf': 'Valencia CF',
-            'rcelta': 'RC Celta',
-            'caosasuna': 'CA Osasuna',
-            'rayovallecano': 'Rayo Vallecano',
-            'udlaspalmas': 'UD Las Palmas',
-            'rcdespanyol': 'RCD Espanyol',
-            'deportivoalaves': 'Deportivo Alavés',
-            'cdleganes': 'CD Leganés',
-            'realvalladolidcf': 'Real Valladolid CF',
-            'rcdmallorca': 'RCD Mallorca'
-        }
-        
-        nombre_lower = nombre_raw.lower().strip()
-        
-        if nombre_lower in equipos_conocidos:
-            return equipos_conocidos[nombre_lower]
-        
-        for key, value in equipos_conocidos.items():
-            if key in nombre_lower or nombre_lower in key:
-                return value
-        
-        return nombre_raw.replace('fc', ' FC').replace('cf', ' CF').title()
+        return limpiar_nombre_equipo(nombre_raw)
     
     def get_ultimos_4_partidos(self, equipo, jornada_maxima, tipo_partido_filter=None, min_minutos=60):
         """Obtiene los últimos 4 partidos del equipo"""
@@ -575,58 +439,35 @@ class ReporteTactico4CamposHorizontalesMejorado:
         tipo_display = tipo_partido_filter.upper() if tipo_partido_filter else "TODOS"
         print(f"🔍 Buscando últimos 4 partidos {tipo_display} para {equipo} hasta jornada {jornada_maxima}")
         
-        filtrado = self.df[
-            (self.df['Equipo'] == equipo) & 
-            (self.df['Jornada'] <= jornada_maxima)
-        ].copy()
-        
-        if len(filtrado) == 0:
-            return []
-        
-        partidos_info = filtrado[['Partido', 'Jornada']].drop_duplicates()
-        
-        if tipo_partido_filter:
-            partidos_filtrados = []
-            for _, partido_info in partidos_info.iterrows():
-                partido = partido_info['Partido']
-                tipo = self.determinar_local_visitante(partido, equipo)
-                if tipo == tipo_partido_filter:
-                    partidos_filtrados.append(partido_info)
-            
-            if partidos_filtrados:
-                partidos_info = pd.DataFrame(partidos_filtrados)
-            else:
+        # Índice de partidos por equipo (ordenado por jornada, con local/visitante) de datos_compartidos;
+        # el alias vacío ya se rellena con el nombre al cargar los datos
+        ultimos = ultimos_partidos(self.df, equipo, jornada_maxima, 4, tipo_partido_filter)
+        if not ultimos:
+            if tipo_partido_filter:
                 print(f"❌ No hay partidos {tipo_partido_filter.upper()} para {equipo}")
-                return []
-        
-        partidos_info = partidos_info.sort_values('Jornada', ascending=False)
-        
-        ultimos_partidos = partidos_info.head(4)
+            return []
         
         resultados = []
-        for _, partido_info in ultimos_partidos.iterrows():
-            partido = partido_info['Partido']
-            jornada = partido_info['Jornada']
-            
-            if 'Nombre' in filtrado.columns:
-                mask_empty_alias = filtrado['Alias'].isna() | (filtrado['Alias'] == '') | (filtrado['Alias'].str.strip() == '')
-                filtrado.loc[mask_empty_alias, 'Alias'] = filtrado.loc[mask_empty_alias, 'Nombre']
+        for partido_info in ultimos:
+            partido = partido_info['partido']
+            jornada = partido_info['jornada']
             
-            datos_partido = filtrado[filtrado['Partido'] == partido].copy()
+            datos_partido = filas_partido(self.df, equipo, partido, jornada)
             
             if 'Minutos jugados' in datos_partido.columns:
                 datos_partido = datos_partido[datos_partido['Minutos jugados'] >= min_minutos]
             
             if len(datos_partido) > 0:
-                tipo_partido = self.determinar_local_visitante(partido, equipo)
-                rival = self.extraer_rival(partido, equipo)
+                rival = datos_partido['Rival'].iloc[0]
+                if pd.isna(rival):
+                    rival = 'Rival'
                 
                 resultados.append({
                     'partido': partido,
                     'jornada': jornada,
-                    'tipo': tipo_partido,
+                    'tipo': partido_info['condicion'],
                     'rival': rival,
-                    'datos': datos_partido
+                    'datos': datos_partido.copy()
                 })
         
         print(f"🎯 Total partidos {tipo_display} seleccionados: {len(resultados)}")
@@ -668,10 +509,7 @@ class ReporteTactico4CamposHorizontalesMejorado:
         return self.default_team_colors
     
     def load_team_logo(self, equipo):
-        """Carga el escudo del equipo CON BÚSQUEDA INTELIGENTE"""
-        import os
-        import glob
-        
+        """Carga el escudo del equipo CON BÚSQUEDA INTELIGENTE (índice de assets/escudos, memoizado)"""
         # 🏆 MAPEO DIRECTO DE EQUIPOS CONOCIDOS
         mapeo_escudos = {
             'Sevilla FC': 'sevillafc',
@@ -696,69 +534,22 @@ class ReporteTactico4CamposHorizontalesMejorado:
             'Girona FC': 'gironafc'
         }
         
-        # Buscar mapeo directo primero
-        if equipo in mapeo_escudos:
-            logo_path = f"assets/escudos/{mapeo_escudos[equipo]}.png"
-            if os.path.exists(logo_path):
-                try:
-                    print(f"✅ Escudo encontrado (mapeo directo): {logo_path}")
-                    return plt.imread(logo_path)
-                except Exception as e:
-                    print(f"⚠️ Error al cargar {logo_path}: {e}")
-        
-        # Lista de posibles nombres a buscar
-        possible_names = [
-            equipo,
-            equipo.replace(' ', '_'),
-            equipo.replace(' ', ''),
-            equipo.lower(),
-            equipo.lower().replace(' ', '_'),
-            equipo.lower().replace(' ', ''),
-            equipo.upper(),
-            equipo.upper().replace(' ', '_'),
-            equipo.upper().replace(' ', ''),
-            # Nombres específicos conocidos
+        # Nombres alternativos: mapeo directo y variantes sin prefijos habituales
+        alias = [
+            mapeo_escudos.get(equipo, equipo),
             equipo.replace('FC ', '').replace('CF ', '').replace('CD ', '').replace('CA ', ''),
             equipo.replace('Real ', '').replace('RC ', '').replace('RCD ', '').replace('UD ', ''),
             equipo.replace('Atlético de ', 'Atletico').replace('Deportivo ', ''),
         ]
         
-        # Buscar coincidencia exacta primero
-        for name in possible_names:
-            logo_path = f"assets/escudos/{name}.png"
-            if os.path.exists(logo_path):
-                try:
-                    print(f"✅ Escudo encontrado: {logo_path}")
-                    return plt.imread(logo_path)
-                except Exception as e:
-                    print(f"⚠️ Error al cargar {logo_path}: {e}")
-                    continue
-        
-        # Si no encuentra, buscar por similitud en todos los archivos PNG
-        try:
-            escudos_disponibles = glob.glob("assets/escudos/*.png")
-            equipo_limpio = equipo.lower().replace(' ', '').replace('fc', '').replace('cf', '')
-            
-            for escudo_path in escudos_disponibles:
-                nombre_archivo = os.path.basename(escudo_path).lower().replace('.png', '')
-                
-                # Calcular similitud
-                similitud = self.similarity(equipo_limpio, nombre_archivo)
-                
-                if similitud > 0.6:  # Si similitud > 60%
-                    try:
-                        print(f"✅ Escudo encontrado por similitud ({similitud:.2f}): {escudo_path}")
-                        return plt.imread(escudo_path)
-                    except Exception as e:
-                        print(f"⚠️ Error al cargar {escudo_path}: {e}")
-                        continue
-            
-            print(f"📁 Archivos disponibles en assets/escudos/:")
-            for escudo in escudos_disponibles[:10]:  # Mostrar primeros 10
-                print(f"   {os.path.basename(escudo)}")
-            
-        except Exception as e:
-            print(f"⚠️ Error buscando escudos: {e}")
+        # Coincidencia por nombre y, si no, por similitud (> 60%) con los archivos disponibles
+        logo_path = ruta_escudo(equipo, alias=alias, similitud_minima=0.6)
+        if logo_path:
+            try:
+                print(f"✅ Escudo encontrado: {logo_path}")
+                return cargar_imagen(logo_path)
+            except Exception as e:
+                print(f"⚠️ Error al cargar {logo_path}: {e}")
         
         print(f"❌ No se encontró escudo para: {equipo}")
         return None
@@ -768,7 +559,7 @@ class ReporteTactico4CamposHorizontalesMejorado:
         background_path = "assets/fondo_informes.png"
         if os.path.exists(background_path):
             try:
-                return plt.imread(background_path)
+                return cargar_imagen(background_path)
             except Exception:
                 print(f"⚠️ No se pudo cargar la imagen de fondo: {background_path}")
                 return None
@@ -778,8 +569,10 @@ class ReporteTactico4CamposHorizontalesMejorado:
         """🔥 MÉTODO MEJORADO: Crea campo horizontal SIN ESPACIOS como el primer script"""
         print("🎯 Creando campo horizontal SIN espacios...")
         
-        # Crear pitch sin padding
-        pitch = Pitch(
+        # Dibujar en el ax proporcionado clonando la plantilla cacheada: los 4 campos de la página
+        # comparten césped y líneas, solo se generan una vez por proceso
+        pitch = dibujar_campo(
+            ax,
             pitch_color='grass', 
             line_color='white', 
             stripe=True, 
@@ -787,9 +580,6 @@ class ReporteTactico4CamposHorizontalesMejorado:
             pad_left=0, pad_right=0, pad_bottom=0, pad_top=0
         )
         
-        # Dibujar en el ax proporcionado
-        pitch.draw(ax=ax)
-        
         # 🔥 CONFIGURACIÓN AGRESIVA PARA ELIMINAR ESPACIOS (COPIADA DEL PRIMER SCRIPT)
         ax.set_position(ax.get_position())
         ax.margins(0, 0)
@@ -872,33 +662,33 @@ class ReporteTactico4CamposHorizontalesMejorado:
                         .replace('Velocidad Máxima Total', 'VMax'))
             metricas_cortas.append(metrica_corta)
         
+        # Celdas y textos se acumulan y se dibujan al final como colección (ver tabla_lote)
+        tabla = TablaLote(ax)
+        
         # Fondo principal
-        main_rect = plt.Rectangle((x - table_width/2, y - table_height/2), 
-                                table_width, table_height,
-                                facecolor='#2c3e50', alpha=0.95, 
-                                edgecolor='white', linewidth=1.5)
-        ax.add_patch(main_rect)
+        tabla.celda(x - table_width/2, y - table_height/2, 
+                    table_width, table_height,
+                    facecolor='#2c3e50', alpha=0.95, 
+                    edgecolor='white', linewidth=1.5)
         
         # Header
-        header_rect = plt.Rectangle((x - table_width/2, y + table_height/2 - header_height), 
-                                table_width, header_height,
-                                facecolor=team_colors['primary'], alpha=0.8,
-                                edgecolor='white', linewidth=1)
-        ax.add_patch(header_rect)
+        tabla.celda(x - table_width/2, y + table_height/2 - header_height, 
+                    table_width, header_height,
+                    facecolor=team_colors['primary'], alpha=0.8,
+                    edgecolor='white', linewidth=1)
         
         clean_position_name = posicion_name.replace('_', ' ').title()
-        ax.text(x, y + table_height/2 - header_height/2, clean_position_name, 
-                fontsize=fontsize_header, weight='bold', color=team_colors['text'],
-                ha='center', va='center')
+        tabla.texto(x, y + table_height/2 - header_height/2, clean_position_name, 
+                    fontsize=fontsize_header, weight='bold', color=team_colors['text'],
+                    ha='center', va='center')
         
         # Fila de nombres
         names_y = y + table_height/2 - header_height - names_height/2
         
-        names_rect = plt.Rectangle((x - table_width/2 + metric_col_width, names_y - names_height/2), 
-                                num_players * player_col_width, names_height,
-                                facecolor='#34495e', alpha=0.7, 
-                                edgecolor='white', linewidth=0.5)
-        ax.add_patch(names_rect)
+        tabla.celda(x - table_width/2 + metric_col_width, names_y - names_height/2, 
+                    num_players * player_col_width, names_height,
+                    facecolor='#34495e', alpha=0.7, 
+                    edgecolor='white', linewidth=0.5)
 
         # Escudo
         if team_logo is not None:
@@ -907,7 +697,7 @@ class ReporteTactico4CamposHorizontalesMejorado:
                 logo_y = names_y
                 zoom_factor = min(metric_col_width / 120, names_height / 120) * 1
         
-                imagebox = OffsetImage(team_logo, zoom=zoom_factor)
+                imagebox = imagen_offset(team_logo, zoom=zoom_factor)
                 ab = AnnotationBbox(imagebox, (logo_x, logo_y), frameon=False)
                 ax.add_artist(ab)
             except Exception as e:
@@ -930,34 +720,32 @@ class ReporteTactico4CamposHorizontalesMejorado:
             else:
                 font_size_name = int(fontsize_nombres * 0.7)
             
-            ax.text(player_x, names_y + 0.8 * scale, nombre_ajustado, 
-                    fontsize=font_size_name, weight='bold', color='white',
-                    ha='center', va='center')
+            tabla.texto(player_x, names_y + 0.8 * scale, nombre_ajustado, 
+                        fontsize=font_size_name, weight='bold', color='white',
+                        ha='center', va='center')
             
-            ax.text(player_x, names_y - 0.8 * scale, str(dorsal), 
-                    fontsize=int(7 * scale), weight='bold', color=team_colors['primary'],
-                    ha='center', va='center')
+            tabla.texto(player_x, names_y - 0.8 * scale, str(dorsal), 
+                        fontsize=int(7 * scale), weight='bold', color=team_colors['primary'],
+                        ha='center', va='center')
         
         # Filas de métricas
         for i, metrica in enumerate(self.metricas_tabla):
             metric_y = names_y - names_height/2 - (i + 1) * metric_row_height + metric_row_height/2
             
             if i % 2 == 0:
-                row_rect = plt.Rectangle((x - table_width/2, metric_y - metric_row_height/2), 
-                                    table_width, metric_row_height,
-                                    facecolor='#3c566e', alpha=0.3)
-                ax.add_patch(row_rect)
+                tabla.celda(x - table_width/2, metric_y - metric_row_height/2, 
+                            table_width, metric_row_height,
+                            facecolor='#3c566e', alpha=0.3)
             
-            metric_bg = plt.Rectangle((x - table_width/2, metric_y - metric_row_height/2), 
-                                    metric_col_width, metric_row_height,
-                                    facecolor=team_colors['primary'], alpha=0.6,
-                                    edgecolor='white', linewidth=0.3)
-            ax.add_patch(metric_bg)
+            tabla.celda(x - table_width/2, metric_y - metric_row_height/2, 
+                        metric_col_width, metric_row_height,
+                        facecolor=team_colors['primary'], alpha=0.6,
+                        edgecolor='white', linewidth=0.3)
             
             metrica_corta = metricas_cortas[i]
-            ax.text(x - table_width/2 + metric_col_width/2, metric_y, metrica_corta, 
-                    fontsize=fontsize_metricas, weight='bold', color='white',
-                    ha='center', va='center')
+            tabla.texto(x - table_width/2 + metric_col_width/2, metric_y, metrica_corta, 
+                        fontsize=fontsize_metricas, weight='bold', color='white',
+                        ha='center', va='center')
             
             # Valores
             for j, jugador in enumerate(jugadores_list):
@@ -974,9 +762,11 @@ class ReporteTactico4CamposHorizontalesMejorado:
                 else:
                     valor_format = "N/A"
                 
-                ax.text(player_x, metric_y, valor_format, 
-                        fontsize=fontsize_valores, weight='bold', color='#FFD700',
-                        ha='center', va='center')
+                tabla.texto(player_x, metric_y, valor_format, 
+                            fontsize=fontsize_valores, weight='bold', color='#FFD700',
+                            ha='center', va='center')
+        
+        tabla.dibujar()
 
     def ajustar_texto_columna(self, texto, ancho_columna, scale):
         """Ajusta el texto para que encaje perfectamente en la columna"""
@@ -1017,8 +807,8 @@ class ReporteTactico4CamposHorizontalesMejorado:
         fig_y = bbox.y0 + 0.005  # ← Abajo del campo
 
         # 🔧 CALCULAR ANCHO REAL DEL TEXTO
-        import matplotlib.pyplot as plt
-        temp_fig = plt.figure(figsize=(1, 1))
+        temp_fig = Figure(figsize=(1, 1))
+        FigureCanvasAgg(temp_fig)
         temp_ax = temp_fig.add_subplot(111)
 
         # Crear texto temporal para medir dimensiones
@@ -1034,8 +824,8 @@ class ReporteTactico4CamposHorizontalesMejorado:
         ancho_texto_fig = ancho_texto_pixels / ax.figure.dpi / ax.figure.get_size_inches()[0]
         alto_texto_fig = alto_texto_pixels / ax.figure.dpi / ax.figure.get_size_inches()[1]
 
-        # Cerrar figura temporal
-        plt.close(temp_fig)
+        # Liberar figura temporal
+        temp_fig.clear()
 
         # 🔧 DIMENSIONES AJUSTADAS CON PADDING
         padding_horizontal = ancho_texto_fig * 0.2  # 20% de padding horizontal
@@ -1136,7 +926,7 @@ class ReporteTactico4CamposHorizontalesMejorado:
             return None
         
         # 🔥 CREAR FIGURA CON DIMENSIONES MEJORADAS Y CONFIGURACIÓN AGRESIVA
-        fig = plt.figure(figsize=figsize, constrained_layout=False)
+        fig = nueva_figura(figsize=figsize, constrained_layout=False)
         
         # 🔥 CONFIGURACIÓN AGRESIVA PARA ELIMINAR ESPACIOS (COPIADA DEL PRIMER SCRIPT)
         fig.subplots_adjust(left=0, right=1, top=0.93, bottom=0, wspace=0.0, hspace=0.0)
@@ -1323,11 +1113,12 @@ def main_4_campos_horizontales_coordenadas_fijas():
         import traceback
         traceback.print_exc()
 
-def generar_4_campos_coordenadas_fijas(equipo, jornada_maxima, tipo_partido_filter=None, mostrar=True, guardar=True):
+def generar_4_campos_coordenadas_fijas(equipo, jornada_maxima, tipo_partido_filter=None, mostrar=True, guardar=True, borrador=False):
     """Función para uso directo con coordenadas fijas"""
     try:
         report_gen = ReporteTactico4CamposHorizontalesMejorado()
-        fig = report_gen.crear_4_partidos_campos_horizontales(equipo, jornada_maxima, tipo_partido_filter)
+        with resolucion_borrador(borrador), figuras_sin_pantalla(not mostrar):
+            fig = report_gen.crear_4_partidos_campos_horizontales(equipo, jornada_maxima, tipo_partido_filter)
         
         if fig:
             if mostrar:
@@ -1335,6 +1126,10 @@ def generar_4_campos_coordenadas_fijas(equipo, jornada_maxima, tipo_partido_filt
             if guardar:
                 tipo_filename = f"_{tipo_partido_filter}" if tipo_partido_filter else "_todos"
                 filename = f"reporte_4_campos_FIJAS_{equipo.replace(' ', '_')}_hasta_J{jornada_maxima}{tipo_filename}.pdf"
+                
+                if borrador:
+                    guardar_borrador(fig, filename)
+                    return fig
                 report_gen.guardar_sin_espacios(fig, filename)
             return fig
         return None
@@ -1,10 +1,16 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from matplotlib.offsetbox import AnnotationBbox
 import numpy as np
 import os
 from difflib import SequenceMatcher
+from datos_compartidos import cargar_datos_limpios, ultimas_jornadas
+from asignacion_once import asignar_posiciones_grupos, matriz_puntuaciones
+from registro_assets import cargar_imagen, imagen_offset, ruta_escudo
+from ciclo_figuras import figuras_sin_pantalla
+from modo_borrador import guardar_borrador, resolucion_borrador
+from tabla_lote import TablaLote
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -26,12 +32,12 @@ plt.rcParams.update({
 
 # Instalar mplsoccer si no está instalado
 try:
-    from mplsoccer import Pitch
+    from plantilla_campo import crear_figura_campo
 except ImportError:
     print("Instalando mplsoccer...")
     import subprocess
     subprocess.check_call(["pip", "install", "mplsoccer"])
-    from mplsoccer import Pitch
+    from plantilla_campo import crear_figura_campo
 
 class Posible11Inicial:
     def __init__(self, data_path="prueba_extraccion/data/rendimiento_fisico.parquet"):
@@ -41,7 +47,6 @@ class Posible11Inicial:
         self.data_path = data_path
         self.df = None
         self.load_data()
-        self.clean_team_names()
         
         # 🎨 COLORES ESPECÍFICOS POR EQUIPO
         self.team_colors = {
@@ -97,6 +102,26 @@ class Posible11Inicial:
             'Sin Posición': 'MC_POSICIONAL',
         }
         
+        # Posiciones del once, en el orden en que se rellenan y se dibujan
+        self.posiciones_objetivo = [
+            'PORTERO', 'LATERAL_DERECHO', 'CENTRAL_DERECHO', 'CENTRAL_IZQUIERDO', 
+            'LATERAL_IZQUIERDO', 'MC_POSICIONAL', 'MC_BOX_TO_BOX', 'MC_ORGANIZADOR',
+            'BANDA_DERECHA', 'BANDA_IZQUIERDA', 'DELANTERO_CENTRO'
+        ]
+        
+        # Posiciones que puede cubrir un jugador si la suya ya está ocupada o no forma parte del once
+        self.posiciones_alternativas = {
+            'CENTRAL_DERECHO': ['CENTRAL_IZQUIERDO'],
+            'CENTRAL_IZQUIERDO': ['CENTRAL_DERECHO'],
+            'MC_POSICIONAL': ['MC_ORGANIZADOR', 'MC_BOX_TO_BOX'],
+            'MC_BOX_TO_BOX': ['MC_ORGANIZADOR', 'MC_POSICIONAL'],
+            'MC_ORGANIZADOR': ['MC_POSICIONAL', 'MC_BOX_TO_BOX'],
+            'MEDIAPUNTA': ['MC_BOX_TO_BOX', 'MC_ORGANIZADOR'],
+            'BANDA_DERECHA': ['BANDA_IZQUIERDA', 'LATERAL_DERECHO'],
+            'BANDA_IZQUIERDA': ['BANDA_DERECHA', 'LATERAL_IZQUIERDO'],
+            'SEGUNDO_DELANTERO': ['DELANTERO_CENTRO'],
+        }
+        
         # Coordenadas para posicionar las tablas en el campo (formación 4-3-3)
         self.coordenadas_posiciones = {
             'PORTERO': (10, 40),
@@ -156,8 +181,8 @@ class Posible11Inicial:
 
     def reposition_tables(self, posible_11, table_width=16, table_height=20):
         """Reposiciona las tablas para evitar solapamientos"""
-        fixed_areas = self.get_fixed_areas()
-        positioned_tables = []
+        # Áreas ocupadas como matriz (x, y, ancho, alto): fijas + tablas ya colocadas
+        occupied = self._rectangulos(self.get_fixed_areas())
         new_positions = {}
         
         for posicion, player_data in posible_11.items():
@@ -166,52 +191,63 @@ class Posible11Inicial:
                 
                 # Buscar la mejor posición cerca de la original
                 best_x, best_y = self.find_best_position(
-                    original_x, original_y, table_width, table_height,
-                    fixed_areas + positioned_tables
+                    original_x, original_y, table_width, table_height, occupied
                 )
                 
                 new_positions[posicion] = (best_x, best_y)
-                positioned_tables.append({
-                    'x': best_x, 'y': best_y, 
-                    'width': table_width, 'height': table_height,
-                    'name': posicion
-                })
+                occupied = np.vstack([occupied, [best_x, best_y, table_width, table_height]])
         
         return new_positions
     
-    def find_best_position(self, original_x, original_y, width, height, occupied_areas):
-        """Encuentra la mejor posición cerca del punto original"""
-        max_distance = 15  # Máxima distancia de búsqueda
-        step = 1  # Paso de búsqueda
-        
-        for distance in range(0, max_distance, step):
-            # Buscar en círculos concéntricos alrededor del punto original
-            for angle in range(0, 360, 30):  # Cada 30 grados
-                x = original_x + distance * np.cos(np.radians(angle))
-                y = original_y + distance * np.sin(np.radians(angle))
-                
-                # Verificar límites del campo
-                if not (5 <= x <= 115 and 5 <= y <= 75):
-                    continue
-                
-                # Verificar colisiones
-                collision = False
-                for area in occupied_areas:
-                    if self.check_collision(x, y, width, height, 
-                                        area['x'], area['y'], area['width'], area['height']):
-                        collision = True
-                        break
-                
-                if not collision:
-                    return x, y
+    def _rectangulos(self, areas):
+        """Lista de áreas {'x', 'y', 'width', 'height'} -> matriz N x 4"""
+        if isinstance(areas, np.ndarray):
+            return areas.reshape(-1, 4)
+        return np.array([[a['x'], a['y'], a['width'], a['height']] for a in areas], dtype=float).reshape(-1, 4)
+    
+    def candidate_positions(self, original_x, original_y, max_distance=15, step=0.5, angle_step=10):
+        """Candidatos en círculos concéntricos alrededor del punto original, del más cercano al más lejano"""
+        distancias = np.arange(0, max_distance, step)
+        angulos = np.radians(np.arange(0, 360, angle_step))
+        xs = original_x + np.outer(distancias, np.cos(angulos)).ravel()
+        ys = original_y + np.outer(distancias, np.sin(angulos)).ravel()
+        
+        # Límites del campo
+        dentro = (xs >= 5) & (xs <= 115) & (ys >= 5) & (ys <= 75)
+        return xs[dentro], ys[dentro]
+    
+    def find_best_position(self, original_x, original_y, width, height, occupied_areas, margin=2,
+                           max_distance=15, step=0.5, angle_step=10):
+        """
+        Encuentra la mejor posición cerca del punto original
         
-        # Si no encuentra posición, devolver la original
-        return original_x, original_y
+        Evalúa todos los candidatos a la vez contra todas las áreas ocupadas (mismo criterio que
+        check_collision). Si ninguno está libre, devuelve el que menos se solapa.
+        """
+        xs, ys = self.candidate_positions(original_x, original_y, max_distance, step, angle_step)
+        occupied = self._rectangulos(occupied_areas)
+        if len(xs) == 0:
+            return original_x, original_y
+        if len(occupied) == 0:
+            return xs[0], ys[0]
+        
+        # Holgura en cada eje entre candidato (filas) y área ocupada (columnas); > 0 = se tocan
+        holgura_x = (width + occupied[:, 2]) / 2 + margin - np.abs(xs[:, None] - occupied[:, 0])
+        holgura_y = (height + occupied[:, 3]) / 2 + margin - np.abs(ys[:, None] - occupied[:, 1])
+        colisiones = (holgura_x >= 0) & (holgura_y >= 0)
+        
+        libres = ~colisiones.any(axis=1)
+        if libres.any():
+            mejor = np.argmax(libres)
+        else:
+            solape = (np.clip(holgura_x, 0, None) * np.clip(holgura_y, 0, None)).sum(axis=1)
+            mejor = np.argmin(solape)
+        return xs[mejor], ys[mejor]
 
     def load_data(self):
-        """Carga los datos del archivo parquet"""
+        """Carga los datos limpios del parquet (compartidos por los informes del proceso)"""
         try:
-            self.df = pd.read_parquet(self.data_path)
+            self.df = cargar_datos_limpios(self.data_path)
             print(f"✅ Datos cargados exitosamente: {self.df.shape[0]} filas, {self.df.shape[1]} columnas")
         except Exception as e:
             print(f"❌ Error al cargar los datos: {e}")
@@ -220,55 +256,6 @@ class Posible11Inicial:
         """Calcula la similitud entre dos strings"""
         return SequenceMatcher(None, a.lower(), b.lower()).ratio()
     
-    def clean_team_names(self):
-        """Limpia y agrupa nombres de equipos similares"""
-        if self.df is None:
-            return
-        
-        # Limpiar nombres de equipos
-        unique_teams = self.df['Equipo'].unique()
-        team_mapping = {}
-        processed_teams = set()
-        
-        for team in unique_teams:
-            if team in processed_teams:
-                continue
-                
-            # Buscar equipos similares
-            similar_teams = [team]
-            for other_team in unique_teams:
-                if other_team != team and other_team not in processed_teams:
-                    if self.similarity(team, other_team) > 0.7:
-                        similar_teams.append(other_team)
-            
-            # Elegir el nombre más largo como representativo
-            canonical_name = max(similar_teams, key=len)
-            
-            # Mapear todos los nombres similares al canónico
-            for similar_team in similar_teams:
-                team_mapping[similar_team] = canonical_name
-                processed_teams.add(similar_team)
-        
-        # Aplicar el mapeo
-        self.df['Equipo'] = self.df['Equipo'].map(team_mapping)
-        
-        # Normalizar jornadas
-        def normalize_jornada(jornada):
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            return jornada
-        
-        self.df['Jornada'] = self.df['Jornada'].apply(normalize_jornada)
-        print(f"✅ Limpieza completada. Equipos únicos: {len(self.df['Equipo'].unique())}")
-        
     def get_available_teams(self):
         """Retorna la lista de equipos disponibles"""
         if self.df is None:
@@ -287,29 +274,10 @@ class Posible11Inicial:
             return sorted(self.df['Jornada'].unique())
 
     def get_last_5_jornadas(self, equipo, jornada_referencia):
-        """Obtiene las últimas 5 jornadas incluyendo la de referencia"""
-        jornadas_disponibles = self.get_available_jornadas(equipo)
-        
-        # Normalizar jornada de referencia
-        if isinstance(jornada_referencia, str) and jornada_referencia.startswith('J'):
-            try:
-                jornada_referencia = int(jornada_referencia[1:])
-            except ValueError:
-                pass
-        elif isinstance(jornada_referencia, str) and jornada_referencia.startswith('j'):
-            try:
-                jornada_referencia = int(jornada_referencia[1:])
-            except ValueError:
-                pass
-        
-        # Filtrar jornadas menores o iguales a la de referencia
-        jornadas_validas = [j for j in jornadas_disponibles if j <= jornada_referencia]
-        
-        # Tomar las últimas 5
-        if len(jornadas_validas) >= 5:
-            return sorted(jornadas_validas)[-5:]
-        else:
-            return sorted(jornadas_validas)
+        """Obtiene las últimas 5 jornadas del equipo incluyendo la de referencia"""
+        if self.df is None:
+            return []
+        return ultimas_jornadas(self.df, jornada_referencia, 5, equipo)
 
     def fill_missing_demarcaciones(self, df):
         """Rellena demarcaciones vacías con la más frecuente para cada jugador"""
@@ -350,140 +318,95 @@ class Posible11Inicial:
         
         return df_work
 
-    def get_posible_11(self, equipo, jornada):
-        """Obtiene el posible 11 inicial basado en minutos jugados en las últimas 5 jornadas"""
-        
-        # Obtener las últimas 5 jornadas
-        jornadas_analizar = self.get_last_5_jornadas(equipo, jornada)
-        print(f"🔄 Analizando jornadas: {jornadas_analizar}")
-        
-        # Filtrar datos del equipo en esas jornadas
-        filtered_df = self.df[
-            (self.df['Equipo'] == equipo) & 
-            (self.df['Jornada'].isin(jornadas_analizar))
-        ].copy()
-        
+    def get_posibles_11(self, jornada, equipos=None):
+        """
+        Posible 11 inicial de varios equipos (por defecto todos) en una sola pasada
+
+        Cada equipo usa sus últimas 5 jornadas hasta 'jornada'; las posiciones se reparten con
+        asignacion_once a partir de los minutos de cada jugador en cada demarcación.
+
+        Returns:
+            dict: equipo -> {posicion: datos del jugador}
+        """
+        if self.df is None:
+            return {}
+        equipos = self.get_available_teams() if equipos is None else list(equipos)
+        jornadas_equipo = {equipo: self.get_last_5_jornadas(equipo, jornada) for equipo in equipos}
+        pares = pd.MultiIndex.from_tuples(
+            [(equipo, j) for equipo, jornadas in jornadas_equipo.items() for j in jornadas],
+            names=['Equipo', 'Jornada'])
+        
+        filtered_df = self.df[pd.MultiIndex.from_frame(self.df[['Equipo', 'Jornada']]).isin(pares)]
         if filtered_df.empty:
-            print(f"❌ No hay datos para {equipo} en las jornadas {jornadas_analizar}")
-            return None
+            return {}
         
         # Rellenar demarcaciones vacías
         filtered_df = self.fill_missing_demarcaciones(filtered_df)
         
-        # Verificar si Alias está vacío y usar Nombre en su lugar
-        if 'Nombre' in filtered_df.columns:
-            mask_empty_alias = filtered_df['Alias'].isna() | (filtered_df['Alias'] == '') | (filtered_df['Alias'].str.strip() == '')
-            filtered_df.loc[mask_empty_alias, 'Alias'] = filtered_df.loc[mask_empty_alias, 'Nombre']
-        
-        # Agrupar por jugador y calcular estadísticas
+        # Estadísticas acumuladas por jugador: V.Max y métricas por minuto en promedio, distancias en suma
         print(f"🔄 Calculando estadísticas acumuladas...")
+        grupos = filtered_df.groupby(['Equipo', 'Id Jugador'], sort=False)
+        jugadores = grupos.agg(Alias=('Alias', 'first'), Demarcacion=('Demarcacion', 'first'))
+        jugadores['Dorsal'] = grupos['Dorsal'].first() if 'Dorsal' in filtered_df.columns else 'N/A'
+        if 'Minutos jugados' in filtered_df.columns:
+            jugadores['minutos_total'] = grupos['Minutos jugados'].sum()
+        else:
+            jugadores['minutos_total'] = 0
         
-        player_stats = {}
-        
-        for _, row in filtered_df.iterrows():
-            jugador_id = row['Id Jugador']
-            jugador_alias = row['Alias']
-            demarcacion = row.get('Demarcacion', 'Sin Posición')
-            
-            if jugador_id not in player_stats:
-                player_stats[jugador_id] = {
-                    'Alias': jugador_alias,
-                    'Dorsal': row.get('Dorsal', 'N/A'),
-                    'Demarcacion': demarcacion,
-                    'minutos_total': 0,
-                    'partidos': 0,
-                    'stats': {}
+        stats = pd.DataFrame(index=jugadores.index)
+        for metric_short in self.metricas_mostrar:
+            metric_full = self.metricas_mapping[metric_short]
+            if metric_full not in filtered_df.columns:
+                stats[metric_short] = 0
+            elif metric_short == 'V.Max' or '/min' in metric_short:
+                stats[metric_short] = grupos[metric_full].mean().fillna(0)
+            else:
+                stats[metric_short] = grupos[metric_full].sum()
+        
+        puntuaciones = matriz_puntuaciones(
+            filtered_df, self.posiciones_objetivo, self.demarcacion_to_position,
+            self.posiciones_alternativas, posicion_defecto='MC_POSICIONAL', grupos=('Equipo',))
+        
+        posibles = {}
+        for equipo, asignacion in asignar_posiciones_grupos(puntuaciones).items():
+            posibles[equipo] = {
+                posicion: {
+                    'Id': jugador_id,
+                    'Alias': jugadores.at[(equipo, jugador_id), 'Alias'],
+                    'Dorsal': jugadores.at[(equipo, jugador_id), 'Dorsal'],
+                    'Demarcacion': jugadores.at[(equipo, jugador_id), 'Demarcacion'],
+                    'minutos_total': jugadores.at[(equipo, jugador_id), 'minutos_total'],
+                    'stats': stats.loc[(equipo, jugador_id)].to_dict(),
                 }
-            
-            # Acumular minutos
-            minutos = row.get('Minutos jugados', 0)
-            player_stats[jugador_id]['minutos_total'] += minutos
-            player_stats[jugador_id]['partidos'] += 1
-            
-            # Acumular estadísticas
-            for metric_short, metric_full in self.metricas_mapping.items():
-                if metric_full in row and pd.notna(row[metric_full]):
-                    if metric_short not in player_stats[jugador_id]['stats']:
-                        player_stats[jugador_id]['stats'][metric_short] = []
-                    player_stats[jugador_id]['stats'][metric_short].append(row[metric_full])
-        
-        # Calcular promedios/sumas/máximos según la métrica
-        for jugador_id in player_stats:
-            for metric_short in self.metricas_mostrar:
-                if metric_short in player_stats[jugador_id]['stats']:
-                    values = player_stats[jugador_id]['stats'][metric_short]
-                    
-                    if metric_short in ['V.Max']:  # Velocidad máxima: promedio
-                        player_stats[jugador_id]['stats'][metric_short] = np.mean(values)
-                    elif '/min' in metric_short:  # Métricas por minuto: promedio
-                        player_stats[jugador_id]['stats'][metric_short] = np.mean(values)
-                    else:  # Distancias totales: suma
-                        player_stats[jugador_id]['stats'][metric_short] = np.sum(values)
-                else:
-                    player_stats[jugador_id]['stats'][metric_short] = 0
+                for posicion, jugador_id in asignacion.items()
+            }
+        return posibles
+
+    def get_posible_11(self, equipo, jornada):
+        """Obtiene el posible 11 inicial basado en minutos jugados en las últimas 5 jornadas"""
         
-        # Seleccionar el mejor jugador por posición basándose en minutos jugados
-        posible_11 = {}
+        # Obtener las últimas 5 jornadas
+        jornadas_analizar = self.get_last_5_jornadas(equipo, jornada)
+        print(f"🔄 Analizando jornadas: {jornadas_analizar}")
         
-        # Agrupar jugadores por posición
-        jugadores_por_posicion = {}
-        for jugador_id, data in player_stats.items():
-            demarcacion = data['Demarcacion']
-            posicion = self.demarcacion_to_position.get(demarcacion, 'MC_POSICIONAL')
-            
-            if posicion not in jugadores_por_posicion:
-                jugadores_por_posicion[posicion] = []
-            
-            jugadores_por_posicion[posicion].append({
-                'Id': jugador_id,
-                'Alias': data['Alias'],
-                'Dorsal': data['Dorsal'],
-                'Demarcacion': demarcacion,
-                'minutos_total': data['minutos_total'],
-                'stats': data['stats']
-            })
-        
-        # Seleccionar el jugador con más minutos por posición
-        posiciones_objetivo = [
-            'PORTERO', 'LATERAL_DERECHO', 'CENTRAL_DERECHO', 'CENTRAL_IZQUIERDO', 
-            'LATERAL_IZQUIERDO', 'MC_POSICIONAL', 'MC_BOX_TO_BOX', 'MC_ORGANIZADOR',
-            'BANDA_DERECHA', 'BANDA_IZQUIERDA', 'DELANTERO_CENTRO'
-        ]
+        posible_11 = self.get_posibles_11(jornada, [equipo]).get(equipo)
+        if not posible_11:
+            print(f"❌ No hay datos para {equipo} en las jornadas {jornadas_analizar}")
+            return None
         
-        for posicion in posiciones_objetivo:
-            if posicion in jugadores_por_posicion:
-                # Ordenar por minutos jugados (descendente)
-                jugadores_posicion = sorted(
-                    jugadores_por_posicion[posicion], 
-                    key=lambda x: x['minutos_total'], 
-                    reverse=True
-                )
-                
-                # Tomar el que más minutos ha jugado
-                posible_11[posicion] = jugadores_posicion[0]
-                print(f"✅ {posicion}: {jugadores_posicion[0]['Alias']} ({jugadores_posicion[0]['minutos_total']} min)")
+        for posicion, jugador in posible_11.items():
+            print(f"✅ {posicion}: {jugador['Alias']} ({jugador['minutos_total']} min)")
         
         return posible_11
 
     def load_team_logo(self, equipo):
-        """Carga el escudo del equipo"""
-        possible_names = [
-            equipo,
-            equipo.replace(' ', '_'),
-            equipo.replace(' ', ''),
-            equipo.lower(),
-            equipo.lower().replace(' ', '_'),
-            equipo.lower().replace(' ', '')
-        ]
-        
-        for name in possible_names:
-            logo_path = f"assets/escudos/{name}.png"
-            if os.path.exists(logo_path):
-                try:
-                    return plt.imread(logo_path)
-                except Exception as e:
-                    print(f"⚠️  Error al cargar escudo {logo_path}: {e}")
-                    continue
+        """Carga el escudo del equipo (ruta resuelta con el índice de assets/escudos)"""
+        logo_path = ruta_escudo(equipo)
+        if logo_path:
+            try:
+                return cargar_imagen(logo_path)
+            except Exception as e:
+                print(f"⚠️  Error al cargar escudo {logo_path}: {e}")
         
         print(f"⚠️  No se encontró el escudo para: {equipo}")
         return None
@@ -507,8 +430,9 @@ class Posible11Inicial:
         """Crea el campo que ocupe TODA la página sin espacios"""
         print("🎯 Creando campo SIN espacios...")
         
-        # Crear pitch sin padding
-        pitch = Pitch(
+        # Campo sin padding desde la plantilla cacheada (césped y líneas se generan una vez por proceso)
+        fig, ax = crear_figura_campo(
+            figsize,
             pitch_color='grass', 
             line_color='white', 
             stripe=True, 
@@ -516,13 +440,6 @@ class Posible11Inicial:
             pad_left=0, pad_right=0, pad_bottom=0, pad_top=0
         )
         
-        # Crear figura sin layouts automáticos
-        fig, ax = pitch.draw(
-            figsize=figsize,
-            tight_layout=False,
-            constrained_layout=False
-        )
-        
         # ✅ CONFIGURACIÓN AGRESIVA PARA ELIMINAR TODOS LOS ESPACIOS
         fig.subplots_adjust(left=0, right=1, top=1, bottom=0, wspace=0, hspace=0)
         ax.set_position([0, 0, 1, 1])
@@ -546,50 +463,49 @@ class Posible11Inicial:
         metric_row_height = 1.8
         table_height = header_height + name_height + (len(self.metricas_mostrar) * metric_row_height)
         
+        # Celdas y textos se acumulan y se dibujan al final como colección (ver tabla_lote)
+        tabla = TablaLote(ax)
+        
         # 🎨 FONDO MODERNO
-        main_rect = plt.Rectangle((x - table_width/2, y - table_height/2), 
-                                table_width, table_height,
-                                facecolor='#2c3e50', alpha=0.95, 
-                                edgecolor='white', linewidth=2)
-        ax.add_patch(main_rect)
+        tabla.celda(x - table_width/2, y - table_height/2, 
+                    table_width, table_height,
+                    facecolor='#2c3e50', alpha=0.95, 
+                    edgecolor='white', linewidth=2)
         
         # Efecto de borde superior
-        top_rect = plt.Rectangle((x - table_width/2, y + table_height/2 - 0.4), 
-                                table_width, 0.4,
-                                facecolor=team_colors['primary'], alpha=0.9,
-                                edgecolor='none')
-        ax.add_patch(top_rect)
+        tabla.celda(x - table_width/2, y + table_height/2 - 0.4, 
+                    table_width, 0.4,
+                    facecolor=team_colors['primary'], alpha=0.9,
+                    edgecolor='none')
         
         # 📍 FILA 1: POSICIÓN
         clean_position_name = position_name.replace('_', ' ').replace('Mc ', 'MC ')
-        header_rect = plt.Rectangle((x - table_width/2, y + table_height/2 - header_height), 
-                                table_width, header_height,
-                                facecolor=team_colors['primary'], alpha=0.8,
-                                edgecolor='white', linewidth=1)
-        ax.add_patch(header_rect)
+        tabla.celda(x - table_width/2, y + table_height/2 - header_height, 
+                    table_width, header_height,
+                    facecolor=team_colors['primary'], alpha=0.8,
+                    edgecolor='white', linewidth=1)
 
-        ax.text(x, y + table_height/2 - header_height/2, clean_position_name, 
-                fontsize=10, weight='bold', color=team_colors['text'],
-                ha='center', va='center')
+        tabla.texto(x, y + table_height/2 - header_height/2, clean_position_name, 
+                    fontsize=10, weight='bold', color=team_colors['text'],
+                    ha='center', va='center')
         
         # 📍 FILA 2: NOMBRE + DORSAL
         names_y = y + table_height/2 - header_height - name_height/2
         
-        names_rect = plt.Rectangle((x - table_width/2, names_y - name_height/2), 
-                                table_width, name_height,
-                                facecolor='#34495e', alpha=0.7, 
-                                edgecolor='white', linewidth=0.5)
-        ax.add_patch(names_rect)
+        tabla.celda(x - table_width/2, names_y - name_height/2, 
+                    table_width, name_height,
+                    facecolor='#34495e', alpha=0.7, 
+                    edgecolor='white', linewidth=0.5)
         
         # Dorsal (más grande y destacado)
-        ax.text(x, names_y + 0.4, str(player_data['Dorsal']), 
-                fontsize=18, weight='bold', color=team_colors['primary'],
-                ha='center', va='center')
+        tabla.texto(x, names_y + 0.4, str(player_data['Dorsal']), 
+                    fontsize=18, weight='bold', color=team_colors['primary'],
+                    ha='center', va='center')
         
         # Nombre del jugador
-        ax.text(x, names_y - 0.4, player_data['Alias'], 
-                fontsize=12, weight='bold', color='white',
-                ha='center', va='center')
+        tabla.texto(x, names_y - 0.4, player_data['Alias'], 
+                    fontsize=12, weight='bold', color='white',
+                    ha='center', va='center')
         
         # 📍 FILAS 3+: MÉTRICAS Y VALORES
         for i, metric_short in enumerate(self.metricas_mostrar):
@@ -597,11 +513,10 @@ class Posible11Inicial:
             
             # Fondo alternado para las filas de métricas
             if i % 2 == 0:
-                row_rect = plt.Rectangle((x - table_width/2, metric_y - metric_row_height/2), 
-                                    table_width, metric_row_height,
-                                    facecolor='#3c566e', alpha=0.3, 
-                                    edgecolor='none')
-                ax.add_patch(row_rect)
+                tabla.celda(x - table_width/2, metric_y - metric_row_height/2, 
+                            table_width, metric_row_height,
+                            facecolor='#3c566e', alpha=0.3, 
+                            edgecolor='none')
             
             # Valor de la métrica
             value = player_data['stats'].get(metric_short, 0)
@@ -612,13 +527,15 @@ class Posible11Inicial:
                 formatted_value = f"{value:.0f}"
             
             # Métrica y valor en la misma fila
-            ax.text(x - table_width/4, metric_y, metric_short, 
-                    fontsize=12, weight='bold', color='white',
-                    ha='center', va='center')
+            tabla.texto(x - table_width/4, metric_y, metric_short, 
+                        fontsize=12, weight='bold', color='white',
+                        ha='center', va='center')
             
-            ax.text(x + table_width/4, metric_y, formatted_value, 
-                    fontsize=12, weight='bold', color='#FFD700',
-                    ha='center', va='center')
+            tabla.texto(x + table_width/4, metric_y, formatted_value, 
+                        fontsize=12, weight='bold', color='#FFD700',
+                        ha='center', va='center')
+        
+        tabla.dibujar()
 
     def create_team_summary_table(self, posible_11, ax, x_pos, y_pos, team_name, team_colors, team_logo=None):
         """Crea una tabla de resumen del equipo con promedios del posible 11"""
@@ -737,7 +654,7 @@ class Posible11Inicial:
         
         # Posicionar escudo
         if team_logo is not None:
-            imagebox = OffsetImage(team_logo, zoom=0.12)
+            imagebox = imagen_offset(team_logo, zoom=0.12)
             ab = AnnotationBbox(imagebox, (110, 70), frameon=False)  # Era (60, 5)
             ax.add_artist(ab)
         
@@ -864,11 +781,12 @@ def main_posible_11():
         import traceback
         traceback.print_exc()
 
-def generar_posible_11_personalizado(equipo, jornada, mostrar=True, guardar=True):
+def generar_posible_11_personalizado(equipo, jornada, mostrar=True, guardar=True, borrador=False):
     """Función para generar un posible 11 personalizado"""
     try:
         report_generator = Posible11Inicial()
-        fig = report_generator.create_visualization(equipo, jornada)
+        with resolucion_borrador(borrador), figuras_sin_pantalla(not mostrar):
+            fig = report_generator.create_visualization(equipo, jornada)
         
         if fig:
             if mostrar:
@@ -877,6 +795,10 @@ def generar_posible_11_personalizado(equipo, jornada, mostrar=True, guardar=True
             if guardar:
                 equipo_filename = equipo.replace(' ', '_').replace('/', '_')
                 output_path = f"posible_11_inicial_{equipo_filename}_J{jornada}.pdf"
+                
+                if borrador:
+                    guardar_borrador(fig, output_path)
+                    return fig
                 report_generator.guardar_sin_espacios(fig, output_path)
             
             return fig
@@ -1,16 +1,24 @@
 import pandas as pd
 import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from matplotlib.offsetbox import AnnotationBbox
 from matplotlib import patheffects
 import seaborn as sns
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 import os
 from difflib import SequenceMatcher
+from datos_compartidos import cargar_datos_limpios, normalize_jornada
+from registro_assets import cargar_imagen, imagen_offset, ruta_escudo
+from ciclo_figuras import figuras_sin_pantalla, nueva_figura
+from modo_borrador import guardar_borrador, resolucion_borrador
+from tabla_lote import TablaLote
 import warnings
 warnings.filterwarnings('ignore')
 
+# Columnas de minutos de la matriz jugador x jornada x tiempo (1P, 2P, total)
+COLUMNAS_MINUTOS = ['Minutos jugados 1P', 'Minutos jugados 2P', 'Minutos jugados']
+TIEMPOS = ['1er_tiempo', '2do_tiempo', 'total']
+
 class MinutosJugadosReport:
     def __init__(self, data_path="prueba_extraccion/data/rendimiento_fisico.parquet"):
         """
@@ -19,12 +27,11 @@ class MinutosJugadosReport:
         self.data_path = data_path
         self.df = None
         self.load_data()
-        self.clean_team_names()
         
     def load_data(self):
-        """Carga los datos del archivo parquet"""
+        """Carga los datos limpios del parquet (compartidos por los informes del proceso)"""
         try:
-            self.df = pd.read_parquet(self.data_path)
+            self.df = cargar_datos_limpios(self.data_path)
             print(f"Datos cargados exitosamente: {self.df.shape[0]} filas, {self.df.shape[1]} columnas")
             print(f"Columnas disponibles: {list(self.df.columns)}")
         except Exception as e:
@@ -34,57 +41,6 @@ class MinutosJugadosReport:
         """Calcula la similitud entre dos strings"""
         return SequenceMatcher(None, a.lower(), b.lower()).ratio()
     
-    def clean_team_names(self):
-        """Limpia y agrupa nombres de equipos similares y normaliza jornadas"""
-        if self.df is None:
-            return
-        
-        # Limpiar nombres de equipos
-        unique_teams = self.df['Equipo'].unique()
-        team_mapping = {}
-        processed_teams = set()
-        
-        for team in unique_teams:
-            if team in processed_teams:
-                continue
-                
-            # Buscar equipos similares
-            similar_teams = [team]
-            for other_team in unique_teams:
-                if other_team != team and other_team not in processed_teams:
-                    if self.similarity(team, other_team) > 0.7:  # 70% de similitud
-                        similar_teams.append(other_team)
-            
-            # Elegir el nombre más largo como representativo
-            canonical_name = max(similar_teams, key=len)
-            
-            # Mapear todos los nombres similares al canónico
-            for similar_team in similar_teams:
-                team_mapping[similar_team] = canonical_name
-                processed_teams.add(similar_team)
-        
-        # Aplicar el mapeo
-        self.df['Equipo'] = self.df['Equipo'].map(team_mapping)
-        
-        # Normalizar jornadas: convertir 'J1', 'J2', etc. a números 1, 2, etc.
-        def normalize_jornada(jornada):
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            return jornada
-        
-        self.df['Jornada'] = self.df['Jornada'].apply(normalize_jornada)
-        
-        print(f"Limpieza completada. Equipos únicos: {len(self.df['Equipo'].unique())}")
-        print(f"Jornadas normalizadas en datos: {sorted(self.df['Jornada'].unique())}")
-        
     def get_available_teams(self):
         """Retorna la lista de equipos disponibles"""
         if self.df is None:
@@ -136,29 +92,16 @@ class MinutosJugadosReport:
         return filtered_df
     
     def load_team_logo(self, equipo):
-        """Carga el escudo del equipo"""
-        # Intentar diferentes variaciones del nombre
-        possible_names = [
-            equipo,
-            equipo.replace(' ', '_'),
-            equipo.replace(' ', ''),
-            equipo.lower(),
-            equipo.lower().replace(' ', '_'),
-            equipo.lower().replace(' ', '')
-        ]
-        
-        for name in possible_names:
-            logo_path = f"assets/escudos/{name}.png"
-            if os.path.exists(logo_path):
-                print(f"Escudo encontrado: {logo_path}")
-                try:
-                    return plt.imread(logo_path)
-                except Exception as e:
-                    print(f"Error al cargar escudo {logo_path}: {e}")
-                    continue
+        """Carga el escudo del equipo (ruta resuelta con el índice de assets/escudos)"""
+        logo_path = ruta_escudo(equipo)
+        if logo_path:
+            print(f"Escudo encontrado: {logo_path}")
+            try:
+                return cargar_imagen(logo_path)
+            except Exception as e:
+                print(f"Error al cargar escudo {logo_path}: {e}")
         
         print(f"No se encontró el escudo para: {equipo}")
-        print(f"Intentó buscar: {[f'assets/escudos/{name}.png' for name in possible_names]}")
         return None
     
     def load_ball_image(self):
@@ -167,7 +110,7 @@ class MinutosJugadosReport:
         if os.path.exists(ball_path):
             print(f"Balón encontrado: {ball_path}")
             try:
-                return plt.imread(ball_path)
+                return cargar_imagen(ball_path)
             except Exception as e:
                 print(f"Error al cargar balón: {e}")
                 return None
@@ -181,7 +124,7 @@ class MinutosJugadosReport:
         if os.path.exists(bg_path):
             print(f"Fondo encontrado: {bg_path}")
             try:
-                return plt.imread(bg_path)
+                return cargar_imagen(bg_path)
             except Exception as e:
                 print(f"Error al cargar fondo: {e}")
                 return None
@@ -189,70 +132,65 @@ class MinutosJugadosReport:
             print(f"No se encontró el fondo: {bg_path}")
             return None
     
+    def create_minutes_matrix(self, filtered_df, jornadas):
+        """
+        Minutos jugados como matriz densa jugador x jornada x tiempo (un solo groupby)
+        
+        Returns:
+            dict: 'jugadores' (alias, orden alfabético), 'jornadas' (normalizadas), 'dorsales',
+                  'minutos' (ndarray int jugadores x jornadas x [1P, 2P, total]), 'totales'
+                  (jugadores x 3) y 'orden' (índices de jugadores de más a menos minutos totales)
+        """
+        normalized_jornadas = [normalize_jornada(j) for j in jornadas]
+        
+        # Agrupar por jugador y jornada (una fila por pareja, ordenadas por alias y jornada)
+        agrupado = filtered_df.groupby(['Alias', 'Jornada'])
+        sumas = agrupado[COLUMNAS_MINUTOS].sum()
+        jugadores = sumas.index.unique('Alias')
+        
+        # Dorsal: primer valor de la primera jornada del jugador
+        if 'Dorsal' in filtered_df.columns:
+            dorsales = agrupado['Dorsal'].first()
+            dorsales = list(dorsales[~dorsales.index.get_level_values('Alias').duplicated()])
+        else:
+            dorsales = ['N/A'] * len(jugadores)
+        
+        # Matriz sobre las jornadas distintas y luego expandida al orden pedido
+        jornadas_unicas = pd.Index(pd.unique(pd.Series(normalized_jornadas, dtype=object)))
+        filas = jugadores.get_indexer(sumas.index.get_level_values('Alias'))
+        columnas = jornadas_unicas.get_indexer(sumas.index.get_level_values('Jornada'))
+        validas = columnas >= 0
+        
+        base = np.zeros((len(jugadores), len(jornadas_unicas), len(COLUMNAS_MINUTOS)), dtype=int)
+        base[filas[validas], columnas[validas]] = sumas.to_numpy()[validas].astype(int)
+        minutos = base[:, jornadas_unicas.get_indexer(normalized_jornadas), :]
+        
+        totales = minutos.sum(axis=1)
+        orden = np.argsort(-totales[:, 2], kind='stable')
+        
+        print(f"Tabla creada para {len(jugadores)} jugadores")
+        return {
+            'jugadores': jugadores.tolist(),
+            'jornadas': normalized_jornadas,
+            'dorsales': dorsales,
+            'minutos': minutos,
+            'totales': totales,
+            'orden': orden,
+        }
+    
     def create_minutes_table(self, filtered_df, jornadas):
         """Crea la tabla de minutos jugados por tiempo"""
-        # Normalizar jornadas de entrada
-        normalized_jornadas = []
-        for jornada in jornadas:
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            else:
-                normalized_jornadas.append(jornada)
-        
-        # Verificar si Alias está vacío y usar Nombre en su lugar
-        if 'Nombre' in filtered_df.columns:
-            mask_empty_alias = filtered_df['Alias'].isna() | (filtered_df['Alias'] == '') | (filtered_df['Alias'].str.strip() == '')
-            filtered_df.loc[mask_empty_alias, 'Alias'] = filtered_df.loc[mask_empty_alias, 'Nombre']
-
-        # Agrupar por jugador y jornada, INCLUYENDO EL DORSAL
-        pivot_data = filtered_df.groupby(['Alias', 'Jornada']).agg({
-            'Minutos jugados 1P': 'sum',
-            'Minutos jugados 2P': 'sum',
-            'Minutos jugados': 'sum',
-            'Dorsal': 'first'  # AGREGAR ESTA LÍNEA
-        }).reset_index()
-        
-        print(f"Datos agrupados: {len(pivot_data)} registros")
-        print(f"Jugadores únicos: {pivot_data['Alias'].unique()}")
-
-        # Crear tabla pivoteada para cada tipo de minutos
+        # Formato de diccionarios anidado sobre la matriz de create_minutes_matrix
+        matriz = self.create_minutes_matrix(filtered_df, jornadas)
         table_data = {}
-        for jugador in pivot_data['Alias'].unique():
-            player_data = pivot_data[pivot_data['Alias'] == jugador]
-            
-            # Obtener el dorsal del jugador (tomar el primer valor disponible)
-            dorsal = player_data['Dorsal'].iloc[0] if len(player_data) > 0 and 'Dorsal' in player_data.columns else 'N/A'
-            
+        for i, jugador in enumerate(matriz['jugadores']):
             table_data[jugador] = {
-                'dorsal': dorsal,  # AGREGAR ESTA LÍNEA
-                'jornadas': {}
+                'dorsal': matriz['dorsales'][i],
+                'jornadas': {
+                    jornada: dict(zip(TIEMPOS, matriz['minutos'][i, j].tolist()))
+                    for j, jornada in enumerate(matriz['jornadas'])
+                }
             }
-            
-            for jornada in normalized_jornadas:
-                jornada_data = player_data[player_data['Jornada'] == jornada]
-                if len(jornada_data) > 0:
-                    row = jornada_data.iloc[0]
-                    table_data[jugador]['jornadas'][jornada] = {
-                        '1er_tiempo': int(row['Minutos jugados 1P']),
-                        '2do_tiempo': int(row['Minutos jugados 2P']),
-                        'total': int(row['Minutos jugados'])
-                    }
-                else:
-                    table_data[jugador]['jornadas'][jornada] = {
-                        '1er_tiempo': 0,
-                        '2do_tiempo': 0,
-                        'total': 0
-                    }
-        
-        print(f"Tabla creada para {len(table_data)} jugadores")
         return table_data
     
     def create_visualization(self, equipo, jornadas, figsize=(16, 11)):
@@ -264,7 +202,7 @@ class MinutosJugadosReport:
             return None
         
         # Crear figura con tamaño A4 landscape
-        fig = plt.figure(figsize=figsize, facecolor='white')
+        fig = nueva_figura(figsize=figsize, facecolor='white')
         
         # Cargar y establecer fondo que ocupe toda la figura
         background = self.load_background()
@@ -308,7 +246,7 @@ class MinutosJugadosReport:
         ball = self.load_ball_image()
         if ball is not None:
             try:
-                imagebox = OffsetImage(ball, zoom=0.15)  # Más grande
+                imagebox = imagen_offset(ball, zoom=0.15)  # Más grande
                 ab = AnnotationBbox(imagebox, (0.05, 0.5), frameon=False)
                 ax_title.add_artist(ab)
                 print("Balón aplicado correctamente")
@@ -319,40 +257,16 @@ class MinutosJugadosReport:
         logo = self.load_team_logo(equipo)
         if logo is not None:
             try:
-                imagebox = OffsetImage(logo, zoom=0.03)  # Más pequeño
+                imagebox = imagen_offset(logo, zoom=0.03)  # Más pequeño
                 ab = AnnotationBbox(imagebox, (0.95, 0.5), frameon=False)
                 ax_title.add_artist(ab)
                 print("Logo aplicado correctamente")
             except Exception as e:
                 print(f"Error al aplicar logo: {e}")
         
-        # Crear tabla de minutos
-        table_data = self.create_minutes_table(filtered_df, jornadas)
-        
-        # Dividir jugadores en dos mitades
-        jugadores = list(table_data.keys())
-        # Ordenar por total de minutos primero
-        normalized_jornadas = []
-        for jornada in jornadas:
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            else:
-                normalized_jornadas.append(jornada)
-        
-        jugadores_con_totales = []
-        for jugador in jugadores:
-            total = sum(table_data[jugador]['jornadas'][j]['total'] for j in normalized_jornadas)
-            jugadores_con_totales.append((jugador, total))
-        jugadores_con_totales.sort(key=lambda x: x[1], reverse=True)  # De mayor a menor
-        jugadores_ordenados = [item[0] for item in jugadores_con_totales]
+        # Matriz de minutos y jugadores ordenados por total de minutos (de mayor a menor)
+        matriz = self.create_minutes_matrix(filtered_df, jornadas)
+        jugadores_ordenados = matriz['orden']
         
         # Dividir en dos mitades
         mitad = len(jugadores_ordenados) // 2
@@ -364,41 +278,28 @@ class MinutosJugadosReport:
         ax_table1.set_facecolor('white')
         ax_table1.set_title('MINUTOS JUGADOS POR TIEMPO', fontsize=12, weight='bold', 
                            color='#1e3d59', pad=8)
-        self.plot_half_table(ax_table1, table_data, jornadas, primera_mitad)
+        self.plot_half_table(ax_table1, matriz, primera_mitad)
         
         # Tabla derecha (segunda mitad de jugadores)
         ax_table2 = fig.add_subplot(gs[1, 1])
         ax_table2.set_facecolor('white')
         ax_table2.set_title('MINUTOS JUGADOS POR TIEMPO', fontsize=12, weight='bold', 
                            color='#1e3d59', pad=8)
-        self.plot_half_table(ax_table2, table_data, jornadas, segunda_mitad)
+        self.plot_half_table(ax_table2, matriz, segunda_mitad)
         
         # Gráfico de barras por jornada (columna derecha)
         ax_bars = fig.add_subplot(gs[1, 2])
         ax_bars.set_facecolor('white')
         ax_bars.set_title('MINUTOS JUGADOS\nPOR JORNADA', fontsize=12, weight='bold', 
                          color='#1e3d59', pad=8)
-        self.plot_stacked_bars(ax_bars, table_data, jornadas)
+        self.plot_stacked_bars(ax_bars, matriz)
         
         return fig
     
-    def plot_half_table(self, ax, table_data, jornadas, jugadores_lista):
+    def plot_half_table(self, ax, matriz, jugadores_lista):
         """Dibuja una tabla con la mitad de jugadores especificada con columna separada para 1P/2P/TOT"""
-        # Normalizar jornadas
-        normalized_jornadas = []
-        for jornada in jornadas:
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            else:
-                normalized_jornadas.append(jornada)
+        # jugadores_lista: índices de jugadores en la matriz de create_minutes_matrix
+        normalized_jornadas = matriz['jornadas']
         
         if len(jugadores_lista) == 0:
             ax.text(0.5, 0.5, 'No hay datos disponibles', ha='center', va='center', fontsize=10)
@@ -421,6 +322,9 @@ class MinutosJugadosReport:
         available_height = 0.92
         cell_height = available_height / (total_rows - 0.5)  # Filas un poco más altas
         
+        # Celdas y textos se acumulan y se dibujan al final como colección (ver tabla_lote)
+        tabla = TablaLote(ax)
+        
         # Dibujar header
         headers = ['Jugador', 'Tipo'] + [f'{j}' for j in normalized_jornadas] + ['Total']
         colors = ['#2c3e50', '#34495e'] + ['#3498db'] * len(normalized_jornadas) + ['#8e44ad']
@@ -428,33 +332,26 @@ class MinutosJugadosReport:
         y_header = available_height
         for i, (header, color, width) in enumerate(zip(headers, colors, col_widths)):
             x_pos = sum(col_widths[:i])
-            rect = patches.Rectangle((x_pos, y_header), 
-                                width, cell_height, 
-                                linewidth=1, edgecolor='black', 
-                                facecolor=color)
-            ax.add_patch(rect)
-            ax.text(x_pos + width/2, y_header + cell_height/2, header, 
+            tabla.celda(x_pos, y_header, 
+                        width, cell_height, 
+                        linewidth=1, edgecolor='black', 
+                        facecolor=color)
+            tabla.texto(x_pos + width/2, y_header + cell_height/2, header, 
                 ha='center', va='center', fontsize=8, weight='bold', color='white')
         
         # Dibujar datos por jugador
         current_row = 1
-        for jugador in jugadores_lista:
-            # Obtener dorsal del jugador
-            dorsal = table_data[jugador].get('dorsal', 'N/A')
-            
-            # Calcular totales del jugador - ACTUALIZAR REFERENCIAS
-            total_1p = sum(table_data[jugador]['jornadas'][j]['1er_tiempo'] for j in normalized_jornadas)
-            total_2p = sum(table_data[jugador]['jornadas'][j]['2do_tiempo'] for j in normalized_jornadas)
-            total_general = sum(table_data[jugador]['jornadas'][j]['total'] for j in normalized_jornadas)
+        for indice in jugadores_lista:
+            jugador = matriz['jugadores'][indice]
+            dorsal = matriz['dorsales'][indice]
             
             y_jugador = available_height - current_row * cell_height
             
             # Nombre del jugador (3 filas de altura) - fondo diferenciado
-            rect = patches.Rectangle((0, y_jugador - 2 * cell_height), 
-                                col_widths[0], cell_height * 3,
-                                linewidth=2, edgecolor='#2c3e50',
-                                facecolor='#ecf0f1')  # Fondo gris claro diferenciado
-            ax.add_patch(rect)
+            tabla.celda(0, y_jugador - 2 * cell_height, 
+                        col_widths[0], cell_height * 3,
+                        linewidth=2, edgecolor='#2c3e50',
+                        facecolor='#ecf0f1')  # Fondo gris claro diferenciado
             
             # AGREGAR DORSAL ESTILO CAMISETA DE FÚTBOL
             if dorsal != 'N/A':
@@ -472,29 +369,28 @@ class MinutosJugadosReport:
            ])
             # Nombre del jugador ajustado para no superponerse con el dorsal
             nombre_x_offset = col_widths[0] * 0.15 if dorsal != 'N/A' else 0  # Desplazamiento si hay dorsal
-            ax.text(col_widths[0]/2 + nombre_x_offset, y_jugador - cell_height, jugador,
+            tabla.texto(col_widths[0]/2 + nombre_x_offset, y_jugador - cell_height, jugador,
                 ha='center', va='center', fontsize=10, weight='bold',
                 color='#1a237e')
             
             # Etiquetas y datos para cada fila
             tipos = ['1P', '2P', 'TOT']
             tipo_colors = ['#3498db', '#e74c3c', '#27ae60']
+            # Filas 1P / 2P / TOT: minutos por jornada y total del jugador
             datos_por_tipo = [
-                [table_data[jugador]['jornadas'][j]['1er_tiempo'] for j in normalized_jornadas] + [total_1p],
-                [table_data[jugador]['jornadas'][j]['2do_tiempo'] for j in normalized_jornadas] + [total_2p],
-                [table_data[jugador]['jornadas'][j]['total'] for j in normalized_jornadas] + [total_general]
+                matriz['minutos'][indice, :, t].tolist() + [int(matriz['totales'][indice, t])]
+                for t in range(len(tipos))
             ]
             
             for i, (tipo, tipo_color, datos) in enumerate(zip(tipos, tipo_colors, datos_por_tipo)):
                 y_fila = y_jugador - i * cell_height
                 
                 # Columna de tipo
-                rect = patches.Rectangle((col_widths[0], y_fila), 
-                                    col_widths[1], cell_height,
-                                    linewidth=1, edgecolor='black',
-                                    facecolor=tipo_color)
-                ax.add_patch(rect)
-                ax.text(col_widths[0] + col_widths[1]/2, y_fila + cell_height/2, tipo,
+                tabla.celda(col_widths[0], y_fila, 
+                            col_widths[1], cell_height,
+                            linewidth=1, edgecolor='black',
+                            facecolor=tipo_color)
+                tabla.texto(col_widths[0] + col_widths[1]/2, y_fila + cell_height/2, tipo,
                     ha='center', va='center', fontsize=7, weight='bold', color='white')
                 
                 # Datos por jornada
@@ -519,10 +415,9 @@ class MinutosJugadosReport:
                         color = '#d5dbdb' if valor > 0 else '#ecf0f1'
                         text_color = 'black'
                     
-                    rect = patches.Rectangle((x_pos, y_fila), col_widths[j_idx+2], cell_height,
-                                        linewidth=1, edgecolor='black', facecolor=color)
-                    ax.add_patch(rect)
-                    ax.text(x_pos + col_widths[j_idx+2]/2, y_fila + cell_height/2, str(valor),
+                    tabla.celda(x_pos, y_fila, col_widths[j_idx+2], cell_height,
+                                linewidth=1, edgecolor='black', facecolor=color)
+                    tabla.texto(x_pos + col_widths[j_idx+2]/2, y_fila + cell_height/2, str(valor),
                         ha='center', va='center', fontsize=8, color=text_color, weight='bold' if tipo == 'TOT' else 'normal')
                 
                 # Columna total
@@ -536,54 +431,33 @@ class MinutosJugadosReport:
                     total_color = '#bdc3c7'
                     total_text_color = 'black'
                 
-                rect = patches.Rectangle((x_total, y_fila), col_widths[-1], cell_height,
-                                    linewidth=1, edgecolor='black', facecolor=total_color)
-                ax.add_patch(rect)
-                ax.text(x_total + col_widths[-1]/2, y_fila + cell_height/2, str(total_val),
+                tabla.celda(x_total, y_fila, col_widths[-1], cell_height,
+                            linewidth=1, edgecolor='black', facecolor=total_color)
+                tabla.texto(x_total + col_widths[-1]/2, y_fila + cell_height/2, str(total_val),
                     ha='center', va='center', fontsize=8, color=total_text_color, weight='bold')
             
             current_row += 3
         
+        tabla.dibujar()
         ax.set_xlim(0, 1)
         ax.set_ylim(0, available_height + cell_height)
         ax.axis('off')
         ax.patch.set_facecolor('white')
     
-    def plot_stacked_bars(self, ax, table_data, jornadas):
+    def plot_stacked_bars(self, ax, matriz):
         """Dibuja el gráfico de barras apiladas por jornada con nombres resaltados y leyenda"""
-        # Normalizar jornadas
-        normalized_jornadas = []
-        for jornada in jornadas:
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            else:
-                normalized_jornadas.append(jornada)
+        normalized_jornadas = matriz['jornadas']
         
         # Preparar datos para el gráfico
-        jugadores = list(table_data.keys())
-        if not jugadores:
+        if not matriz['jugadores']:
             ax.text(0.5, 0.5, 'No hay datos disponibles', ha='center', va='center')
             ax.axis('off')
             return
         
-        # Calcular totales por jugador y ordenar de mayor a menor
-        jugadores_con_totales = []
-        for jugador in jugadores:
-            total = sum(table_data[jugador]['jornadas'][j]['total'] for j in normalized_jornadas)
-            jugadores_con_totales.append((jugador, total))
-        
-        # Ordenar por total de minutos (de mayor a menor) y invertir para mostrar descendente
-        jugadores_con_totales.sort(key=lambda x: x[1], reverse=True)
-        jugadores_ordenados = [item[0] for item in jugadores_con_totales]
-        jugadores_ordenados.reverse()  # Invertir para que sea descendente en el gráfico
+        # Jugadores de mayor a menor total, invertidos para mostrar descendente en el gráfico
+        indices_ordenados = matriz['orden'][::-1]
+        jugadores_ordenados = [matriz['jugadores'][i] for i in indices_ordenados]
+        minutos_totales = matriz['minutos'][indices_ordenados, :, 2]
         
         # Colores para cada jornada - paleta más vibrante
         colors = ['#3498db', '#e74c3c', '#2ecc71', '#f39c12', '#9b59b6', '#1abc9c', '#e67e22', '#34495e']
@@ -596,9 +470,7 @@ class MinutosJugadosReport:
         
         # Crear barras apiladas para cada jornada
         for j_idx, jornada in enumerate(normalized_jornadas):
-            minutos_jornada = []
-            for jugador in jugadores_ordenados:
-                minutos_jornada.append(table_data[jugador]['jornadas'][jornada]['total'])
+            minutos_jornada = minutos_totales[:, j_idx].tolist()
             
             # Crear barra apilada
             bars = ax.barh(y_positions, minutos_jornada, bar_width, 
@@ -802,7 +674,7 @@ def main():
         traceback.print_exc()
 
 # Función para uso directo con parámetros
-def generar_reporte_personalizado(equipo, jornadas, mostrar=True, guardar=True):
+def generar_reporte_personalizado(equipo, jornadas, mostrar=True, guardar=True, borrador=False):
     """
     Función para generar un reporte personalizado
     
@@ -811,10 +683,12 @@ def generar_reporte_personalizado(equipo, jornadas, mostrar=True, guardar=True):
         jornadas (list): Lista de jornadas a incluir
         mostrar (bool): Si mostrar el gráfico en pantalla
         guardar (bool): Si guardar como PDF
+        borrador (bool): Si guardar un PNG rápido de baja resolución en lugar del PDF final
     """
     try:
         report_generator = MinutosJugadosReport()
-        fig = report_generator.create_visualization(equipo, jornadas)
+        with resolucion_borrador(borrador), figuras_sin_pantalla(not mostrar):
+            fig = report_generator.create_visualization(equipo, jornadas)
         
         if fig:
             if mostrar:
@@ -824,6 +698,10 @@ def generar_reporte_personalizado(equipo, jornadas, mostrar=True, guardar=True):
                 equipo_filename = equipo.replace(' ', '_').replace('/', '_')
                 output_path = f"reporte_minutos_{equipo_filename}.pdf"
                 
+                if borrador:
+                    guardar_borrador(fig, output_path)
+                    return fig
+                
                 # Configuración optimizada para PDF
                 plt.rcParams['savefig.transparent'] = True
                 plt.rcParams['savefig.facecolor'] = 'none'
@@ -1,13 +1,17 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from matplotlib.offsetbox import AnnotationBbox
 from matplotlib import patheffects
 import seaborn as sns
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 import os
 from difflib import SequenceMatcher
+from datos_compartidos import COLUMNAS_DISTANCIAS, cargar_datos_limpios, matriz_jugador_jornada
+from registro_assets import cargar_imagen, imagen_offset, ruta_escudo
+from ciclo_figuras import figuras_sin_pantalla, nueva_figura
+from modo_borrador import guardar_borrador, resolucion_borrador
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -19,12 +23,11 @@ class DistanciaZonasReport:
         self.data_path = data_path
         self.df = None
         self.load_data()
-        self.clean_team_names()
         
     def load_data(self):
-        """Carga los datos del archivo parquet"""
+        """Carga los datos limpios del parquet (compartidos por los informes del proceso)"""
         try:
-            self.df = pd.read_parquet(self.data_path)
+            self.df = cargar_datos_limpios(self.data_path)
             print(f"Datos cargados exitosamente: {self.df.shape[0]} filas, {self.df.shape[1]} columnas")
             print(f"Columnas disponibles: {list(self.df.columns)}")
         except Exception as e:
@@ -34,57 +37,6 @@ class DistanciaZonasReport:
         """Calcula la similitud entre dos strings"""
         return SequenceMatcher(None, a.lower(), b.lower()).ratio()
     
-    def clean_team_names(self):
-        """Limpia y agrupa nombres de equipos similares y normaliza jornadas"""
-        if self.df is None:
-            return
-        
-        # Limpiar nombres de equipos
-        unique_teams = self.df['Equipo'].unique()
-        team_mapping = {}
-        processed_teams = set()
-        
-        for team in unique_teams:
-            if team in processed_teams:
-                continue
-                
-            # Buscar equipos similares
-            similar_teams = [team]
-            for other_team in unique_teams:
-                if other_team != team and other_team not in processed_teams:
-                    if self.similarity(team, other_team) > 0.7:  # 70% de similitud
-                        similar_teams.append(other_team)
-            
-            # Elegir el nombre más largo como representativo
-            canonical_name = max(similar_teams, key=len)
-            
-            # Mapear todos los nombres similares al canónico
-            for similar_team in similar_teams:
-                team_mapping[similar_team] = canonical_name
-                processed_teams.add(similar_team)
-        
-        # Aplicar el mapeo
-        self.df['Equipo'] = self.df['Equipo'].map(team_mapping)
-        
-        # Normalizar jornadas: convertir 'J1', 'J2', etc. a números 1, 2, etc.
-        def normalize_jornada(jornada):
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            return jornada
-        
-        self.df['Jornada'] = self.df['Jornada'].apply(normalize_jornada)
-        
-        print(f"Limpieza completada. Equipos únicos: {len(self.df['Equipo'].unique())}")
-        print(f"Jornadas normalizadas en datos: {sorted(self.df['Jornada'].unique())}")
-        
     def get_available_teams(self):
         """Retorna la lista de equipos disponibles"""
         if self.df is None:
@@ -135,26 +87,14 @@ class DistanciaZonasReport:
         return filtered_df
     
     def load_team_logo(self, equipo):
-        """Carga el escudo del equipo"""
-        # Intentar diferentes variaciones del nombre
-        possible_names = [
-            equipo,
-            equipo.replace(' ', '_'),
-            equipo.replace(' ', ''),
-            equipo.lower(),
-            equipo.lower().replace(' ', '_'),
-            equipo.lower().replace(' ', '')
-        ]
-        
-        for name in possible_names:
-            logo_path = f"assets/escudos/{name}.png"
-            if os.path.exists(logo_path):
-                print(f"Escudo encontrado: {logo_path}")
-                try:
-                    return plt.imread(logo_path)
-                except Exception as e:
-                    print(f"Error al cargar escudo {logo_path}: {e}")
-                    continue
+        """Carga el escudo del equipo (ruta resuelta con el índice de assets/escudos)"""
+        logo_path = ruta_escudo(equipo)
+        if logo_path:
+            print(f"Escudo encontrado: {logo_path}")
+            try:
+                return cargar_imagen(logo_path)
+            except Exception as e:
+                print(f"Error al cargar escudo {logo_path}: {e}")
         
         print(f"No se encontró el escudo para: {equipo}")
         return None
@@ -165,7 +105,7 @@ class DistanciaZonasReport:
         if os.path.exists(ball_path):
             print(f"Balón encontrado: {ball_path}")
             try:
-                return plt.imread(ball_path)
+                return cargar_imagen(ball_path)
             except Exception as e:
                 print(f"Error al cargar balón: {e}")
                 return None
@@ -179,7 +119,7 @@ class DistanciaZonasReport:
         if os.path.exists(bg_path):
             print(f"Fondo encontrado: {bg_path}")
             try:
-                return plt.imread(bg_path)
+                return cargar_imagen(bg_path)
             except Exception as e:
                 print(f"Error al cargar fondo: {e}")
                 return None
@@ -189,50 +129,21 @@ class DistanciaZonasReport:
     
     def create_zones_data(self, filtered_df, jornadas):
         """Procesa los datos de distancias por zonas para los gráficos"""
-        # Normalizar jornadas de entrada
-        normalized_jornadas = []
-        for jornada in jornadas:
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            else:
-                normalized_jornadas.append(jornada)
+        # Totales por jugador desde la matriz jugador x jornada x distancia (MANTENER EN METROS)
+        matriz = matriz_jugador_jornada(filtered_df, jornadas, COLUMNAS_DISTANCIAS.values())
         
-        # Verificar si Alias está vacío y usar Nombre en su lugar
-        if 'Nombre' in filtered_df.columns:
-            mask_empty_alias = filtered_df['Alias'].isna() | (filtered_df['Alias'] == '') | (filtered_df['Alias'].str.strip() == '')
-            filtered_df.loc[mask_empty_alias, 'Alias'] = filtered_df.loc[mask_empty_alias, 'Nombre']
-
-        # Agrupar datos por jugador
-        pivot_data = filtered_df.groupby(['Alias']).agg({
-            'Distancia Total': 'sum',
-            'Distancia Total 14-21 km / h': 'sum',
-            'Distancia Total  21-24 km / h': 'sum',
-            'Distancia Total >24 km / h': 'sum',
-            'Dorsal': 'first'
-        }).reset_index()
-        
-        # Procesar datos para gráficos (MANTENER EN METROS)
         jugadores_data = {}
-        for jugador in pivot_data['Alias'].unique():
-            player_data = pivot_data[pivot_data['Alias'] == jugador].iloc[0]
-            
+        for i, jugador in enumerate(matriz['jugadores']):
+            total, dist_14_21, dist_21_24, dist_mas_24 = matriz['totales'][i].tolist()
             jugadores_data[jugador] = {
-                'dorsal': player_data['Dorsal'],
-                'distancia_total': float(player_data['Distancia Total']),
-                'dist_14_21': float(player_data['Distancia Total 14-21 km / h']),
-                'dist_21_24': float(player_data['Distancia Total  21-24 km / h']),
-                'dist_mas_24': float(player_data['Distancia Total >24 km / h'])
+                'dorsal': matriz['dorsales'][i],
+                'distancia_total': total,
+                'dist_14_21': dist_14_21,
+                'dist_21_24': dist_21_24,
+                'dist_mas_24': dist_mas_24
             }
         
-        return jugadores_data, normalized_jornadas
+        return jugadores_data, matriz['jornadas']
     
     def create_visualization(self, equipo, jornadas, figsize=(16, 11)):
         """Crea la visualización completa para distancia por zonas"""
@@ -243,7 +154,7 @@ class DistanciaZonasReport:
             return None
         
         # Crear figura
-        fig = plt.figure(figsize=figsize, facecolor='white')
+        fig = nueva_figura(figsize=figsize, facecolor='white')
         
         # Cargar y establecer fondo
         background = self.load_background()
@@ -283,7 +194,7 @@ class DistanciaZonasReport:
         ball = self.load_ball_image()
         if ball is not None:
             try:
-                imagebox = OffsetImage(ball, zoom=0.15)
+                imagebox = imagen_offset(ball, zoom=0.15)
                 ab = AnnotationBbox(imagebox, (0.05, 0.5), frameon=False)
                 ax_title.add_artist(ab)
                 print("✅ Balón aplicado correctamente")
@@ -296,7 +207,7 @@ class DistanciaZonasReport:
         logo = self.load_team_logo(equipo)
         if logo is not None:
             try:
-                imagebox = OffsetImage(logo, zoom=0.15)
+                imagebox = imagen_offset(logo, zoom=0.15)
                 ab = AnnotationBbox(imagebox, (0.95, 0.5), frameon=False)
                 ax_title.add_artist(ab)
                 print("✅ Escudo aplicado correctamente")
@@ -548,11 +459,12 @@ def main_zonas():
         import traceback
         traceback.print_exc()
 
-def generar_reporte_zonas_personalizado(equipo, jornadas, mostrar=True, guardar=True):
+def generar_reporte_zonas_personalizado(equipo, jornadas, mostrar=True, guardar=True, borrador=False):
     """Función para generar un reporte personalizado de zonas"""
     try:
         report_generator = DistanciaZonasReport()
-        fig = report_generator.create_visualization(equipo, jornadas)
+        with resolucion_borrador(borrador), figuras_sin_pantalla(not mostrar):
+            fig = report_generator.create_visualization(equipo, jornadas)
         
         if fig:
             if mostrar:
@@ -562,6 +474,10 @@ def generar_reporte_zonas_personalizado(equipo, jornadas, mostrar=True, guardar=
                 equipo_filename = equipo.replace(' ', '_').replace('/', '_')
                 output_path = f"reporte_zonas_{equipo_filename}.pdf"
                 
+                if borrador:
+                    guardar_borrador(fig, output_path)
+                    return fig
+                
                 from matplotlib.backends.backend_pdf import PdfPages
                 with PdfPages(output_path) as pdf:
                     fig.patch.set_alpha(0.0)
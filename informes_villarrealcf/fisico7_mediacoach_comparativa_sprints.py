@@ -1,13 +1,17 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from matplotlib.offsetbox import AnnotationBbox
 from matplotlib import patheffects
 import seaborn as sns
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 import os
 from difflib import SequenceMatcher
+from datos_compartidos import COLUMNAS_SPRINTS, cargar_datos_limpios, matriz_jugador_jornada, normalize_jornada
+from registro_assets import cargar_imagen, imagen_offset, ruta_escudo
+from ciclo_figuras import figuras_sin_pantalla, nueva_figura
+from modo_borrador import guardar_borrador, resolucion_borrador
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -21,12 +25,11 @@ class ComparativaSprintsReport:
         self.equipo_fijo = "Villarreal CF"  # Siempre en la izquierda
         self.df = None
         self.load_data()
-        self.clean_team_names()
         
     def load_data(self):
-        """Carga los datos del archivo parquet"""
+        """Carga los datos limpios del parquet (compartidos por los informes del proceso)"""
         try:
-            self.df = pd.read_parquet(self.data_path)
+            self.df = cargar_datos_limpios(self.data_path)
             print(f"Datos cargados exitosamente: {self.df.shape[0]} filas, {self.df.shape[1]} columnas")
             print(f"Columnas disponibles: {list(self.df.columns)}")
         except Exception as e:
@@ -36,57 +39,6 @@ class ComparativaSprintsReport:
         """Calcula la similitud entre dos strings"""
         return SequenceMatcher(None, a.lower(), b.lower()).ratio()
     
-    def clean_team_names(self):
-        """Limpia y agrupa nombres de equipos similares y normaliza jornadas"""
-        if self.df is None:
-            return
-        
-        # Limpiar nombres de equipos
-        unique_teams = self.df['Equipo'].unique()
-        team_mapping = {}
-        processed_teams = set()
-        
-        for team in unique_teams:
-            if team in processed_teams:
-                continue
-                
-            # Buscar equipos similares
-            similar_teams = [team]
-            for other_team in unique_teams:
-                if other_team != team and other_team not in processed_teams:
-                    if self.similarity(team, other_team) > 0.7:  # 70% de similitud
-                        similar_teams.append(other_team)
-            
-            # Elegir el nombre más largo como representativo
-            canonical_name = max(similar_teams, key=len)
-            
-            # Mapear todos los nombres similares al canónico
-            for similar_team in similar_teams:
-                team_mapping[similar_team] = canonical_name
-                processed_teams.add(similar_team)
-        
-        # Aplicar el mapeo
-        self.df['Equipo'] = self.df['Equipo'].map(team_mapping)
-        
-        # Normalizar jornadas: convertir 'J1', 'J2', etc. a números 1, 2, etc.
-        def normalize_jornada(jornada):
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            return jornada
-        
-        self.df['Jornada'] = self.df['Jornada'].apply(normalize_jornada)
-        
-        print(f"Limpieza completada. Equipos únicos: {len(self.df['Equipo'].unique())}")
-        print(f"Jornadas normalizadas en datos: {sorted(self.df['Jornada'].unique())}")
-        
     def get_available_teams(self):
         """Retorna la lista de equipos disponibles (excluyendo Villarreal)"""
         if self.df is None:
@@ -144,26 +96,14 @@ class ComparativaSprintsReport:
         return filtered_df
     
     def load_team_logo(self, equipo):
-        """Carga el escudo del equipo"""
-        # Intentar diferentes variaciones del nombre
-        possible_names = [
-            equipo,
-            equipo.replace(' ', '_'),
-            equipo.replace(' ', ''),
-            equipo.lower(),
-            equipo.lower().replace(' ', '_'),
-            equipo.lower().replace(' ', '')
-        ]
-        
-        for name in possible_names:
-            logo_path = f"assets/escudos/{name}.png"
-            if os.path.exists(logo_path):
-                print(f"Escudo encontrado: {logo_path}")
-                try:
-                    return plt.imread(logo_path)
-                except Exception as e:
-                    print(f"Error al cargar escudo {logo_path}: {e}")
-                    continue
+        """Carga el escudo del equipo (ruta resuelta con el índice de assets/escudos)"""
+        logo_path = ruta_escudo(equipo)
+        if logo_path:
+            print(f"Escudo encontrado: {logo_path}")
+            try:
+                return cargar_imagen(logo_path)
+            except Exception as e:
+                print(f"Error al cargar escudo {logo_path}: {e}")
         
         print(f"No se encontró el escudo para: {equipo}")
         return None
@@ -174,7 +114,7 @@ class ComparativaSprintsReport:
         if os.path.exists(ball_path):
             print(f"Balón encontrado: {ball_path}")
             try:
-                return plt.imread(ball_path)
+                return cargar_imagen(ball_path)
             except Exception as e:
                 print(f"Error al cargar balón: {e}")
                 return None
@@ -188,7 +128,7 @@ class ComparativaSprintsReport:
         if os.path.exists(bg_path):
             print(f"Fondo encontrado: {bg_path}")
             try:
-                return plt.imread(bg_path)
+                return cargar_imagen(bg_path)
             except Exception as e:
                 print(f"Error al cargar fondo: {e}")
                 return None
@@ -198,89 +138,52 @@ class ComparativaSprintsReport:
     
     def create_comparative_data(self, filtered_df, jornadas):
         """Procesa los datos de sprints para la comparativa"""
-        # Normalizar jornadas de entrada
-        normalized_jornadas = []
-        for jornada in jornadas:
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            else:
-                normalized_jornadas.append(jornada)
+        columnas = [COLUMNAS_SPRINTS[clave] for clave in ('sprints_21', 'sprints_21_24', 'sprints_24')]
+        normalized_jornadas = [normalize_jornada(j) for j in jornadas]
         
-        # Verificar si Alias está vacío y usar Nombre en su lugar
-        if 'Nombre' in filtered_df.columns:
-            mask_empty_alias = filtered_df['Alias'].isna() | (filtered_df['Alias'] == '') | (filtered_df['Alias'].str.strip() == '')
-            filtered_df.loc[mask_empty_alias, 'Alias'] = filtered_df.loc[mask_empty_alias, 'Nombre']
-
         # Separar datos por equipo
-        villarreal_df = filtered_df[filtered_df['Equipo'].str.contains('Villarreal', case=False, na=False)]
-        rival_df = filtered_df[~filtered_df['Equipo'].str.contains('Villarreal', case=False, na=False)]
+        es_villarreal = filtered_df['Equipo'].str.contains('Villarreal', case=False, na=False)
+        villarreal_df = filtered_df[es_villarreal]
+        rival_df = filtered_df[~es_villarreal]
         
-        # Procesar datos para cada equipo
+        # Procesar datos para cada equipo (una matriz jugador x jornada x sprint por equipo)
         equipos_data = {}
         
         for equipo_name, equipo_df in [("Villarreal CF", villarreal_df), ("Rival", rival_df)]:
             if len(equipo_df) == 0:
                 continue
-                
+            
+            matriz = matriz_jugador_jornada(equipo_df, normalized_jornadas, columnas)
+            sprints_21 = matriz['valores'][:, :, 0].astype(int)
+            totales = matriz['totales'].astype(int)
+            
             # Datos por jornada para gráfico superior comparativo
-            jornadas_data = {}
-            for jornada in normalized_jornadas:
-                jornada_data = equipo_df[equipo_df['Jornada'] == jornada]
-                if len(jornada_data) > 0:
-                    total_sprints = jornada_data['N Total Sprints >21 km / h'].sum()
-                    jornadas_data[jornada] = int(total_sprints)
-                else:
-                    jornadas_data[jornada] = 0
+            jornadas_data = dict(zip(normalized_jornadas, sprints_21.sum(axis=0).tolist()))
             
-            # Datos por jugador y jornada para gráficos superiores apilados
+            # Datos por jugador y jornada para gráficos superiores apilados (en orden de aparición)
+            aparicion = pd.Index(matriz['jugadores']).get_indexer(pd.unique(equipo_df['Alias'].dropna()))
             jugadores_jornadas = {}
-            jugadores_list = equipo_df['Alias'].unique()
-            
-            for jugador in jugadores_list:
-                jugador_data = equipo_df[equipo_df['Alias'] == jugador]
-                jugadores_jornadas[jugador] = {
-                    'jornadas': {},
-                    'total': 0,
-                    'dorsal': jugador_data['Dorsal'].iloc[0] if len(jugador_data) > 0 else 'N/A'
+            for i in aparicion:
+                jugadores_jornadas[matriz['jugadores'][i]] = {
+                    'jornadas': dict(zip(normalized_jornadas, sprints_21[i].tolist())),
+                    'total': int(sprints_21[i].sum()),
+                    'dorsal': matriz['dorsales'][i]
                 }
-                
-                for jornada in normalized_jornadas:
-                    jornada_data = jugador_data[jugador_data['Jornada'] == jornada]
-                    if len(jornada_data) > 0:
-                        sprints = int(jornada_data['N Total Sprints >21 km / h'].sum())
-                        jugadores_jornadas[jugador]['jornadas'][jornada] = sprints
-                        jugadores_jornadas[jugador]['total'] += sprints
-                    else:
-                        jugadores_jornadas[jugador]['jornadas'][jornada] = 0
             
             # Datos por jugador para gráficos inferiores
-            jugadores_data = equipo_df.groupby(['Alias']).agg({
-                'N Total Sprints 21-24 km / h': 'sum',
-                'N Total Sprints >24 km / h': 'sum',
-                'Dorsal': 'first'
-            }).reset_index()
-            
             jugadores_dict = {}
-            for _, row in jugadores_data.iterrows():
-                jugadores_dict[row['Alias']] = {
-                    'sprints_21_24': int(row['N Total Sprints 21-24 km / h']),
-                    'sprints_24': int(row['N Total Sprints >24 km / h']),
-                    'dorsal': row['Dorsal']
+            for i, jugador in enumerate(matriz['jugadores']):
+                jugadores_dict[jugador] = {
+                    'sprints_21_24': totales[i, 1].item(),
+                    'sprints_24': totales[i, 2].item(),
+                    'dorsal': matriz['dorsales'][i]
                 }
             
             equipos_data[equipo_name] = {
                 'jornadas': jornadas_data,
                 'jugadores': jugadores_dict,
                 'jugadores_jornadas': jugadores_jornadas,
-                'equipo_original': equipo_df['Equipo'].iloc[0] if len(equipo_df) > 0 else equipo_name
+                'equipo_original': equipo_df['Equipo'].iloc[0]
             }
         
         return equipos_data, normalized_jornadas
@@ -294,7 +197,7 @@ class ComparativaSprintsReport:
             return None
         
         # Crear figura
-        fig = plt.figure(figsize=figsize, facecolor='white')
+        fig = nueva_figura(figsize=figsize, facecolor='white')
         
         # Cargar y establecer fondo
         background = self.load_background()
@@ -345,7 +248,7 @@ class ComparativaSprintsReport:
         ball = self.load_ball_image()
         if ball is not None:
             try:
-                imagebox = OffsetImage(ball, zoom=0.15)
+                imagebox = imagen_offset(ball, zoom=0.15)
                 ab = AnnotationBbox(imagebox, (0.05, 0.5), frameon=False)
                 ax_title.add_artist(ab)
                 print("✅ Balón aplicado correctamente")
@@ -359,7 +262,7 @@ class ComparativaSprintsReport:
         logo_villarreal = self.load_team_logo("Villarreal CF")
         if logo_villarreal is not None:
             try:
-                imagebox = OffsetImage(logo_villarreal, zoom=0.15)
+                imagebox = imagen_offset(logo_villarreal, zoom=0.15)
                 ab = AnnotationBbox(imagebox, (0.90, 0.5), frameon=False, zorder=2)
                 ax_title.add_artist(ab)
                 print("✅ Escudo Villarreal aplicado correctamente")
@@ -370,7 +273,7 @@ class ComparativaSprintsReport:
         logo_rival = self.load_team_logo(equipo_rival)
         if logo_rival is not None:
             try:
-                imagebox = OffsetImage(logo_rival, zoom=0.13)
+                imagebox = imagen_offset(logo_rival, zoom=0.13)
                 ab = AnnotationBbox(imagebox, (0.95, 0.5), frameon=False, zorder=1)
                 ax_title.add_artist(ab)
                 print("✅ Escudo rival aplicado correctamente")
@@ -680,11 +583,12 @@ def main_comparativa_sprints():
         import traceback
         traceback.print_exc()
 
-def generar_comparativa_sprints_personalizada(equipo_rival, jornadas, mostrar=True, guardar=True):
+def generar_comparativa_sprints_personalizada(equipo_rival, jornadas, mostrar=True, guardar=True, borrador=False):
     """Función para generar una comparativa personalizada de sprints"""
     try:
         report_generator = ComparativaSprintsReport()
-        fig = report_generator.create_visualization(equipo_rival, jornadas)
+        with resolucion_borrador(borrador), figuras_sin_pantalla(not mostrar):
+            fig = report_generator.create_visualization(equipo_rival, jornadas)
         
         if fig:
             if mostrar:
@@ -694,6 +598,10 @@ def generar_comparativa_sprints_personalizada(equipo_rival, jornadas, mostrar=Tr
                 equipo_filename = equipo_rival.replace(' ', '_').replace('/', '_')
                 output_path = f"comparativa_sprints_Villarreal_vs_{equipo_filename}.pdf"
                 
+                if borrador:
+                    guardar_borrador(fig, output_path)
+                    return fig
+                
                 from matplotlib.backends.backend_pdf import PdfPages
                 with PdfPages(output_path) as pdf:
                     fig.patch.set_alpha(0.0)
@@ -1,16 +1,117 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from matplotlib.offsetbox import AnnotationBbox
 from matplotlib import patheffects
 import seaborn as sns
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 import os
 from difflib import SequenceMatcher
+from datos_compartidos import cargar_datos_limpios, media_liga, normalize_jornada
+from registro_assets import cargar_imagen, imagen_offset, ruta_escudo
+from ciclo_figuras import figuras_sin_pantalla, nueva_figura
+from modo_borrador import guardar_borrador, resolucion_borrador
 import warnings
 warnings.filterwarnings('ignore')
 
+# Métricas de velocidad del informe: clave interna -> (columna, clave del máximo por jugador)
+METRICAS_VELOCIDAD = {
+    'vel_max_total': ('Velocidad Máxima Total', 'max_total'),
+    'vel_max_1p': ('Velocidad Máxima 1P', 'max_1p'),
+    'vel_max_2p': ('Velocidad Máxima 2P', 'max_2p'),
+}
+
+# Clasificaciones calculadas en el proceso: (DataFrame, ventana, top_k, min_minutos, empates) -> resultado.
+# Todos los equipos de una misma selección de jornadas (lote, paquete...) comparten una sola pasada.
+_CLASIFICACIONES = {}
+MAX_CLASIFICACIONES = 8
+
+def calcular_clasificacion_velocidades(df, jornadas, top_k=10, min_minutos=0, incluir_empates=False):
+    """
+    Clasificación de velocidades máximas de toda la liga en las jornadas dadas, en una pasada
+
+    Para cada jugador (equipo, alias) toma la primera fila de cada jornada; su máximo en cada
+    métrica es el de esas jornadas (0 si no tiene datos). Los empates se ordenan por orden de
+    aparición en los datos.
+
+    Args:
+        top_k: Jugadores por clasificación
+        min_minutos: Solo cuentan las filas con al menos estos minutos jugados
+        incluir_empates: Incluir además a los empatados con el último del top_k
+
+    Returns:
+        dict: 'jornadas' (normalizadas), 'velocidades' (por equipo, alias y jornada), 'jugadores'
+              (máximos y dorsal por equipo y alias), 'top_equipo' {métrica: {equipo: [alias]}} y
+              'top_liga' {métrica: DataFrame Equipo/Alias/valor}
+    """
+    normalized_jornadas = [normalize_jornada(j) for j in jornadas]
+    clave = (id(df), tuple(normalized_jornadas), top_k, min_minutos, incluir_empates)
+    entrada = _CLASIFICACIONES.get(clave)
+    if entrada is not None and entrada[0] is df:
+        return entrada[1]
+
+    resultado = _clasificar_velocidades(df, normalized_jornadas, top_k, min_minutos, incluir_empates)
+    if len(_CLASIFICACIONES) >= MAX_CLASIFICACIONES:
+        _CLASIFICACIONES.pop(next(iter(_CLASIFICACIONES)))
+    _CLASIFICACIONES[clave] = (df, resultado)
+    return resultado
+
+def _clasificar_velocidades(df, normalized_jornadas, top_k=10, min_minutos=0, incluir_empates=False):
+    """calcular_clasificacion_velocidades() sin caché"""
+    seleccion = df[df['Jornada'].isin(normalized_jornadas)]
+    if min_minutos:
+        seleccion = seleccion[seleccion['Minutos jugados'] >= min_minutos]
+
+    columnas = [columna for columna, _ in METRICAS_VELOCIDAD.values()]
+    primeras = seleccion.drop_duplicates(['Equipo', 'Alias', 'Jornada'])
+    velocidades = primeras.set_index(['Equipo', 'Alias', 'Jornada'])[columnas].astype(float)
+    velocidades.columns = list(METRICAS_VELOCIDAD)
+
+    # Máximos por jugador en orden de aparición (NaN no cuenta; sin datos -> 0)
+    grupos = velocidades.groupby(level=['Equipo', 'Alias'], sort=False)
+    jugadores = grupos.max().clip(lower=0).fillna(0)
+    jugadores.columns = [max_key for _, max_key in METRICAS_VELOCIDAD.values()]
+    dorsales = seleccion.drop_duplicates(['Equipo', 'Alias']).set_index(['Equipo', 'Alias'])['Dorsal']
+    jugadores['dorsal'] = dorsales.reindex(jugadores.index)
+
+    equipos = jugadores.index.get_level_values('Equipo').to_numpy()
+    aparicion = np.arange(len(jugadores))
+    top_equipo = {}
+    top_liga = {}
+    for metric, (_, max_key) in METRICAS_VELOCIDAD.items():
+        valores = jugadores[max_key].to_numpy()
+
+        # Liga: mayor valor primero, empates por orden de aparición
+        orden = np.lexsort((aparicion, -valores))
+        top_liga[metric] = jugadores.iloc[_recortar_top(valores[orden], top_k, incluir_empates, orden)][[max_key]] \
+            .rename(columns={max_key: 'valor'}).reset_index()
+
+        # Equipos: el mismo orden dentro de cada equipo
+        orden = np.lexsort((aparicion, -valores, pd.factorize(equipos)[0]))
+        top_equipo[metric] = {}
+        equipos_ordenados = equipos[orden]
+        cortes = np.flatnonzero(equipos_ordenados[1:] != equipos_ordenados[:-1]) + 1
+        for bloque in np.split(orden, cortes):
+            if len(bloque) == 0:
+                continue
+            seleccionados = _recortar_top(valores[bloque], top_k, incluir_empates, bloque)
+            top_equipo[metric][equipos[bloque[0]]] = jugadores.index[seleccionados].get_level_values('Alias').tolist()
+
+    return {
+        'jornadas': normalized_jornadas,
+        'velocidades': velocidades,
+        'jugadores': jugadores,
+        'top_equipo': top_equipo,
+        'top_liga': top_liga,
+    }
+
+def _recortar_top(valores_ordenados, top_k, incluir_empates, posiciones):
+    """Posiciones de los top_k primeros (y de los empatados con el último si incluir_empates)"""
+    if not incluir_empates or len(valores_ordenados) <= top_k:
+        return posiciones[:top_k]
+    return posiciones[valores_ordenados >= valores_ordenados[top_k - 1]]
+
 class VelocidadesMaximasReport:
     def __init__(self, data_path="prueba_extraccion/data/rendimiento_fisico.parquet"):
         """
@@ -19,12 +120,11 @@ class VelocidadesMaximasReport:
         self.data_path = data_path
         self.df = None
         self.load_data()
-        self.clean_team_names()
         
     def load_data(self):
-        """Carga los datos del archivo parquet"""
+        """Carga los datos limpios del parquet (compartidos por los informes del proceso)"""
         try:
-            self.df = pd.read_parquet(self.data_path)
+            self.df = cargar_datos_limpios(self.data_path)
             print(f"Datos cargados exitosamente: {self.df.shape[0]} filas, {self.df.shape[1]} columnas")
             print(f"Columnas disponibles: {list(self.df.columns)}")
         except Exception as e:
@@ -34,57 +134,6 @@ class VelocidadesMaximasReport:
         """Calcula la similitud entre dos strings"""
         return SequenceMatcher(None, a.lower(), b.lower()).ratio()
     
-    def clean_team_names(self):
-        """Limpia y agrupa nombres de equipos similares y normaliza jornadas"""
-        if self.df is None:
-            return
-        
-        # Limpiar nombres de equipos
-        unique_teams = self.df['Equipo'].unique()
-        team_mapping = {}
-        processed_teams = set()
-        
-        for team in unique_teams:
-            if team in processed_teams:
-                continue
-                
-            # Buscar equipos similares
-            similar_teams = [team]
-            for other_team in unique_teams:
-                if other_team != team and other_team not in processed_teams:
-                    if self.similarity(team, other_team) > 0.7:  # 70% de similitud
-                        similar_teams.append(other_team)
-            
-            # Elegir el nombre más largo como representativo
-            canonical_name = max(similar_teams, key=len)
-            
-            # Mapear todos los nombres similares al canónico
-            for similar_team in similar_teams:
-                team_mapping[similar_team] = canonical_name
-                processed_teams.add(similar_team)
-        
-        # Aplicar el mapeo
-        self.df['Equipo'] = self.df['Equipo'].map(team_mapping)
-        
-        # Normalizar jornadas: convertir 'J1', 'J2', etc. a números 1, 2, etc.
-        def normalize_jornada(jornada):
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            return jornada
-        
-        self.df['Jornada'] = self.df['Jornada'].apply(normalize_jornada)
-        
-        print(f"Limpieza completada. Equipos únicos: {len(self.df['Equipo'].unique())}")
-        print(f"Jornadas normalizadas en datos: {sorted(self.df['Jornada'].unique())}")
-        
     def get_available_teams(self):
         """Retorna la lista de equipos disponibles"""
         if self.df is None:
@@ -139,59 +188,28 @@ class VelocidadesMaximasReport:
         if self.df is None:
             return {}
         
-        # Normalizar jornadas
-        normalized_jornadas = []
-        for jornada in jornadas:
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            else:
-                normalized_jornadas.append(jornada)
-        
-        # Filtrar datos de la liga para las jornadas específicas
-        league_data = self.df[self.df['Jornada'].isin(normalized_jornadas)]
-        
-        if len(league_data) == 0:
-            return {}
-        
-        # Calcular medias de la liga
+        # Medias de la tabla de percentiles de la liga (materializada por ventana de jornadas)
         averages = {
-            'vel_max_total': league_data['Velocidad Máxima Total'].mean(),
-            'vel_max_1p': league_data['Velocidad Máxima 1P'].mean(),
-            'vel_max_2p': league_data['Velocidad Máxima 2P'].mean()
+            'vel_max_total': media_liga(self.df, 'Velocidad Máxima Total', jornadas=jornadas),
+            'vel_max_1p': media_liga(self.df, 'Velocidad Máxima 1P', jornadas=jornadas),
+            'vel_max_2p': media_liga(self.df, 'Velocidad Máxima 2P', jornadas=jornadas)
         }
         
+        if all(pd.isna(media) for media in averages.values()):
+            return {}
+        
         print(f"Medias de la liga calculadas: {averages}")
         return averages
     
     def load_team_logo(self, equipo):
-        """Carga el escudo del equipo"""
-        # Intentar diferentes variaciones del nombre
-        possible_names = [
-            equipo,
-            equipo.replace(' ', '_'),
-            equipo.replace(' ', ''),
-            equipo.lower(),
-            equipo.lower().replace(' ', '_'),
-            equipo.lower().replace(' ', '')
-        ]
-        
-        for name in possible_names:
-            logo_path = f"assets/escudos/{name}.png"
-            if os.path.exists(logo_path):
-                print(f"Escudo encontrado: {logo_path}")
-                try:
-                    return plt.imread(logo_path)
-                except Exception as e:
-                    print(f"Error al cargar escudo {logo_path}: {e}")
-                    continue
+        """Carga el escudo del equipo (ruta resuelta con el índice de assets/escudos)"""
+        logo_path = ruta_escudo(equipo)
+        if logo_path:
+            print(f"Escudo encontrado: {logo_path}")
+            try:
+                return cargar_imagen(logo_path)
+            except Exception as e:
+                print(f"Error al cargar escudo {logo_path}: {e}")
         
         print(f"No se encontró el escudo para: {equipo}")
         return None
@@ -202,7 +220,7 @@ class VelocidadesMaximasReport:
         if os.path.exists(ball_path):
             print(f"Balón encontrado: {ball_path}")
             try:
-                return plt.imread(ball_path)
+                return cargar_imagen(ball_path)
             except Exception as e:
                 print(f"Error al cargar balón: {e}")
                 return None
@@ -216,7 +234,7 @@ class VelocidadesMaximasReport:
         if os.path.exists(bg_path):
             print(f"Fondo encontrado: {bg_path}")
             try:
-                return plt.imread(bg_path)
+                return cargar_imagen(bg_path)
             except Exception as e:
                 print(f"Error al cargar fondo: {e}")
                 return None
@@ -226,73 +244,65 @@ class VelocidadesMaximasReport:
     
     def create_velocities_data(self, filtered_df, jornadas):
         """Procesa los datos de velocidades para los gráficos"""
-        # Normalizar jornadas de entrada
-        normalized_jornadas = []
-        for jornada in jornadas:
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    normalized_jornadas.append(int(jornada[1:]))
-                except ValueError:
-                    normalized_jornadas.append(jornada)
-            else:
-                normalized_jornadas.append(jornada)
+        clasificacion = _clasificar_velocidades(filtered_df, [normalize_jornada(j) for j in jornadas])
+        equipos = clasificacion['jugadores'].index.unique('Equipo').tolist()
+        return self.datos_jugadores(clasificacion, equipos), clasificacion['jornadas']
+    
+    def get_leaderboard(self, jornadas, top_k=10, min_minutos=0, incluir_empates=False):
+        """Clasificación de velocidades de toda la liga (ver calcular_clasificacion_velocidades)"""
+        if self.df is None:
+            return None
+        return calcular_clasificacion_velocidades(self.df, jornadas, top_k, min_minutos, incluir_empates)
+    
+    def datos_jugadores(self, clasificacion, equipos, jugadores_alias=None):
+        """
+        Velocidades por jugador y jornada en el formato de los gráficos
         
-        # Verificar si Alias está vacío y usar Nombre en su lugar
-        if 'Nombre' in filtered_df.columns:
-            mask_empty_alias = filtered_df['Alias'].isna() | (filtered_df['Alias'] == '') | (filtered_df['Alias'].str.strip() == '')
-            filtered_df.loc[mask_empty_alias, 'Alias'] = filtered_df.loc[mask_empty_alias, 'Nombre']
-
-        # Procesar datos por jugador y jornada
-        jugadores_data = {}
-        jugadores_list = filtered_df['Alias'].unique()
-        
-        for jugador in jugadores_list:
-            jugador_data = filtered_df[filtered_df['Alias'] == jugador]
-            jugadores_data[jugador] = {
-                'jornadas': {},
-                'max_total': 0,
-                'max_1p': 0,
-                'max_2p': 0,
-                'dorsal': jugador_data['Dorsal'].iloc[0] if len(jugador_data) > 0 else 'N/A'
-            }
-            
-            for jornada in normalized_jornadas:
-                jornada_data = jugador_data[jugador_data['Jornada'] == jornada]
-                if len(jornada_data) > 0:
-                    row = jornada_data.iloc[0]
-                    velocidades = {
-                        'vel_max_total': float(row['Velocidad Máxima Total']),
-                        'vel_max_1p': float(row['Velocidad Máxima 1P']),
-                        'vel_max_2p': float(row['Velocidad Máxima 2P'])
-                    }
-                    jugadores_data[jugador]['jornadas'][jornada] = velocidades
-                    
-                    # Actualizar máximos
-                    jugadores_data[jugador]['max_total'] = max(jugadores_data[jugador]['max_total'], velocidades['vel_max_total'])
-                    jugadores_data[jugador]['max_1p'] = max(jugadores_data[jugador]['max_1p'], velocidades['vel_max_1p'])
-                    jugadores_data[jugador]['max_2p'] = max(jugadores_data[jugador]['max_2p'], velocidades['vel_max_2p'])
-                else:
-                    jugadores_data[jugador]['jornadas'][jornada] = {
-                        'vel_max_total': 0, 'vel_max_1p': 0, 'vel_max_2p': 0
-                    }
+        Returns:
+            dict: alias -> {'jornadas': {jornada: {métrica: valor}}, 'max_total', 'max_1p', 'max_2p', 'dorsal'}
+        """
+        jugadores = clasificacion['jugadores']
+        velocidades = clasificacion['velocidades']
+        jornadas = clasificacion['jornadas']
+        sin_datos = {metric: 0 for metric in METRICAS_VELOCIDAD}
         
-        return jugadores_data, normalized_jornadas
+        jugadores_data = {}
+        for equipo in equipos:
+            if equipo not in jugadores.index.get_level_values('Equipo'):
+                continue
+            del_equipo = jugadores.loc[equipo]
+            aliases = del_equipo.index if jugadores_alias is None else jugadores_alias
+            velocidades_equipo = velocidades.loc[equipo]
+            for alias in aliases:
+                fila = del_equipo.loc[alias]
+                por_jornada = velocidades_equipo.loc[alias].to_dict('index')
+                jugadores_data[alias] = {
+                    'jornadas': {j: por_jornada.get(j, sin_datos) for j in jornadas},
+                    'max_total': fila['max_total'],
+                    'max_1p': fila['max_1p'],
+                    'max_2p': fila['max_2p'],
+                    'dorsal': fila['dorsal'],
+                }
+        return jugadores_data
     
-    def create_visualization(self, equipo, jornadas, figsize=(16, 11)):
-        """Crea la visualización completa de velocidades máximas"""
-        # Filtrar datos
-        filtered_df = self.filter_data(equipo, jornadas)
-        if filtered_df is None or len(filtered_df) == 0:
+    def create_visualization(self, equipo, jornadas, figsize=(16, 11), clasificacion=None):
+        """
+        Crea la visualización completa de velocidades máximas
+        
+        Args:
+            clasificacion: Resultado de get_leaderboard(jornadas) para no recalcularlo (se
+                           comparte entre los informes de todos los equipos de la misma selección)
+        """
+        if self.df is None:
+            return None
+        if clasificacion is None:
+            clasificacion = self.get_leaderboard(jornadas)
+        if equipo not in clasificacion['jugadores'].index.get_level_values('Equipo'):
             print("No hay datos para los filtros especificados")
             return None
         
         # Crear figura
-        fig = plt.figure(figsize=figsize, facecolor='white')
+        fig = nueva_figura(figsize=figsize, facecolor='white')
         
         # Cargar y establecer fondo
         background = self.load_background()
@@ -337,7 +347,7 @@ class VelocidadesMaximasReport:
         ball = self.load_ball_image()
         if ball is not None:
             try:
-                imagebox = OffsetImage(ball, zoom=0.15)
+                imagebox = imagen_offset(ball, zoom=0.15)
                 ab = AnnotationBbox(imagebox, (0.05, 0.5), frameon=False)
                 ax_title.add_artist(ab)
                 print("✅ Balón aplicado correctamente")
@@ -350,7 +360,7 @@ class VelocidadesMaximasReport:
         logo = self.load_team_logo(equipo)
         if logo is not None:
             try:
-                imagebox = OffsetImage(logo, zoom=0.15)
+                imagebox = imagen_offset(logo, zoom=0.15)
                 ab = AnnotationBbox(imagebox, (0.95, 0.5), frameon=False)
                 ax_title.add_artist(ab)
                 print("✅ Escudo aplicado correctamente")
@@ -359,8 +369,11 @@ class VelocidadesMaximasReport:
         else:
             print("⚠️ No se pudo cargar el escudo")
         
-        # Procesar datos y calcular medias
-        jugadores_data, normalized_jornadas = self.create_velocities_data(filtered_df, jornadas)
+        # Datos de los jugadores del top de cada métrica y medias de la liga
+        normalized_jornadas = clasificacion['jornadas']
+        tops = {metric: clasificacion['top_equipo'][metric].get(equipo, []) for metric in METRICAS_VELOCIDAD}
+        jugadores_top = list(dict.fromkeys(alias for top in tops.values() for alias in top))
+        jugadores_data = self.datos_jugadores(clasificacion, [equipo], jugadores_top)
         league_averages = self.calculate_league_averages(jornadas)
         
         # Gráfico grande izquierda: VELOCIDAD MÁXIMA (ocupa 2 filas)
@@ -370,7 +383,8 @@ class VelocidadesMaximasReport:
                          color='white', pad=15, 
                          bbox=dict(boxstyle="round,pad=0.5", facecolor='#1e3d59', alpha=0.8))
         self.plot_velocidad_maxima_vertical(ax_main, jugadores_data, normalized_jornadas, 
-                                          league_averages.get('vel_max_total', 0), 'vel_max_total')
+                                          league_averages.get('vel_max_total', 0), 'vel_max_total',
+                                          tops['vel_max_total'])
         
         # Gráfico superior derecha: VELOCIDAD MÁXIMA 1er TIEMPO
         ax_sup_der = fig.add_subplot(gs[1, 1])
@@ -379,7 +393,8 @@ class VelocidadesMaximasReport:
                             color='white', pad=10,
                             bbox=dict(boxstyle="round,pad=0.3", facecolor='#1e3d59', alpha=0.8))
         self.plot_velocidad_maxima_vertical(ax_sup_der, jugadores_data, normalized_jornadas, 
-                                          league_averages.get('vel_max_1p', 0), 'vel_max_1p')
+                                          league_averages.get('vel_max_1p', 0), 'vel_max_1p',
+                                          tops['vel_max_1p'])
         
         # Gráfico inferior derecha: VELOCIDAD MÁXIMA 2o TIEMPO
         ax_inf_der = fig.add_subplot(gs[2, 1])
@@ -388,11 +403,12 @@ class VelocidadesMaximasReport:
                             color='white', pad=10,
                             bbox=dict(boxstyle="round,pad=0.3", facecolor='#1e3d59', alpha=0.8))
         self.plot_velocidad_maxima_vertical(ax_inf_der, jugadores_data, normalized_jornadas, 
-                                          league_averages.get('vel_max_2p', 0), 'vel_max_2p')
+                                          league_averages.get('vel_max_2p', 0), 'vel_max_2p',
+                                          tops['vel_max_2p'])
         
         return fig
     
-    def plot_velocidad_maxima_vertical(self, ax, jugadores_data, jornadas, league_average, metric):
+    def plot_velocidad_maxima_vertical(self, ax, jugadores_data, jornadas, league_average, metric, jugadores_ordenados=None):
         """Dibuja barras verticales para velocidades máximas con línea de media"""
         if not jugadores_data:
             ax.text(0.5, 0.5, 'No hay datos disponibles', ha='center', va='center')
@@ -410,10 +426,12 @@ class VelocidadesMaximasReport:
             sort_key = 'max_2p'
             data_key = 'vel_max_2p'
         
-        # Ordenar jugadores por velocidad máxima (de mayor a menor) y tomar top 10
-        jugadores_ordenados = sorted(jugadores_data.keys(), 
-                                   key=lambda x: jugadores_data[x][sort_key], 
-                                   reverse=True)[:10]
+        # Ordenar jugadores por velocidad máxima (de mayor a menor) y tomar top 10, salvo que
+        # venga ya ordenado de la clasificación
+        if jugadores_ordenados is None:
+            jugadores_ordenados = sorted(jugadores_data.keys(), 
+                                       key=lambda x: jugadores_data[x][sort_key], 
+                                       reverse=True)[:10]
         
         # Colores para jornadas (verdes/amarillos y azules como en la imagen)
         colors = ['#9bc53d', '#7fb142', '#659d47', '#4b894c', '#317551', '#3a7ca8', '#1f5f99', '#05428a']
@@ -575,11 +593,12 @@ def main_velocidades():
         import traceback
         traceback.print_exc()
 
-def generar_reporte_velocidades_personalizado(equipo, jornadas, mostrar=True, guardar=True):
+def generar_reporte_velocidades_personalizado(equipo, jornadas, mostrar=True, guardar=True, borrador=False):
     """Función para generar un reporte personalizado de velocidades"""
     try:
         report_generator = VelocidadesMaximasReport()
-        fig = report_generator.create_visualization(equipo, jornadas)
+        with resolucion_borrador(borrador), figuras_sin_pantalla(not mostrar):
+            fig = report_generator.create_visualization(equipo, jornadas)
         
         if fig:
             if mostrar:
@@ -589,6 +608,10 @@ def generar_reporte_velocidades_personalizado(equipo, jornadas, mostrar=True, gu
                 equipo_filename = equipo.replace(' ', '_').replace('/', '_')
                 output_path = f"reporte_velocidades_{equipo_filename}.pdf"
                 
+                if borrador:
+                    guardar_borrador(fig, output_path)
+                    return fig
+                
                 from matplotlib.backends.backend_pdf import PdfPages
                 with PdfPages(output_path) as pdf:
                     fig.patch.set_alpha(0.0)
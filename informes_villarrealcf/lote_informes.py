@@ -0,0 +1,289 @@
+"""
+Ejecución por lotes (sin input()) del descargador MediaCoach y de los informes físicos.
+
+Pensado para cron. Ejemplos:
+    python lote_informes.py descargar --temporada 0 --competicion 0 --max-jornada 36
+    python lote_informes.py informes --equipos "Sevilla FC" --jornadas 30-35 --workers 4
+    python lote_informes.py informes --todos-equipos --jornadas 33-35 --informes minutos distancias
+    python lote_informes.py informes --todos-equipos --jornadas 1-35 --workers 8 --max-tareas-por-worker 40
+    python lote_informes.py informes --todos-equipos --jornadas 33-35 --cache
+    python lote_informes.py informes --equipos "Sevilla FC" --jornadas 30-35 --borrador
+    python lote_informes.py memoria --informe minutos --equipo "Sevilla FC" --jornadas 30-35 --repeticiones 500
+
+Con --workers > 1 funciona como granja de render: cada proceso importa al arrancar los módulos de
+los informes (datos, fuentes y escudos quedan en caliente) y se recicla tras --max-tareas-por-worker
+trabajos para acotar la memoria. El subcomando 'memoria' genera el mismo informe cientos de veces en
+un solo proceso y comprueba que la memoria residente se mantiene plana (ver ciclo_figuras).
+"""
+import argparse
+import gc
+import multiprocessing
+import os
+import sys
+import time
+
+from registro_informes import INFORMES
+
+DIRECTORIO_INFORMES = os.path.dirname(os.path.abspath(__file__))
+DIRECTORIO_EXTRACCION = os.path.join(DIRECTORIO_INFORMES, 'prueba_extraccion')
+
+def parsear_jornadas(texto):
+    """Convierte '30-35', '30,32,35' o 'J30-J35' en una lista ordenada de enteros"""
+    jornadas = set()
+    for parte in texto.split(','):
+        parte = parte.strip().lstrip('Jj')
+        if not parte:
+            continue
+        if '-' in parte:
+            inicio, fin = parte.split('-', 1)
+            jornadas.update(range(int(inicio), int(fin.strip().lstrip('Jj')) + 1))
+        else:
+            jornadas.add(int(parte))
+    return sorted(jornadas)
+
+def _inicializar_worker(precargar=()):
+    """Configura cada proceso para renderizar sin interfaz gráfica y precarga los informes indicados"""
+    os.environ['MPLBACKEND'] = 'Agg'
+    os.chdir(DIRECTORIO_INFORMES)
+    if DIRECTORIO_INFORMES not in sys.path:
+        sys.path.insert(0, DIRECTORIO_INFORMES)
+
+    if precargar:
+        from registro_informes import cargar_generador
+        import matplotlib.font_manager  # noqa: F401  (caché de fuentes cargada una vez por worker)
+        for informe in precargar:
+            try:
+                cargar_generador(informe)
+            except Exception as e:
+                print(f"⚠️ No se pudo precargar {informe}: {e}")
+
+def _memoria_pico_mb():
+    """Memoria residente máxima del proceso actual en MB (None si no está disponible)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+def nombre_salida(trabajo, formato='pdf'):
+    """Nombre legible del archivo de un trabajo servido desde la caché"""
+    equipo = (trabajo['equipo'] or 'Villarreal CF').replace(' ', '_').replace('/', '_')
+    jornadas = trabajo['jornadas']
+    return f"{trabajo['informe']}_{equipo}_J{min(jornadas)}-J{max(jornadas)}.{formato}"
+
+def _ejecutar_trabajo(trabajo):
+    """Genera un informe en el proceso actual y devuelve su resultado resumido"""
+    from registro_informes import ejecutar_informe
+    from ciclo_figuras import liberar_figura
+    import matplotlib.pyplot as plt
+
+    inicio = time.perf_counter()
+    en_cache = False
+    fig = None
+    try:
+        if trabajo.get('cache'):
+            import shutil
+            from cache_informes import generar_informe_cacheado
+
+            ruta, en_cache = generar_informe_cacheado(trabajo['informe'], trabajo['equipo'], trabajo['jornadas'],
+                                                      trabajo['jornada_referencia'], trabajo['tipo_partido'])
+            ok = ruta is not None
+            if ok:
+                shutil.copyfile(ruta, nombre_salida(trabajo))
+        else:
+            fig = ejecutar_informe(trabajo['informe'], trabajo['equipo'], trabajo['jornadas'],
+                                   trabajo['jornada_referencia'], trabajo['tipo_partido'],
+                                   mostrar=False, guardar=True, borrador=trabajo.get('borrador', False))
+            ok = fig is not None
+        error = None if ok else 'Sin datos para la selección'
+    except Exception as e:
+        ok, error = False, str(e)
+    finally:
+        liberar_figura(fig)
+        plt.close('all')
+        gc.collect()
+
+    return dict(trabajo, ok=ok, error=error, en_cache=en_cache, segundos=time.perf_counter() - inicio,
+                pid=os.getpid(), memoria_mb=_memoria_pico_mb())
+
+def construir_trabajos(informes, equipos, jornadas, jornada_referencia=None, tipo_partido=None, cache=False,
+                       borrador=False):
+    """Crea la lista de trabajos (informe, equipo, jornadas); los informes del Villarreal se generan una vez"""
+    trabajos = []
+    for informe in informes:
+        equipos_informe = [None] if INFORMES[informe]['firma'] == 'jornadas' else equipos
+        for equipo in equipos_informe:
+            trabajos.append({
+                'informe': informe,
+                'equipo': equipo,
+                'jornadas': list(jornadas),
+                'jornada_referencia': jornada_referencia,
+                'tipo_partido': tipo_partido,
+                'cache': cache,
+                'borrador': borrador,
+            })
+    return trabajos
+
+def ejecutar_trabajos(trabajos, workers=1, max_tareas_por_worker=None):
+    """
+    Ejecuta los trabajos secuencialmente (workers <= 1) o en una granja de procesos
+
+    Los workers precargan los informes que aparecen en los trabajos y, si se indica
+    max_tareas_por_worker, se sustituyen por uno nuevo tras ese número de trabajos.
+    """
+    precargar = sorted({trabajo['informe'] for trabajo in trabajos})
+    resultados = []
+    if workers <= 1:
+        _inicializar_worker()
+        for trabajo in trabajos:
+            resultados.append(_ejecutar_trabajo(trabajo))
+        return resultados
+
+    with multiprocessing.Pool(processes=workers, initializer=_inicializar_worker, initargs=(precargar,),
+                              maxtasksperchild=max_tareas_por_worker) as pool:
+        for resultado in pool.imap_unordered(_ejecutar_trabajo, trabajos, chunksize=1):
+            resultados.append(resultado)
+            estado = '✅' if resultado['ok'] else '❌'
+            print(f"  {estado} [{len(resultados)}/{len(trabajos)}] {resultado['informe']} "
+                  f"{resultado['equipo'] or 'Villarreal CF'} ({resultado['segundos']:.1f}s)")
+    return resultados
+
+def imprimir_resumen(resultados, segundos_totales=None):
+    """Muestra el resumen de trabajos y devuelve el número de fallos"""
+    fallos = [r for r in resultados if not r['ok']]
+    print(f"\n=== RESUMEN LOTE: {len(resultados) - len(fallos)}/{len(resultados)} informes generados ===")
+    for r in sorted(resultados, key=lambda r: (r['informe'], r['equipo'] or '')):
+        estado = '✅' if r['ok'] else '❌'
+        detalle = f" - {r['error']}" if r['error'] else (' (caché)' if r.get('en_cache') else '')
+        print(f"  {estado} {r['informe']:<22} {r['equipo'] or 'Villarreal CF':<22} {r['segundos']:6.1f}s{detalle}")
+
+    if not resultados:
+        return len(fallos)
+
+    print("\n  Tiempo medio por informe:")
+    por_informe = {}
+    for r in resultados:
+        por_informe.setdefault(r['informe'], []).append(r['segundos'])
+    for informe, tiempos in sorted(por_informe.items()):
+        print(f"    {informe:<22} {sum(tiempos) / len(tiempos):6.1f}s  ({len(tiempos)} trabajos)")
+
+    desde_cache = sum(1 for r in resultados if r.get('en_cache'))
+    if desde_cache:
+        print(f"\n  Servidos desde caché: {desde_cache}/{len(resultados)}")
+
+    segundos_render = sum(r['segundos'] for r in resultados)
+    procesos = {r['pid'] for r in resultados}
+    memorias = [r['memoria_mb'] for r in resultados if r.get('memoria_mb') is not None]
+    print(f"\n  Tiempo de render acumulado: {segundos_render:.1f}s en {len(procesos)} procesos")
+    if segundos_totales:
+        print(f"  Tiempo real: {segundos_totales:.1f}s "
+              f"({len(resultados) / segundos_totales * 60:.1f} informes/min, "
+              f"paralelismo efectivo x{segundos_render / segundos_totales:.1f})")
+    if memorias:
+        print(f"  Memoria pico por worker: {max(memorias):.0f} MB")
+    return len(fallos)
+
+def obtener_todos_los_equipos():
+    """Equipos disponibles en los datos (con la misma limpieza de nombres que los informes)"""
+    _inicializar_worker()
+    from fisico1_mediacoach_minutos_jugados import MinutosJugadosReport
+    return MinutosJugadosReport().get_available_teams()
+
+def comando_descargar(args):
+    """Lanza el descargador de MediaCoach sin interacción"""
+    os.chdir(DIRECTORIO_EXTRACCION)
+    sys.path.insert(0, DIRECTORIO_EXTRACCION)
+    from extraccion_nueva_mediacoach import ejecutar_descarga
+
+    partidos = ejecutar_descarga(args.temporada, args.competicion, args.max_jornada)
+    print(f"✅ Descarga completada: {partidos} partidos procesados")
+    return 0
+
+def comando_informes(args):
+    """Genera los informes seleccionados para los equipos y jornadas indicados"""
+    informes = args.informes or list(INFORMES)
+    desconocidos = [i for i in informes if i not in INFORMES]
+    if desconocidos:
+        print(f"❌ Informes desconocidos: {desconocidos}. Disponibles: {sorted(INFORMES)}")
+        return 2
+
+    equipos = obtener_todos_los_equipos() if args.todos_equipos else args.equipos
+    if not equipos:
+        print("❌ Indica --equipos o --todos-equipos")
+        return 2
+
+    jornadas = parsear_jornadas(args.jornadas)
+    trabajos = construir_trabajos(informes, equipos, jornadas, args.jornada_referencia, args.tipo_partido,
+                                  args.cache, args.borrador)
+    print(f"🔄 {len(trabajos)} informes en cola ({args.workers} workers)")
+
+    inicio = time.perf_counter()
+    resultados = ejecutar_trabajos(trabajos, args.workers, args.max_tareas_por_worker)
+    return 1 if imprimir_resumen(resultados, time.perf_counter() - inicio) else 0
+
+def comando_memoria(args):
+    """Diagnóstico de fugas: muchos informes en un proceso con la memoria residente plana"""
+    from ciclo_figuras import diagnostico_memoria
+
+    _inicializar_worker()
+    resultado = diagnostico_memoria(args.informe, args.equipo, parsear_jornadas(args.jornadas),
+                                    args.jornada_referencia, args.tipo_partido, args.repeticiones,
+                                    tolerancia_mb=args.tolerancia_mb)
+    return 0 if resultado and resultado['ok'] else 1
+
+def crear_parser():
+    parser = argparse.ArgumentParser(description="Ejecución por lotes de descargas e informes físicos")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    descargar = subparsers.add_parser('descargar', help="Descarga partidos nuevos de MediaCoach")
+    descargar.add_argument('--temporada', type=int, choices=[0, 1], default=0,
+                           help="0 = Temporada 24-25, 1 = Temporada 23-24")
+    descargar.add_argument('--competicion', type=int, choices=[0, 1], default=0,
+                           help="0 = La Liga, 1 = La Liga 2")
+    descargar.add_argument('--max-jornada', type=int, required=True,
+                           help="Descarga los partidos de jornadas anteriores a esta")
+    descargar.set_defaults(func=comando_descargar)
+
+    informes = subparsers.add_parser('informes', help="Genera informes físicos en PDF")
+    grupo_equipos = informes.add_mutually_exclusive_group(required=True)
+    grupo_equipos.add_argument('--equipos', nargs='+', help="Equipos (nombre tal como aparece en los datos)")
+    grupo_equipos.add_argument('--todos-equipos', action='store_true', help="Todos los equipos disponibles")
+    informes.add_argument('--jornadas', required=True, help="Rango o lista: 30-35, 30,32,35, J30-J35")
+    informes.add_argument('--informes', nargs='+', help=f"Por defecto todos: {', '.join(INFORMES)}")
+    informes.add_argument('--jornada-referencia', type=int,
+                          help="Jornada para posible 11 / últimos 4 partidos (por defecto la última)")
+    informes.add_argument('--tipo-partido', choices=['local', 'visitante'],
+                          help="Filtro de últimos 4 partidos (por defecto todos)")
+    informes.add_argument('--workers', type=int, default=1, help="Procesos en paralelo")
+    informes.add_argument('--max-tareas-por-worker', type=int, default=50,
+                          help="Trabajos por proceso antes de reciclarlo (acota la memoria)")
+    modo = informes.add_mutually_exclusive_group()
+    modo.add_argument('--cache', action='store_true',
+                      help="Reutilizar informes ya renderizados si no cambiaron código ni datos")
+    modo.add_argument('--borrador', action='store_true',
+                      help="PNG de baja resolución para revisar la selección (no genera los PDF)")
+    informes.set_defaults(func=comando_informes)
+
+    memoria = subparsers.add_parser('memoria', help="Comprueba que generar muchos informes no hace crecer la memoria")
+    memoria.add_argument('--informe', required=True, choices=list(INFORMES))
+    memoria.add_argument('--equipo', help="Equipo (no se usa en los informes del Villarreal CF)")
+    memoria.add_argument('--jornadas', required=True, help="Rango o lista: 30-35, 30,32,35, J30-J35")
+    memoria.add_argument('--jornada-referencia', type=int,
+                         help="Jornada para posible 11 / últimos 4 partidos (por defecto la última)")
+    memoria.add_argument('--tipo-partido', choices=['local', 'visitante'],
+                         help="Filtro de últimos 4 partidos (por defecto todos)")
+    memoria.add_argument('--repeticiones', type=int, default=500, help="Informes a generar")
+    memoria.add_argument('--tolerancia-mb', type=float, default=50,
+                         help="Crecimiento máximo de la memoria residente tras el calentamiento")
+    memoria.set_defaults(func=comando_memoria)
+
+    return parser
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,26 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.offsetbox import OffsetImage, AnnotationBbox
+from matplotlib.offsetbox import AnnotationBbox
 import numpy as np
 import os
 from difflib import SequenceMatcher
+from datos_compartidos import cargar_datos_limpios, cortes_liga, cortes_percentiles, nivel_percentil
+from asignacion_once import asignar_posiciones, matriz_puntuaciones
+from registro_assets import cargar_imagen, imagen_offset, ruta_escudo
+from ciclo_figuras import figuras_sin_pantalla
+from modo_borrador import guardar_borrador, resolucion_borrador
 import warnings
 warnings.filterwarnings('ignore')
 
 # Instalar mplsoccer si no está instalado
 try:
-    from mplsoccer import Pitch
+    from plantilla_campo import crear_figura_campo
 except ImportError:
     print("Instalando mplsoccer...")
     import subprocess
     subprocess.check_call(["pip", "install", "mplsoccer"])
-    from mplsoccer import Pitch
+    from plantilla_campo import crear_figura_campo
 
 class CampoFutbolReportCompleto:
     def __init__(self, data_path="prueba_extraccion/data/rendimiento_fisico.parquet"):
@@ -25,7 +30,6 @@ class CampoFutbolReportCompleto:
         self.data_path = data_path
         self.df = None
         self.load_data()
-        self.clean_team_names()
         
         # Mapeo exacto basado en las demarcaciones encontradas
         self.demarcacion_to_position = {
@@ -51,6 +55,16 @@ class CampoFutbolReportCompleto:
             'Portero': 'PORTERO'
         }
         
+        # Posiciones que puede cubrir un jugador si la suya ya está ocupada
+        self.posiciones_alternativas = {
+            'MC_BOX_TO_BOX': ['MC_POSICIONAL', 'BANDA_IZQUIERDA', 'BANDA_DERECHA'],
+            'MC_POSICIONAL': ['MC_BOX_TO_BOX'],
+            'BANDA_IZQUIERDA': ['MC_BOX_TO_BOX', 'LATERAL_IZQUIERDO'],
+            'BANDA_DERECHA': ['MC_BOX_TO_BOX', 'LATERAL_DERECHO'],
+            'DELANTERO_1': ['DELANTERO_2'],
+            'DELANTERO_2': ['DELANTERO_1'],
+        }
+        
         # Coordenadas mejoradas para evitar solapamientos (StatsBomb: 120x80)
         self.coordenadas_posiciones = {
             # Villarreal (lado izquierdo - ataca hacia la derecha)
@@ -83,6 +97,18 @@ class CampoFutbolReportCompleto:
             }
         }
         
+        # Métricas de las tarjetas de jugador (se muestran las 4 primeras disponibles)
+        self.metricas_tarjeta = [
+            'Distancia Total',
+            'Distancia Total / min',
+            'Distancia Total 14-21 km / h',
+            'Distancia Total >21 km / h',
+            'Velocidad Máxima Total',
+        ]
+        
+        # Niveles de color de menor a mayor percentil (cortes PERCENTILES_COLOR de datos_compartidos)
+        self.niveles_color = ['poor', 'below_average', 'average', 'good', 'excellent']
+        
         # Colores para diferentes rangos de métricas
         self.metric_colors = {
             'excellent': '#00ff00',    # Verde brillante
@@ -93,9 +119,9 @@ class CampoFutbolReportCompleto:
         }
         
     def load_data(self):
-        """Carga los datos del archivo parquet"""
+        """Carga los datos limpios del parquet (compartidos por los informes del proceso)"""
         try:
-            self.df = pd.read_parquet(self.data_path)
+            self.df = cargar_datos_limpios(self.data_path)
             print(f"✅ Datos cargados exitosamente: {self.df.shape[0]} filas, {self.df.shape[1]} columnas")
         except Exception as e:
             print(f"❌ Error al cargar los datos: {e}")
@@ -104,55 +130,6 @@ class CampoFutbolReportCompleto:
         """Calcula la similitud entre dos strings"""
         return SequenceMatcher(None, a.lower(), b.lower()).ratio()
     
-    def clean_team_names(self):
-        """Limpia y agrupa nombres de equipos similares"""
-        if self.df is None:
-            return
-        
-        # Limpiar nombres de equipos
-        unique_teams = self.df['Equipo'].unique()
-        team_mapping = {}
-        processed_teams = set()
-        
-        for team in unique_teams:
-            if team in processed_teams:
-                continue
-                
-            # Buscar equipos similares
-            similar_teams = [team]
-            for other_team in unique_teams:
-                if other_team != team and other_team not in processed_teams:
-                    if self.similarity(team, other_team) > 0.7:
-                        similar_teams.append(other_team)
-            
-            # Elegir el nombre más largo como representativo
-            canonical_name = max(similar_teams, key=len)
-            
-            # Mapear todos los nombres similares al canónico
-            for similar_team in similar_teams:
-                team_mapping[similar_team] = canonical_name
-                processed_teams.add(similar_team)
-        
-        # Aplicar el mapeo
-        self.df['Equipo'] = self.df['Equipo'].map(team_mapping)
-        
-        # Normalizar jornadas
-        def normalize_jornada(jornada):
-            if isinstance(jornada, str) and jornada.startswith('J'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            elif isinstance(jornada, str) and jornada.startswith('j'):
-                try:
-                    return int(jornada[1:])
-                except ValueError:
-                    return jornada
-            return jornada
-        
-        self.df['Jornada'] = self.df['Jornada'].apply(normalize_jornada)
-        print(f"✅ Limpieza completada. Equipos únicos: {len(self.df['Equipo'].unique())}")
-        
     def get_available_teams(self):
         """Retorna la lista de equipos disponibles"""
         if self.df is None:
@@ -247,24 +224,13 @@ class CampoFutbolReportCompleto:
         return filtered_df
     
     def load_team_logo(self, equipo):
-        """Carga el escudo del equipo"""
-        possible_names = [
-            equipo,
-            equipo.replace(' ', '_'),
-            equipo.replace(' ', ''),
-            equipo.lower(),
-            equipo.lower().replace(' ', '_'),
-            equipo.lower().replace(' ', '')
-        ]
-        
-        for name in possible_names:
-            logo_path = f"assets/escudos/{name}.png"
-            if os.path.exists(logo_path):
-                try:
-                    return plt.imread(logo_path)
-                except Exception as e:
-                    print(f"⚠️  Error al cargar escudo {logo_path}: {e}")
-                    continue
+        """Carga el escudo del equipo (ruta resuelta con el índice de assets/escudos)"""
+        logo_path = ruta_escudo(equipo)
+        if logo_path:
+            try:
+                return cargar_imagen(logo_path)
+            except Exception as e:
+                print(f"⚠️  Error al cargar escudo {logo_path}: {e}")
         
         print(f"⚠️  No se encontró el escudo para: {equipo}")
         return None
@@ -274,123 +240,80 @@ class CampoFutbolReportCompleto:
         if len(all_values) == 0:
             return self.metric_colors['average']
         
-        # Calcular percentiles
-        percentiles = np.percentile(all_values, [20, 40, 60, 80])
-        
-        if value >= percentiles[3]:  # Top 20%
-            return self.metric_colors['excellent']
-        elif value >= percentiles[2]:  # 60-80%
-            return self.metric_colors['good']
-        elif value >= percentiles[1]:  # 40-60%
-            return self.metric_colors['average']
-        elif value >= percentiles[0]:  # 20-40%
-            return self.metric_colors['below_average']
-        else:  # Bottom 20%
-            return self.metric_colors['poor']
+        # Top 20% excellent, 60-80% good, 40-60% average, 20-40% below_average, resto poor
+        nivel = nivel_percentil([value], cortes_percentiles(all_values))[0]
+        return self.metric_colors[self.niveles_color[nivel]]
     
-    def assign_positions_to_players(self, filtered_df, team_side):
-        """Asigna posiciones específicas a jugadores evitando solapamientos"""
-        player_positions = {}
-        
-        # Verificar si Alias está vacío y usar Nombre en su lugar
-        if 'Nombre' in filtered_df.columns:
-            mask_empty_alias = filtered_df['Alias'].isna() | (filtered_df['Alias'] == '') | (filtered_df['Alias'].str.strip() == '')
-            filtered_df.loc[mask_empty_alias, 'Alias'] = filtered_df.loc[mask_empty_alias, 'Nombre']
+    def get_metric_colors(self, team_data, referencia='equipo'):
+        """
+        Colores de las métricas de la tarjeta para todos los jugadores de una selección a la vez
         
-        # Ordenar jugadores por minutos jugados (descendente) para priorizar titulares
-        filtered_df_sorted = filtered_df.sort_values('Minutos jugados', ascending=False)
+        Args:
+            referencia: 'equipo' (percentiles de la propia selección, como get_metric_color) o
+                        'liga' (percentiles de la liga entre jugadores de la misma demarcación)
         
-        # Contadores para posiciones
-        position_counts = {pos: 0 for pos in self.coordenadas_posiciones[team_side].keys()}
-        max_players_per_position = 1  # Máximo 1 jugador por posición para evitar solapamientos
+        Returns:
+            DataFrame con el índice de team_data y un color por métrica de la tarjeta
+        """
+        paleta = np.array([self.metric_colors[nivel] for nivel in self.niveles_color])
+        colores = pd.DataFrame(index=team_data.index)
         
-        for _, player in filtered_df_sorted.iterrows():
-            player_name = player['Alias']
-            demarcacion = player.get('Demarcacion', 'Centrocampista - MC Box to Box')
-            
-            # Obtener posición base
-            base_position = self.demarcacion_to_position.get(demarcacion, 'MC_BOX_TO_BOX')
+        for metric in self.metricas_tarjeta:
+            if metric not in team_data.columns:
+                continue
+            valores = team_data[metric].to_numpy(dtype=float)
             
-            # Verificar si la posición está disponible
-            if position_counts[base_position] < max_players_per_position:
-                player_positions[player_name] = base_position
-                position_counts[base_position] += 1
+            if referencia == 'liga':
+                niveles = np.zeros(len(valores), dtype=int)
+                demarcaciones = team_data['Demarcacion'].to_numpy()
+                for demarcacion in pd.unique(demarcaciones):
+                    mask = demarcaciones == demarcacion
+                    niveles[mask] = nivel_percentil(valores[mask], cortes_liga(self.df, metric, demarcacion))
+            elif len(valores) == 0:
+                niveles = np.full(len(valores), self.niveles_color.index('average'))
             else:
-                # Buscar posición alternativa
-                alternative_found = False
-                
-                # Mapeo de posiciones alternativas
-                alternatives = {
-                    'MC_BOX_TO_BOX': ['MC_POSICIONAL', 'BANDA_IZQUIERDA', 'BANDA_DERECHA'],
-                    'MC_POSICIONAL': ['MC_BOX_TO_BOX'],
-                    'BANDA_IZQUIERDA': ['MC_BOX_TO_BOX', 'LATERAL_IZQUIERDO'],
-                    'BANDA_DERECHA': ['MC_BOX_TO_BOX', 'LATERAL_DERECHO'],
-                    'DELANTERO_1': ['DELANTERO_2'],
-                    'DELANTERO_2': ['DELANTERO_1'],
-                }
-                
-                if base_position in alternatives:
-                    for alt_pos in alternatives[base_position]:
-                        if position_counts[alt_pos] < max_players_per_position:
-                            player_positions[player_name] = alt_pos
-                            position_counts[alt_pos] += 1
-                            alternative_found = True
-                            break
-                
-                if not alternative_found:
-                    # Si no hay alternativas, usar la posición original (se solaparán)
-                    player_positions[player_name] = base_position
+                niveles = nivel_percentil(valores, cortes_percentiles(valores))
             
-            # Limitar a 11 jugadores por equipo
-            if len(player_positions) >= 11:
-                break
+            colores[metric] = paleta[niveles]
         
-        return player_positions
+        return colores
     
-    def create_modern_player_card(self, player_data, x, y, ax, team_color='blue', all_team_data=None):
+    def assign_positions_to_players(self, filtered_df, team_side):
+        """Asigna posiciones específicas a jugadores evitando solapamientos"""
+        # Un jugador por posición: asignación óptima por minutos en cada demarcación (asignacion_once)
+        posiciones = list(self.coordenadas_posiciones[team_side].keys())
+        puntuaciones = matriz_puntuaciones(
+            filtered_df, posiciones, self.demarcacion_to_position, self.posiciones_alternativas,
+            posicion_defecto='MC_BOX_TO_BOX', clave='Alias')
+        
+        return {player_name: posicion for posicion, player_name in asignar_posiciones(puntuaciones).items()}
+    
+    def create_modern_player_card(self, player_data, x, y, ax, team_color='blue', all_team_data=None, metric_colors=None):
         """Crea una tarjeta moderna de estadísticas para un jugador"""
         # Información básica del jugador
         nombre = player_data['Alias'] if pd.notna(player_data['Alias']) else 'N/A'
         dorsal = player_data.get('Dorsal', 'N/A')
         
+        # Colores de las métricas: precalculados para toda la selección (get_metric_colors) o,
+        # si no se pasan, respecto a all_team_data
+        if metric_colors is None:
+            if all_team_data is not None:
+                metric_colors = self.get_metric_colors(all_team_data).loc[player_data.name]
+            else:
+                metric_colors = {metric: self.metric_colors['average'] for metric in self.metricas_tarjeta}
+        
         # Métricas principales con colores dinámicos
         metrics = []
-        
-        # Calcular todos los valores del equipo para comparación
-        if all_team_data is not None:
-            dist_total_values = all_team_data['Distancia Total'].values if 'Distancia Total' in all_team_data else []
-            dist_min_values = all_team_data['Distancia Total / min'].values if 'Distancia Total / min' in all_team_data else []
-            dist_14_21_values = all_team_data['Distancia Total 14-21 km / h'].values if 'Distancia Total 14-21 km / h' in all_team_data else []
-            dist_21_plus_values = all_team_data['Distancia Total >21 km / h'].values if 'Distancia Total >21 km / h' in all_team_data else []
-            vmax_values = all_team_data['Velocidad Máxima Total'].values if 'Velocidad Máxima Total' in all_team_data else []
-        else:
-            dist_total_values = dist_min_values = dist_14_21_values = dist_21_plus_values = vmax_values = []
-        
-        # Crear métricas con colores
-        if 'Distancia Total' in player_data:
-            val = player_data['Distancia Total']
-            color = self.get_metric_color(val, 'distance', dist_total_values)
-            metrics.append((f"{val:.0f}m", color))
-        
-        if 'Distancia Total / min' in player_data:
-            val = player_data['Distancia Total / min']
-            color = self.get_metric_color(val, 'distance_min', dist_min_values)
-            metrics.append((f"{val:.0f} m/min", color))
-        
-        if 'Distancia Total 14-21 km / h' in player_data:
-            val = player_data['Distancia Total 14-21 km / h']
-            color = self.get_metric_color(val, 'distance_14_21', dist_14_21_values)
-            metrics.append((f"{val:.0f}m 14-21", color))
-        
-        if 'Distancia Total >21 km / h' in player_data:
-            val = player_data['Distancia Total >21 km / h']
-            color = self.get_metric_color(val, 'distance_21_plus', dist_21_plus_values)
-            metrics.append((f"{val:.0f}m >21", color))
-        
-        if 'Velocidad Máxima Total' in player_data:
-            val = player_data['Velocidad Máxima Total']
-            color = self.get_metric_color(val, 'vmax', vmax_values)
-            metrics.append((f"{val:.1f} km/h", color))
+        formatos = {
+            'Distancia Total': "{:.0f}m",
+            'Distancia Total / min': "{:.0f} m/min",
+            'Distancia Total 14-21 km / h': "{:.0f}m 14-21",
+            'Distancia Total >21 km / h': "{:.0f}m >21",
+            'Velocidad Máxima Total': "{:.1f} km/h",
+        }
+        for metric in self.metricas_tarjeta:
+            if metric in player_data:
+                metrics.append((formatos[metric].format(player_data[metric]), metric_colors[metric]))
         
         # Crear la tarjeta moderna
         card_width = 8
@@ -451,7 +374,7 @@ class CampoFutbolReportCompleto:
         
         # Escudo del equipo (más pequeño)
         if team_logo is not None:
-            imagebox = OffsetImage(team_logo, zoom=0.08)  # Más pequeño
+            imagebox = imagen_offset(team_logo, zoom=0.08)  # Más pequeño
             ab = AnnotationBbox(imagebox, (x_pos - table_width/2 + 3, y_pos + table_height/2 - 3), 
                               frameon=False)
             ax.add_artist(ab)
@@ -474,12 +397,12 @@ class CampoFutbolReportCompleto:
                     ha='center', va='center', transform=ax.transData)
             y_offset += 2
     
-    def create_visualization(self, equipo_rival, jornadas, figsize=(24, 16)):
+    def create_visualization(self, equipo_rival, jornadas, figsize=(24, 16), referencia_color='equipo'):
         """Crea la visualización completa moderna en el campo de fútbol SIN MÁRGENES"""
         
         # Crear campo de fútbol
-        pitch = Pitch(pitch_color='grass', line_color='white', stripe=True, linewidth=3)
-        fig, ax = pitch.draw(figsize=figsize)
+        fig, ax = crear_figura_campo(figsize, tight_layout=True,
+                                     pitch_color='grass', line_color='white', stripe=True, linewidth=3)
         
         # ✅ ELIMINAR TODOS LOS ESPACIOS Y MÁRGENES
         fig.subplots_adjust(left=0, right=1, top=1, bottom=0)
@@ -512,13 +435,13 @@ class CampoFutbolReportCompleto:
         # Posicionar escudos según especificaciones (dentro del campo)
         # Villarreal: arriba a la izquierda
         if villarreal_logo is not None:
-            imagebox = OffsetImage(villarreal_logo, zoom=0.12)
+            imagebox = imagen_offset(villarreal_logo, zoom=0.12)
             ab = AnnotationBbox(imagebox, (15, 70), frameon=False)
             ax.add_artist(ab)
         
         # Rival: abajo a la derecha  
         if rival_logo is not None:
-            imagebox = OffsetImage(rival_logo, zoom=0.12)
+            imagebox = imagen_offset(rival_logo, zoom=0.12)
             ab = AnnotationBbox(imagebox, (105, 10), frameon=False)
             ax.add_artist(ab)
         
@@ -526,8 +449,12 @@ class CampoFutbolReportCompleto:
         villarreal_positions = self.assign_positions_to_players(villarreal_data, 'villarreal')
         rival_positions = self.assign_positions_to_players(rival_data, 'rival')
         
+        # Colores de las métricas de todas las tarjetas, una vez por equipo
+        villarreal_colors = self.get_metric_colors(villarreal_data, referencia_color)
+        rival_colors = self.get_metric_colors(rival_data, referencia_color)
+        
         # Colocar jugadores del Villarreal con tarjetas modernas
-        for _, player in villarreal_data.iterrows():
+        for idx, player in villarreal_data.iterrows():
             player_name = player['Alias']
             if player_name in villarreal_positions:
                 position = villarreal_positions[player_name]
@@ -535,10 +462,11 @@ class CampoFutbolReportCompleto:
                     x, y = self.coordenadas_posiciones['villarreal'][position]
                     self.create_modern_player_card(player, x, y, ax, 
                                                  team_color='#FFD700',  # Amarillo Villarreal
-                                                 all_team_data=villarreal_data)
+                                                 all_team_data=villarreal_data,
+                                                 metric_colors=villarreal_colors.loc[idx])
         
         # Colocar jugadores del equipo rival con tarjetas modernas
-        for _, player in rival_data.iterrows():
+        for idx, player in rival_data.iterrows():
             player_name = player['Alias']
             if player_name in rival_positions:
                 position = rival_positions[player_name]
@@ -546,7 +474,8 @@ class CampoFutbolReportCompleto:
                     x, y = self.coordenadas_posiciones['rival'][position]
                     self.create_modern_player_card(player, x, y, ax, 
                                                  team_color='#cc3300',  # Rojo rival
-                                                 all_team_data=rival_data)
+                                                 all_team_data=rival_data,
+                                                 metric_colors=rival_colors.loc[idx])
         
         # Resúmenes modernos de equipo con escudos (ajustados para campo completo)
         self.create_modern_team_summary(villarreal_data, ax, 30, 15, 'Villarreal CF', 
@@ -667,11 +596,12 @@ def main_campo_futbol():
         import traceback
         traceback.print_exc()
 
-def generar_reporte_campo_personalizado(equipo_rival, jornadas, mostrar=True, guardar=True):
+def generar_reporte_campo_personalizado(equipo_rival, jornadas, mostrar=True, guardar=True, borrador=False):
     """Función para generar un reporte personalizado sin márgenes"""
     try:
         report_generator = CampoFutbolReportCompleto()
-        fig = report_generator.create_visualization(equipo_rival, jornadas)
+        with resolucion_borrador(borrador), figuras_sin_pantalla(not mostrar):
+            fig = report_generator.create_visualization(equipo_rival, jornadas)
         
         if fig:
             if mostrar:
@@ -682,6 +612,10 @@ def generar_reporte_campo_personalizado(equipo_rival, jornadas, mostrar=True, gu
                 equipo_filename = equipo_rival.replace(' ', '_').replace('/', '_')
                 output_path = f"reporte_campo_completo_Villarreal_vs_{equipo_filename}.pdf"
                 
+                if borrador:
+                    guardar_borrador(fig, output_path)
+                    return fig
+                
                 # ✅ GUARDAR SIN MÁRGENES NI ESPACIOS
                 fig.savefig(output_path, 
                            bbox_inches='tight', pad_inches=0, 
@@ -0,0 +1,45 @@
+import os
+from contextlib import contextmanager
+
+import matplotlib.pyplot as plt
+
+import registro_assets
+from registro_assets import establecer_dpi_objetivo
+
+# Modo borrador de los informes (generar_*(..., borrador=True)): para revisar una selección
+# antes de generar el PDF final. La figura se construye con escudos reducidos a DPI_BORRADOR y se
+# guarda como PNG a esa resolución, sin transparencia, sin pasada de bbox 'tight' y con compresión
+# PNG mínima. El modo final (por defecto) no cambia: PDF a 300 dpi.
+DPI_BORRADOR = 72
+
+@contextmanager
+def resolucion_borrador(activo=True):
+    """Mientras está activo, las imágenes de la figura se dimensionan para DPI_BORRADOR"""
+    if not activo:
+        yield
+        return
+
+    dpi_anterior = registro_assets.DPI_OBJETIVO
+    establecer_dpi_objetivo(DPI_BORRADOR)
+    try:
+        yield
+    finally:
+        establecer_dpi_objetivo(dpi_anterior)
+
+def ruta_borrador(output_path):
+    """reporte_X.pdf -> reporte_X_borrador.png"""
+    return f"{os.path.splitext(output_path)[0]}_borrador.png"
+
+def escribir_borrador(fig, destino):
+    """Escribe el PNG de borrador en una ruta o en un archivo abierto (BytesIO)"""
+    # Los informes fijan savefig.bbox='tight' y savefig.transparent=True de forma global
+    with plt.rc_context({'savefig.bbox': 'standard'}):
+        fig.savefig(destino, format='png', dpi=DPI_BORRADOR, transparent=False, facecolor='white',
+                    edgecolor='none', pil_kwargs={'compress_level': 1})
+
+def guardar_borrador(fig, output_path):
+    """Guarda la figura como PNG de baja resolución junto a la ruta del informe final"""
+    ruta = ruta_borrador(output_path)
+    escribir_borrador(fig, ruta)
+    print(f"📝 Borrador guardado como: {ruta}")
+    return ruta
@@ -0,0 +1,144 @@
+"""
+Paquete prepartido: todos los informes físicos de un rival en un único PDF multipágina.
+
+Los informes se generan en un solo proceso, así que el parquet se lee y limpia una vez
+(datos_compartidos.cargar_datos_limpios) y cada escudo/fondo se decodifica una sola vez.
+Al terminar se muestra el tiempo de cada informe (figura + página PDF).
+
+Ejemplos:
+    python paquete_prepartido.py --rival "Sevilla FC" --jornadas 31-35
+    python paquete_prepartido.py --rival "Sevilla FC" --jornadas 31-35 --jornada-referencia 35 --tipo-partido local
+    python paquete_prepartido.py --rival "Sevilla FC" --jornadas 33-35 --informes minutos velocidades posible_11
+"""
+import argparse
+import os
+import sys
+import time
+
+from registro_informes import INFORMES, cargar_generador, ejecutar_informe, guardar_pagina_pdf
+
+DIRECTORIO_INFORMES = os.path.dirname(os.path.abspath(__file__))
+
+def precargar_informes(informes):
+    """Importa los módulos de los informes (la primera importación carga y limpia los datos)"""
+    inicio = time.perf_counter()
+    for informe in informes:
+        cargar_generador(informe)
+    return time.perf_counter() - inicio
+
+def generar_paquete(rival, jornadas, jornada_referencia=None, tipo_partido=None, informes=None,
+                    output_path=None):
+    """
+    Genera los informes seleccionados y los une en un PDF multipágina
+
+    Args:
+        rival (str): Equipo rival
+        jornadas (list): Jornadas a incluir
+        jornada_referencia (int): Jornada para posible 11 / últimos 4 partidos (por defecto max(jornadas))
+        tipo_partido (str): 'local', 'visitante' o None (solo últimos 4 partidos)
+        informes (list): Ids de INFORMES (por defecto todos, en el orden del registro)
+        output_path (str): Ruta del PDF (por defecto paquete_prepartido_<rival>_J<ref>.pdf)
+
+    Returns:
+        tuple: (ruta del PDF o None, lista de resultados por informe)
+    """
+    from ciclo_figuras import liberar_figura
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    informes = informes or list(INFORMES)
+    if jornada_referencia is None:
+        jornada_referencia = max(jornadas)
+    if output_path is None:
+        rival_filename = rival.replace(' ', '_').replace('/', '_')
+        output_path = f"paquete_prepartido_{rival_filename}_J{jornada_referencia}.pdf"
+
+    segundos_precarga = precargar_informes(informes)
+    print(f"📦 Módulos y datos precargados en {segundos_precarga:.1f}s")
+
+    resultados = []
+    paginas = 0
+    with PdfPages(output_path) as pdf:
+        for informe in informes:
+            print(f"🔄 {informe}...")
+            inicio = time.perf_counter()
+            fig, error = None, None
+            try:
+                fig = ejecutar_informe(informe, rival, jornadas, jornada_referencia, tipo_partido,
+                                       mostrar=False, guardar=False)
+                if fig is None:
+                    error = 'Sin datos para la selección'
+            except Exception as e:
+                error = str(e)
+            segundos_figura = time.perf_counter() - inicio
+
+            segundos_pdf = 0.0
+            if fig is not None:
+                inicio = time.perf_counter()
+                try:
+                    guardar_pagina_pdf(pdf, fig, informe)
+                    paginas += 1
+                except Exception as e:
+                    error = f"Error guardando página: {e}"
+                finally:
+                    liberar_figura(fig)
+                segundos_pdf = time.perf_counter() - inicio
+
+            resultados.append({
+                'informe': informe,
+                'ok': error is None,
+                'error': error,
+                'segundos_figura': segundos_figura,
+                'segundos_pdf': segundos_pdf,
+            })
+
+    if paginas == 0:
+        os.remove(output_path)
+        output_path = None
+
+    return output_path, resultados
+
+def imprimir_resumen(output_path, resultados):
+    """Muestra el tiempo por informe y devuelve el número de fallos"""
+    fallos = [r for r in resultados if not r['ok']]
+    total = sum(r['segundos_figura'] + r['segundos_pdf'] for r in resultados)
+
+    print(f"\n=== PAQUETE PREPARTIDO: {len(resultados) - len(fallos)}/{len(resultados)} informes ===")
+    print(f"  {'informe':<22} {'figura':>8} {'pdf':>8} {'total':>8}")
+    for r in resultados:
+        estado = '✅' if r['ok'] else '❌'
+        detalle = f"  {r['error']}" if r['error'] else ''
+        print(f"{estado} {r['informe']:<22} {r['segundos_figura']:7.1f}s {r['segundos_pdf']:7.1f}s "
+              f"{r['segundos_figura'] + r['segundos_pdf']:7.1f}s{detalle}")
+    print(f"  Tiempo total de render: {total:.1f}s")
+
+    if output_path:
+        print(f"✅ Paquete guardado como: {output_path}")
+    else:
+        print("❌ No se generó ninguna página")
+    return len(fallos)
+
+def main(argv=None):
+    from lote_informes import parsear_jornadas
+
+    parser = argparse.ArgumentParser(description="Paquete prepartido con todos los informes físicos de un rival")
+    parser.add_argument('--rival', required=True, help="Equipo rival (nombre tal como aparece en los datos)")
+    parser.add_argument('--jornadas', required=True, help="Rango o lista: 30-35, 30,32,35, J30-J35")
+    parser.add_argument('--jornada-referencia', type=int,
+                        help="Jornada para posible 11 / últimos 4 partidos (por defecto la última)")
+    parser.add_argument('--tipo-partido', choices=['local', 'visitante'],
+                        help="Filtro de últimos 4 partidos (por defecto todos)")
+    parser.add_argument('--informes', nargs='+', choices=list(INFORMES),
+                        help="Subconjunto de informes (por defecto todos)")
+    parser.add_argument('--salida', help="Ruta del PDF combinado")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    os.chdir(DIRECTORIO_INFORMES)
+
+    output_path, resultados = generar_paquete(args.rival, parsear_jornadas(args.jornadas),
+                                              args.jornada_referencia, args.tipo_partido,
+                                              args.informes, args.salida)
+    return 1 if imprimir_resumen(output_path, resultados) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
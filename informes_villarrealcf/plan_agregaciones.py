@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+
+from datos_compartidos import normalize_jornada, rellenar_demarcaciones
+
+# Agregados por jugador de los informes de campo (promedios, comparación, velocidad máxima y
+# máximos). Cada informe declara su especificación en lugar de recorrer sus jugadores:
+#   'umbral_minutos': los partidos con al menos estos minutos son las filas 'umbral'
+#   'registro': filas ('umbral' o 'todas') de las que sale el registro más reciente del jugador
+#               (Id Jugador, Dorsal, Nombre, Alias, Equipo); la demarcación es la moda en 'umbral'
+#   'metricas': columna de salida -> (fuente, agregación, filas)
+#       fuente: columna de los datos, o tupla de columnas que se suman fila a fila (NaN = 0)
+#       agregación: 'sum', 'mean' o 'max' (NaN no cuenta; una columna que no existe vale 0)
+#       filas: 'umbral' o 'todas'
+# Solo salen los jugadores con al menos un partido 'umbral'. Los informes registran su
+# especificación al importarse; la primera vez que se pide una selección (equipos, jornadas) se
+# filtra y se rellenan las demarcaciones una vez, y planificar() fusiona las métricas de todos los
+# informes registrados en un único groupby por (equipo, jugador, demarcación) con agregados
+# parciales (sumas, conteos, máximos). Cada informe recibe después su parte sin volver a recorrer
+# las filas, así que un paquete con los cuatro informes de campo hace una sola pasada.
+_ESPECIFICACIONES = {}
+_SELECCIONES = {}
+MAX_SELECCIONES = 8
+
+AGREGACIONES = ('sum', 'mean', 'max')
+FILAS = ('umbral', 'todas')
+COLUMNAS_REGISTRO = ['Id Jugador', 'Dorsal', 'Nombre', 'Alias']
+
+# Cómo se combinan los agregados parciales de cada demarcación en el total del jugador
+_COMBINAR = {'sum': 'sum', 'count': 'sum', 'max': 'max'}
+
+def registrar_especificacion(informe, especificacion):
+    """Registra la especificación de un informe para fusionarla con las demás en cada selección"""
+    if especificacion['registro'] not in FILAS:
+        raise ValueError(f"Filas de registro desconocidas en {informe}: {especificacion['registro']}")
+    for nombre, (_, agregacion, filas) in especificacion['metricas'].items():
+        if agregacion not in AGREGACIONES or filas not in FILAS:
+            raise ValueError(f"Métrica no soportada en {informe}: {nombre} ({agregacion}, {filas})")
+    _ESPECIFICACIONES[informe] = especificacion
+    return especificacion
+
+def _clave_especificacion(especificacion):
+    return (especificacion['umbral_minutos'], especificacion['registro'],
+            tuple(especificacion['metricas'].items()))
+
+def planificar(especificaciones):
+    """
+    Agregados parciales que necesita un lote de especificaciones, sin repetir
+
+    Returns:
+        dict: (fuente, umbral o None si son todas las filas) -> agregados parciales ('sum',
+              'count', 'max'); una media se calcula como suma / conteo
+    """
+    plan = {}
+    for especificacion in especificaciones:
+        for fuente, agregacion, filas in especificacion['metricas'].values():
+            umbral = especificacion['umbral_minutos'] if filas == 'umbral' else None
+            parciales = plan.setdefault((fuente, umbral), [])
+            for parcial in (('sum', 'count') if agregacion == 'mean' else (agregacion,)):
+                if parcial not in parciales:
+                    parciales.append(parcial)
+    return plan
+
+def _valores(seleccion, fuente):
+    """Valores de una fuente por fila (una columna o la suma de varias)"""
+    if isinstance(fuente, tuple):
+        total = pd.Series(0.0, index=seleccion.index)
+        for columna in fuente:
+            if columna in seleccion.columns:
+                total = total + pd.to_numeric(seleccion[columna], errors='coerce').fillna(0)
+        return total
+    if fuente not in seleccion.columns:
+        return pd.Series(0.0, index=seleccion.index)
+    return seleccion[fuente]
+
+def _agregar_lote(seleccion, especificaciones):
+    """Agregados de varias especificaciones con un solo groupby sobre las filas de la selección"""
+    minutos = seleccion['Minutos jugados']
+    umbrales = sorted({e['umbral_minutos'] for e in especificaciones.values()})
+    posicion = pd.Series(np.arange(len(seleccion), dtype=float), index=seleccion.index)
+
+    # Columnas de la pasada: conteo de partidos y última fila por umbral, y cada fuente del plan
+    columnas = {'ultima': posicion}
+    agregaciones = {'ultima': ['max']}
+    for umbral in umbrales:
+        en_umbral = minutos >= umbral
+        columnas[f'partidos_{umbral}'] = en_umbral.astype(int)
+        agregaciones[f'partidos_{umbral}'] = ['sum']
+        columnas[f'ultima_{umbral}'] = posicion.where(en_umbral)
+        agregaciones[f'ultima_{umbral}'] = ['max']
+
+    plan = planificar(especificaciones.values())
+    nombres = {}
+    for i, ((fuente, umbral), parciales) in enumerate(plan.items()):
+        valores = _valores(seleccion, fuente)
+        nombres[(fuente, umbral)] = f'm{i}'
+        columnas[f'm{i}'] = valores if umbral is None else valores.where(minutos >= umbral)
+        agregaciones[f'm{i}'] = parciales
+
+    claves = [seleccion['Equipo'], seleccion['Alias'], seleccion['Demarcacion']]
+    parciales = pd.DataFrame(columnas).groupby(claves, sort=False, dropna=False).agg(agregaciones)
+    por_jugador = parciales.groupby(level=[0, 1], sort=False).agg(
+        {columna: _COMBINAR[columna[1]] for columna in parciales.columns})
+
+    resultados = {}
+    for clave, especificacion in especificaciones.items():
+        umbral = especificacion['umbral_minutos']
+        jugadores = por_jugador[por_jugador[(f'partidos_{umbral}', 'sum')] > 0]
+
+        # Demarcación: la más repetida en los partidos 'umbral' (empates: la primera alfabéticamente)
+        conteos = parciales[(f'partidos_{umbral}', 'sum')].rename('n').reset_index()
+        conteos.columns = ['Equipo', 'Alias', 'Demarcacion', 'n']
+        conteos = conteos[conteos['n'] > 0].sort_values(['n', 'Demarcacion'], ascending=[False, True], kind='stable')
+        moda = conteos.drop_duplicates(['Equipo', 'Alias']).set_index(['Equipo', 'Alias'])['Demarcacion']
+
+        ultima = 'ultima' if especificacion['registro'] == 'todas' else f'ultima_{umbral}'
+        registro = seleccion.iloc[jugadores[(ultima, 'max')].to_numpy().astype(int)]
+
+        datos = {columna: registro[columna].to_numpy() for columna in COLUMNAS_REGISTRO}
+        datos['Demarcacion'] = moda.reindex(jugadores.index).fillna(
+            pd.Series(registro['Demarcacion'].to_numpy(), index=jugadores.index)).to_numpy()
+        datos['Equipo'] = registro['Equipo'].to_numpy()
+        for nombre, (fuente, agregacion, filas) in especificacion['metricas'].items():
+            columna = nombres[(fuente, umbral if filas == 'umbral' else None)]
+            if agregacion == 'mean':
+                datos[nombre] = (jugadores[(columna, 'sum')] / jugadores[(columna, 'count')]).to_numpy()
+            else:
+                datos[nombre] = jugadores[(columna, agregacion)].to_numpy()
+        tabla = pd.DataFrame(datos)
+
+        equipos = jugadores.index.get_level_values(0)
+        resultados[clave] = {
+            equipo: tabla[equipos == equipo].reset_index(drop=True)
+            for equipo in pd.unique(seleccion['Equipo'])
+        }
+    return resultados
+
+def agregar_seleccion(df, equipos, jornadas, especificacion):
+    """
+    Agregados por jugador de una especificación en cada equipo de la selección
+
+    La selección (filtro por equipos y jornadas, demarcaciones rellenas) y los agregados de todas
+    las especificaciones registradas se calculan una vez y se reutilizan (hasta MAX_SELECCIONES).
+
+    Returns:
+        dict: equipo -> DataFrame con una fila por jugador (orden de aparición) y las columnas
+              del registro, 'Demarcacion', 'Equipo' y las métricas; None si el equipo no tiene
+              jugadores con partidos sobre el umbral
+    """
+    equipos = tuple(equipos)
+    jornadas = tuple(normalize_jornada(j) for j in jornadas)
+    clave = (id(df), equipos, jornadas)
+    entrada = _SELECCIONES.get(clave)
+    if entrada is None or entrada[0] is not df:
+        seleccion = df[df['Equipo'].isin(equipos) & df['Jornada'].isin(jornadas)]
+        seleccion = rellenar_demarcaciones(df, seleccion)
+        if len(_SELECCIONES) >= MAX_SELECCIONES:
+            _SELECCIONES.pop(next(iter(_SELECCIONES)))
+        entrada = (df, seleccion, {})
+        _SELECCIONES[clave] = entrada
+    _, seleccion, resultados = entrada
+
+    # La especificación pedida y las registradas que aún no se han calculado, en la misma pasada
+    clave_especificacion = _clave_especificacion(especificacion)
+    if clave_especificacion not in resultados:
+        pendientes = {clave_especificacion: especificacion}
+        for registrada in _ESPECIFICACIONES.values():
+            clave_registrada = _clave_especificacion(registrada)
+            if clave_registrada not in resultados:
+                pendientes[clave_registrada] = registrada
+        resultados.update(_agregar_lote(seleccion, pendientes))
+
+    por_equipo = resultados[clave_especificacion]
+    return {
+        equipo: (por_equipo[equipo].copy() if equipo in por_equipo and len(por_equipo[equipo]) else None)
+        for equipo in equipos
+    }
@@ -0,0 +1,133 @@
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.figure import Figure
+from matplotlib.patches import Arc
+from mplsoccer import Pitch
+
+from ciclo_figuras import nueva_figura_ejes
+
+# Plantillas de campo compartidas por todos los informes del proceso.
+# El Pitch de mplsoccer se dibuja una sola vez por configuración en una figura auxiliar y se
+# guardan sus piezas en coordenadas de datos: el césped (ruido + rayas ya generados) y las líneas
+# agrupadas en colecciones. Cada campo nuevo solo clona esas piezas en su ax (unos pocos
+# artistas en lugar de generar ruido 1000x1000, rayas y ~20 líneas/parches), así que un campo
+# adicional cuesta prácticamente lo mismo que las tablas y gráficos que se le superponen.
+# El césped se dibuja sin interpolar: al guardar no se remuestrea a la resolución de salida (ruido
+# de 1000x1000 ampliado ~3.6x, que con 'auto' ya es vecino más próximo) y el PDF incrusta la matriz
+# original. Era la mayor parte del tiempo de guardado y del tamaño de los informes con campos.
+_PLANTILLAS = {}
+
+def _clave(kwargs_pitch):
+    return tuple(sorted(kwargs_pitch.items()))
+
+def _extraer_plantilla(kwargs_pitch):
+    """Dibuja el Pitch en una figura auxiliar y extrae sus piezas"""
+    fig = Figure()
+    ax = fig.add_subplot()
+    Pitch(**kwargs_pitch).draw(ax=ax)
+
+    imagenes = []
+    for imagen in ax.images:
+        imagenes.append({
+            'datos': imagen.get_array(),
+            'cmap': imagen.get_cmap(),
+            'clim': imagen.get_clim(),
+            'extent': imagen.get_extent(),
+            'origin': imagen.origin,
+            'zorder': imagen.get_zorder(),
+            'alpha': imagen.get_alpha(),
+        })
+
+    # Líneas rectas agrupadas por estilo en LineCollection
+    lineas = {}
+    for linea in ax.lines:
+        estilo = (linea.get_color(), linea.get_linewidth(), linea.get_zorder(),
+                  linea.get_solid_capstyle(), linea.get_alpha())
+        lineas.setdefault(estilo, []).append(linea.get_xydata())
+
+    # Parches cerrados (círculo central, puntos de penalti...) como trayectorias en coordenadas
+    # de datos; los arcos se recrean porque Arc recorta su trazo al dibujarse
+    trayectorias = {}
+    arcos = []
+    for parche in ax.patches:
+        estilo = {
+            'edgecolor': parche.get_edgecolor(),
+            'facecolor': parche.get_facecolor() if parche.get_fill() else 'none',
+            'linewidth': parche.get_linewidth(),
+            'zorder': parche.get_zorder(),
+            'alpha': parche.get_alpha(),
+        }
+        if isinstance(parche, Arc):
+            arcos.append({
+                'xy': parche.center, 'width': parche.width, 'height': parche.height,
+                'angle': parche.angle, 'theta1': parche.theta1, 'theta2': parche.theta2,
+                **estilo,
+            })
+        else:
+            trayectoria = parche.get_patch_transform().transform_path(parche.get_path())
+            clave_estilo = tuple((k, str(v)) for k, v in estilo.items())
+            trayectorias.setdefault(clave_estilo, (estilo, []))[1].append(trayectoria)
+
+    plantilla = {
+        'xlim': ax.get_xlim(),
+        'ylim': ax.get_ylim(),
+        'aspect': ax.get_aspect(),
+        'facecolor': ax.get_facecolor(),
+        'imagenes': imagenes,
+        'lineas': lineas,
+        'trayectorias': list(trayectorias.values()),
+        'arcos': arcos,
+    }
+    fig.clear()
+    return plantilla
+
+def plantilla_campo(**kwargs_pitch):
+    """Piezas del campo para unos parámetros de Pitch (extraídas una vez por proceso)"""
+    clave = _clave(kwargs_pitch)
+    if clave not in _PLANTILLAS:
+        _PLANTILLAS[clave] = _extraer_plantilla(kwargs_pitch)
+    return _PLANTILLAS[clave]
+
+def dibujar_campo(ax, **kwargs_pitch):
+    """
+    Dibuja en ax el campo de la plantilla, equivalente a Pitch(**kwargs_pitch).draw(ax=ax)
+
+    Returns:
+        dict: La plantilla usada (límites, piezas)
+    """
+    plantilla = plantilla_campo(**kwargs_pitch)
+
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    ax.grid(False)
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_facecolor(plantilla['facecolor'])
+
+    for imagen in plantilla['imagenes']:
+        ax.imshow(imagen['datos'], cmap=imagen['cmap'], clim=imagen['clim'], extent=imagen['extent'],
+                  origin=imagen['origin'], interpolation='none', zorder=imagen['zorder'],
+                  alpha=imagen['alpha'], aspect=plantilla['aspect'])
+
+    for (color, linewidth, zorder, capstyle, alpha), segmentos in plantilla['lineas'].items():
+        ax.add_collection(LineCollection(segmentos, colors=color, linewidths=linewidth, zorder=zorder,
+                                         capstyle=capstyle, alpha=alpha), autolim=False)
+
+    for estilo, trayectorias in plantilla['trayectorias']:
+        ax.add_collection(PathCollection(trayectorias, edgecolors=estilo['edgecolor'],
+                                         facecolors=estilo['facecolor'], linewidths=estilo['linewidth'],
+                                         zorder=estilo['zorder'], alpha=estilo['alpha']), autolim=False)
+
+    for arco in plantilla['arcos']:
+        ax.add_patch(Arc(**arco))
+
+    ax.set_xlim(*plantilla['xlim'])
+    ax.set_ylim(*plantilla['ylim'])
+    ax.set_aspect(plantilla['aspect'])
+    return plantilla
+
+def crear_figura_campo(figsize, tight_layout=False, **kwargs_pitch):
+    """Figura nueva con el campo de la plantilla, equivalente a Pitch(...).draw(figsize=..., tight_layout=...)"""
+    fig, ax = nueva_figura_ejes(figsize)
+    fig.set_layout_engine('tight' if tight_layout else 'none')
+    dibujar_campo(ax, **kwargs_pitch)
+    return fig, ax
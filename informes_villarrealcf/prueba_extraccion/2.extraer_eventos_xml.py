@@ -1,4 +1,5 @@
 import os
+import sys
 import xml.etree.ElementTree as ET
 import pandas as pd
 import glob
@@ -140,8 +141,8 @@ def parse_xml_file(xml_file_path, jornada, partido):
     
     return data
 
-def procesar_partidos():
-    """Procesa todos los partidos y crea el archivo parquet"""
+def procesar_partidos(solo_carpetas=None):
+    """Procesa todos los partidos (o solo las carpetas indicadas) y crea el archivo parquet"""
     base_path = "VCF_Mediacoach_Data/Temporada_24_25/La_Liga/Partidos"
     output_path = "data/eventos_partido.parquet"
     
@@ -159,6 +160,8 @@ def procesar_partidos():
         return
     
     carpetas = os.listdir(base_path)
+    if solo_carpetas:
+        carpetas = [c for c in carpetas if c in solo_carpetas]
     print(f"📁 Encontradas {len(carpetas)} elementos en {base_path}")
     
     carpetas_procesadas = 0
@@ -288,4 +291,5 @@ def procesar_partidos():
     print(f"Archivo guardado: {output_path} con {len(combined_df)} registros")
 
 if __name__ == "__main__":
-    procesar_partidos()
\ No newline at end of file
+    # Opcional: nombres de carpeta como argumentos para procesar solo esos partidos
+    procesar_partidos(sys.argv[1:] or None)
\ No newline at end of file
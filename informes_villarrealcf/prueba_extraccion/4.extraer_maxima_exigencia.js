@@ -363,9 +363,12 @@ async function main() {
     console.log('-'.repeat(70));
     
     // Buscar carpetas de partidos
+    // Opcional: nombres de carpeta como argumentos para procesar solo esos partidos
+    const soloCarpetas = process.argv.slice(2);
     const carpetas = fs.readdirSync(BASE_PATH).filter(item => {
         const carpetaPath = path.join(BASE_PATH, item);
-        return fs.statSync(carpetaPath).isDirectory();
+        return fs.statSync(carpetaPath).isDirectory() &&
+            (soloCarpetas.length === 0 || soloCarpetas.includes(item));
     });
     
     console.log(`📁 Carpetas de partidos encontradas: ${carpetas.length}`);
@@ -1,5 +1,6 @@
 import pandas as pd
 import os
+import sys
 import glob
 from pathlib import Path
 import logging
@@ -153,9 +154,9 @@ def combinar_y_deduplicar(df_nuevo, df_existente):
     
     return df_sin_duplicados
 
-def procesar_datos_vcf():
+def procesar_datos_vcf(solo_carpetas=None):
     """
-    Función principal para procesar todos los datos
+    Función principal para procesar todos los datos (o solo las carpetas indicadas)
     """
     ruta_base = "VCF_Mediacoach_Data/Temporada_24_25/La_Liga/Partidos"
     
@@ -177,6 +178,8 @@ def procesar_datos_vcf():
     
     # Buscar todas las carpetas de partidos
     carpetas_partidos = [d for d in os.listdir(ruta_base) if os.path.isdir(os.path.join(ruta_base, d))]
+    if solo_carpetas:
+        carpetas_partidos = [d for d in carpetas_partidos if d in solo_carpetas]
     logger.info(f"Encontradas {len(carpetas_partidos)} carpetas de partidos")
     
     partidos_procesados = 0
@@ -251,7 +254,8 @@ def procesar_datos_vcf():
 
 if __name__ == "__main__":
     try:
-        procesar_datos_vcf()
+        # Opcional: nombres de carpeta como argumentos para procesar solo esos partidos
+        procesar_datos_vcf(sys.argv[1:] or None)
         print("✅ Procesamiento completado exitosamente")
     except Exception as e:
         logger.error(f"Error en el procesamiento: {e}")
@@ -0,0 +1,91 @@
+import os
+import re
+import pandas as pd
+
+# Agregados que se actualizan partido a partido tras la ingesta de una carpeta nueva.
+# Cada actualizador recibe el nombre de carpeta (j<jornada>_<partido>) y solo toca las filas de ese partido.
+RENDIMIENTO_PATH = 'data/rendimiento_fisico.parquet'
+CUBO_EQUIPO_JORNADA_PATH = 'data/cubo_equipo_jornada.parquet'
+
+COLUMNAS_SUMA = [
+    'Minutos jugados',
+    'Distancia Total',
+    'Distancia Total 14-21 km / h',
+    'Distancia Total  21-24 km / h',
+    'Distancia Total >21 km / h',
+    'Distancia Total >24 km / h',
+]
+COLUMNAS_MAXIMO = ['Velocidad Máxima Total']
+
+ACTUALIZADORES_AGREGADOS = []
+
+def registrar_actualizador(funcion):
+    """Decorador: añade una función actualizador(carpeta) a los agregados de la ingesta"""
+    ACTUALIZADORES_AGREGADOS.append(funcion)
+    return funcion
+
+def jornada_partido_desde_carpeta(carpeta):
+    """'j5_sevillafc-villarrealcf' -> ('j5', 'sevillafc-villarrealcf'), igual que los extractores"""
+    jornada_match = re.match(r'^(j\d+)', carpeta, re.IGNORECASE)
+    jornada = jornada_match.group(1) if jornada_match else None
+    partido = carpeta.split('_', 1)[1] if '_' in carpeta else None
+    return jornada, partido
+
+def guardar_parquet_atomico(df, ruta):
+    """Escribe el parquet en un temporal y lo sustituye de golpe (los lectores nunca ven un archivo a medias)"""
+    ruta_tmp = ruta + '.tmp'
+    df.to_parquet(ruta_tmp, index=False)
+    os.replace(ruta_tmp, ruta)
+
+def leer_filas_partido(ruta, jornada, partido, columnas=None):
+    """Lee del parquet solo las filas de un partido (filtro aplicado por pyarrow al leer)"""
+    if not os.path.exists(ruta):
+        return pd.DataFrame()
+    return pd.read_parquet(ruta, columns=columnas,
+                           filters=[('Jornada', '==', jornada), ('Partido', '==', partido)])
+
+@registrar_actualizador
+def actualizar_cubo_equipo_jornada(carpeta):
+    """Recalcula las filas (Equipo, Jornada, Partido) del cubo de totales físicos para un partido"""
+    jornada, partido = jornada_partido_desde_carpeta(carpeta)
+    if not jornada or not partido:
+        print(f"⚠️ Carpeta sin jornada/partido, cubo no actualizado: {carpeta}")
+        return 0
+
+    df = leer_filas_partido(RENDIMIENTO_PATH, jornada, partido)
+    if df.empty:
+        print(f"⚠️ Sin filas de rendimiento para {carpeta}")
+        return 0
+
+    suma = [c for c in COLUMNAS_SUMA if c in df.columns]
+    maximo = [c for c in COLUMNAS_MAXIMO if c in df.columns]
+    for columna in suma + maximo:
+        df[columna] = pd.to_numeric(df[columna], errors='coerce')
+
+    agregaciones = {c: 'sum' for c in suma}
+    agregaciones.update({c: 'max' for c in maximo})
+    nuevas = df.groupby(['Equipo', 'Jornada', 'Partido'], as_index=False).agg(agregaciones)
+    nuevas['Jugadores'] = df.groupby(['Equipo', 'Jornada', 'Partido']).size().values
+
+    if os.path.exists(CUBO_EQUIPO_JORNADA_PATH):
+        cubo = pd.read_parquet(CUBO_EQUIPO_JORNADA_PATH)
+        mismo_partido = (cubo['Jornada'] == jornada) & (cubo['Partido'] == partido)
+        cubo = pd.concat([cubo[~mismo_partido], nuevas], ignore_index=True)
+    else:
+        cubo = nuevas
+
+    guardar_parquet_atomico(cubo, CUBO_EQUIPO_JORNADA_PATH)
+    print(f"✅ Cubo equipo/jornada actualizado: {len(nuevas)} filas de {carpeta}")
+    return len(nuevas)
+
+def actualizar_agregados(carpeta):
+    """Ejecuta todos los actualizadores registrados para una carpeta; devuelve {nombre: ok}"""
+    resultados = {}
+    for actualizador in ACTUALIZADORES_AGREGADOS:
+        try:
+            actualizador(carpeta)
+            resultados[actualizador.__name__] = True
+        except Exception as e:
+            print(f"❌ Error en {actualizador.__name__} para {carpeta}: {e}")
+            resultados[actualizador.__name__] = False
+    return resultados
@@ -0,0 +1,169 @@
+import json
+import os
+import zipfile
+import re
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+# Versión ejecutable de 1.carpetas_con_jornada.ipynb: renombra Partido_<id> a j<jornada>_<partido>
+base_path = 'VCF_Mediacoach_Data/Temporada_24_25/La_Liga/Partidos'
+
+# Índice de ingesta compartido con vigilante_partidos.py; los textos LALIGA se cachean en 'etiquetas'
+INDICE_PATH = 'data/ingesta_indice.json'
+
+def cargar_indice(ruta=INDICE_PATH):
+    if os.path.exists(ruta):
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Índice de ingesta ilegible ({e}), se reconstruye")
+    return {'carpetas': {}}
+
+def guardar_indice(indice, ruta=INDICE_PATH):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    ruta_tmp = ruta + '.tmp'
+    with open(ruta_tmp, 'w', encoding='utf-8') as f:
+        json.dump(indice, f, indent=2, ensure_ascii=False)
+    os.replace(ruta_tmp, ruta)
+
+def buscar_texto_en_shared_strings(z):
+    """Lee xl/sharedStrings.xml en streaming y devuelve la primera cadena que empieza por LALIGA"""
+    try:
+        f = z.open('xl/sharedStrings.xml')
+    except KeyError:
+        return None
+
+    with f:
+        for _, elem in ET.iterparse(f, events=('end',)):
+            if elem.tag.rsplit('}', 1)[-1] != 'si':
+                continue
+            texto = ''.join(elem.itertext())
+            elem.clear()
+            if texto.lstrip().startswith('LALIGA'):
+                return texto.replace('\n', ' ').strip()
+    return None
+
+def buscar_texto_en_todos_los_xml(z, file_path):
+    """Búsqueda completa original: decodifica cada .xml del zip (solo si sharedStrings no lo tiene)"""
+    for name in z.namelist():
+        if name.endswith('.xml'):
+            with z.open(name) as f:
+                try:
+                    content = f.read().decode('utf-8', errors='ignore')
+                    # Buscar el texto que empiece por LALIGA
+                    matches = re.findall(r'>\s*(LALIGA.*?)<', content, re.DOTALL)
+                    if matches:
+                        # Retorna la primera coincidencia encontrada
+                        return matches[0].replace('\n', ' ').strip()
+                except Exception as e:
+                    print(f"Error leyendo {name} dentro de {file_path}: {e}")
+    return None
+
+def buscar_texto_en_excel(file_path):
+    try:
+        with zipfile.ZipFile(file_path, 'r') as z:
+            texto = buscar_texto_en_shared_strings(z)
+            if texto is None:
+                texto = buscar_texto_en_todos_los_xml(z, file_path)
+            return texto
+    except Exception as e:
+        print(f"Error abriendo {file_path}: {e}")
+    return None
+
+def buscar_texto_cacheado(file_path, cache):
+    """buscar_texto_en_excel con caché por nombre de archivo, tamaño y mtime (sobrevive al renombrado de la carpeta)"""
+    st = os.stat(file_path)
+    clave = os.path.basename(file_path)
+    huella = [st.st_size, st.st_mtime_ns]
+
+    registro = cache.get(clave)
+    if registro and registro.get('huella') == huella:
+        return registro['texto']
+
+    texto = buscar_texto_en_excel(file_path)
+    cache[clave] = {'huella': huella, 'texto': texto}
+    return texto
+
+def localizar_rendimiento_1(folder_path):
+    """Primer rendimiento_1*.xlsx de la carpeta, o None"""
+    for file in os.listdir(folder_path):
+        if file.startswith('rendimiento_1') and file.endswith('.xlsx'):
+            return os.path.join(folder_path, file)
+    return None
+
+def nombre_carpeta_desde_texto(texto):
+    """Construye 'j<jornada>_<partido>' a partir del texto 'LALIGA ... | J5 | Local - Visitante (...)'"""
+    # Extraer jornada
+    jornada_match = re.search(r'\b(J\d+)\b', texto)
+    # Extraer partido (después de la última '|')
+    partido_match = re.search(r'\|\s*[^|]*\|\s*(J\d+)\s*\|\s*(.*?)\s*\(', texto)
+
+    if not (jornada_match and partido_match):
+        return None
+
+    jornada = jornada_match.group(1).lower()
+    partido = partido_match.group(2).strip()
+
+    # Formatear el nombre final de carpeta
+    nuevo_nombre = f"{jornada}_{partido}"
+    return nuevo_nombre.lower().replace(' - ', '-').replace(' ', '')
+
+def etiquetar_carpeta(base_path, folder_name, cache=None):
+    """Renombra una carpeta de partido según su rendimiento_1*.xlsx y devuelve su nombre final"""
+    folder_path = os.path.join(base_path, folder_name)
+    file_path = localizar_rendimiento_1(folder_path)
+    if not file_path:
+        return folder_name
+
+    if cache is None:
+        texto = buscar_texto_en_excel(file_path)
+    else:
+        texto = buscar_texto_cacheado(file_path, cache)
+
+    if texto:
+        try:
+            print(f"Texto encontrado en {file_path}: {texto}")
+            nuevo_nombre = nombre_carpeta_desde_texto(texto)
+
+            if nuevo_nombre:
+                new_folder_path = os.path.join(base_path, nuevo_nombre)
+                if new_folder_path != folder_path:
+                    print(f'Renombrando: {folder_path} -> {new_folder_path}')
+                    os.rename(folder_path, new_folder_path)
+                    return nuevo_nombre
+            else:
+                print(f"No se pudo extraer jornada o partido de: {texto}")
+        except Exception as e:
+            print(f"Error procesando {file_path}: {e}")
+    else:
+        print(f"No se encontró texto LALIGA en: {file_path}")
+
+    return folder_name
+
+def etiquetar_carpetas(base_path=base_path, workers=8):
+    """Renombra cada carpeta de partido según el texto LALIGA de su rendimiento_1*.xlsx"""
+    indice = cargar_indice()
+    cache = indice.setdefault('etiquetas', {})
+    carpetas = [c for c in os.listdir(base_path) if os.path.isdir(os.path.join(base_path, c))]
+
+    # Lectura de los xlsx en paralelo (llena la caché); los renombrados se hacen después en serie
+    def precargar(carpeta):
+        file_path = localizar_rendimiento_1(os.path.join(base_path, carpeta))
+        if file_path:
+            buscar_texto_cacheado(file_path, cache)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        list(executor.map(precargar, carpetas))
+
+    renombradas = 0
+    for folder_name in carpetas:
+        if etiquetar_carpeta(base_path, folder_name, cache) != folder_name:
+            renombradas += 1
+
+    guardar_indice(indice)
+    print(f"✅ Carpetas renombradas: {renombradas}")
+    return renombradas
+
+if __name__ == "__main__":
+    etiquetar_carpetas()
@@ -10,6 +10,7 @@ from datetime import datetime
 from collections import defaultdict
 import logging
 import re
+import xml.etree.ElementTree as ET
 
 # Configurar logging
 logging.basicConfig(
@@ -21,6 +22,60 @@ logging.basicConfig(
     ]
 )
 
+# Bytes máximos que se inspeccionan para categorizar un archivo (coste constante por archivo)
+BYTES_CABECERA = 4096
+
+# Hojas que identifican los XLSX de rendimiento y de máxima exigencia
+HOJAS_RENDIMIENTO = {'físico', 'fisico', '5', '10', '15'}
+PALABRAS_MAXIMA_EXIGENCIA = ('maxima', 'máxima', 'exigencia')
+
+def leer_nombres_zip(content):
+    """Devuelve los nombres del directorio central del ZIP sin descomprimir ningún miembro"""
+    try:
+        with zipfile.ZipFile(io.BytesIO(content), 'r') as zip_file:
+            return zip_file.namelist()
+    except Exception:
+        return []
+
+def leer_hojas_xlsx(content):
+    """Lee solo xl/workbook.xml para obtener los nombres de las hojas del XLSX"""
+    try:
+        with zipfile.ZipFile(io.BytesIO(content), 'r') as zip_file:
+            with zip_file.open('xl/workbook.xml') as workbook:
+                hojas = []
+                for _, elem in ET.iterparse(workbook, events=('start',)):
+                    if elem.tag.rsplit('}', 1)[-1] == 'sheet' and elem.get('name'):
+                        hojas.append(elem.get('name'))
+                return hojas
+    except Exception:
+        return []
+
+def leer_primeros_elementos_xml(content, max_elementos=8):
+    """Parsea incrementalmente la cabecera del XML y devuelve los primeros elementos (tag, atributos)"""
+    parser = ET.XMLPullParser(events=('start',))
+    elementos = []
+    cabecera = content[:BYTES_CABECERA]
+    try:
+        for inicio in range(0, len(cabecera), 512):
+            parser.feed(cabecera[inicio:inicio + 512])
+            for _, elem in parser.read_events():
+                elementos.append((elem.tag.rsplit('}', 1)[-1], dict(elem.attrib)))
+                if len(elementos) >= max_elementos:
+                    return elementos
+    except ET.ParseError:
+        pass
+    return elementos
+
+def leer_linea_cabecera_csv(content):
+    """Devuelve solo la primera línea (cabecera) del CSV"""
+    linea = content[:BYTES_CABECERA].split(b'\n', 1)[0]
+    for encoding in ('utf-8', 'latin1'):
+        try:
+            return linea.decode(encoding).strip().lstrip('\ufeff')
+        except UnicodeDecodeError:
+            continue
+    return ''
+
 def detectar_tipo_archivo(content, content_type=None):
     """Detecta el tipo de archivo basándose en magic numbers y content-type"""
     if not content:
@@ -30,21 +85,18 @@ def detectar_tipo_archivo(content, content_type=None):
     if content.startswith(b'%PDF'):
         return 'pdf'
     elif content.startswith(b'PK\x03\x04'):  # ZIP-based files (XLSX, DOCX, etc.)
-        try:
-            with zipfile.ZipFile(io.BytesIO(content), 'r') as zip_file:
-                if 'xl/workbook.xml' in zip_file.namelist():
-                    return 'xlsx'
-                elif 'word/document.xml' in zip_file.namelist():
-                    return 'docx'
-        except:
-            pass
+        nombres = leer_nombres_zip(content)
+        if 'xl/workbook.xml' in nombres:
+            return 'xlsx'
+        elif 'word/document.xml' in nombres:
+            return 'docx'
         return 'zip'
-    elif content.startswith(b'<?xml') or content.startswith(b'<'):
+    elif content.lstrip(b'\xef\xbb\xbf \t\r\n')[:1] == b'<':
         return 'xml'
     else:
-        # Intentar detectar CSV por contenido
+        # Intentar detectar CSV por las primeras líneas
         try:
-            content_str = content.decode('utf-8', errors='ignore')[:1000]
+            content_str = content[:1000].decode('utf-8', errors='ignore')
             if (';' in content_str or ',' in content_str) and '\n' in content_str:
                 lines = content_str.split('\n')[:5]
                 if len(lines) > 1:
@@ -60,18 +112,27 @@ def detectar_tipo_archivo(content, content_type=None):
     return 'bin'
 
 def analizar_contenido_xml(content):
-    """Analiza el contenido del XML para categorizarlo"""
+    """Analiza los primeros elementos del XML para categorizarlo"""
     try:
-        content_str = content.decode('utf-8', errors='ignore')[:2000]
+        elementos = leer_primeros_elementos_xml(content)
+        if not elementos:
+            return 'general'
+        
+        tags = [tag for tag, _ in elementos]
+        raiz_tag, raiz_attrib = elementos[0]
+        texto_cabecera = ' '.join(
+            tags +
+            [f"{clave} {valor}" for _, attrib in elementos for clave, valor in attrib.items()]
+        ).lower()
         
         # Buscar patrones específicos
-        if 'ALL_INSTANCES' in content_str and 'instance' in content_str:
+        if 'ALL_INSTANCES' in tags or 'instance' in tags:
             return 'eventos_partido'
-        elif 'IdGame' in content_str and 'start' in content_str and 'end' in content_str:
+        elif 'IdGame' in raiz_attrib:
             return 'eventos_partido'
-        elif 'beyond' in content_str.lower() or 'stats' in content_str.lower():
+        elif 'beyond' in texto_cabecera or 'stats' in texto_cabecera:
             return 'beyond_stats'
-        elif 'maxima' in content_str.lower() or 'exigencia' in content_str.lower():
+        elif 'maxima' in texto_cabecera or 'exigencia' in texto_cabecera:
             return 'maxima_exigencia'
         else:
             return 'general'
@@ -79,39 +140,40 @@ def analizar_contenido_xml(content):
         return 'general'
 
 def analizar_contenido_csv(content):
-    """Analiza el contenido del CSV para categorizarlo"""
+    """Analiza la línea de cabecera del CSV para categorizarlo"""
     try:
-        content_str = content.decode('utf-8', errors='ignore')[:1000]
+        header = leer_linea_cabecera_csv(content).lower()
         
         # Buscar patrones en headers
-        if 'equipo' in content_str.lower() or 'team' in content_str.lower():
+        if 'equipo' in header or 'team' in header:
             return 'equipos'
-        elif 'jugador' in content_str.lower() or 'player' in content_str.lower():
+        elif 'jugador' in header or 'player' in header:
             return 'jugadores'
-        else:
-            # Analizar estructura para determinar tipo
-            lines = content_str.split('\n')[:3]
-            if len(lines) > 0:
-                header = lines[0].lower()
-                if any(word in header for word in ['nombre', 'name', 'player', 'jugador']):
-                    return 'jugadores'
-                elif any(word in header for word in ['equipo', 'team', 'club']):
-                    return 'equipos'
-            return 'general'
+        elif any(word in header for word in ['nombre', 'name']):
+            return 'jugadores'
+        elif 'club' in header:
+            return 'equipos'
+        return 'general'
     except:
         return 'general'
 
 def analizar_contenido_xlsx(content, posicion_original=None):
-    """Analiza el contenido del XLSX para categorizarlo"""
+    """Analiza los nombres de hoja del XLSX (workbook.xml) para categorizarlo"""
     try:
-        # Usar posición original como hint si está disponible
+        hojas = [hoja.strip().lower() for hoja in leer_hojas_xlsx(content)]
+        
+        if hojas and any(hoja in HOJAS_RENDIMIENTO for hoja in hojas):
+            return 'rendimiento'
+        if any(palabra in hoja for hoja in hojas for palabra in PALABRAS_MAXIMA_EXIGENCIA):
+            return 'maxima_exigencia'
+        
+        # Usar posición original como hint si las hojas no son concluyentes
         if posicion_original is not None:
             if posicion_original in [0, 1]:  # Posiciones típicas de rendimiento
                 return 'rendimiento'
             elif posicion_original in [11, 12]:  # Posiciones típicas de máxima exigencia
                 return 'maxima_exigencia'
         
-        # Si no podemos determinar por posición, usar análisis básico
         return 'general'
     except:
         return 'general'
@@ -405,10 +467,17 @@ def obtener_ids(max_match_day, season_id, temporada, competition_id, competicion
         logging.error(f"Error obteniendo matches: {e}")
         return []
 
-def main():
-    """Función principal"""
-    logging.info("=== DESCARGADOR MEDIACOACH - ORGANIZACIÓN POR PARTIDO ===")
-    
+# Configuración de temporadas y competiciones
+TEMPORADAS = [{"nombre": "Temporada 24-25", "id": "3a134240-833f-41dd-c6b0-3d6b87479c15", "input": 0},
+              {"nombre": "Temporada 23-24", "id": "3a0bf8ee-7f55-aeb6-fd31-273f2d45aefa", "input": 1}]
+
+COMPETICIONES = [{"nombre": "La Liga", "id": "39df9ec8-be91-4be5-1925-4b670a4cbed9", "input": 0},
+                 {"nombre": "La Liga 2", "id": "39df9ec8-becb-86ea-b5e8-600c1b47968d", "input": 1}]
+
+API_URL_BASE = "https://club-api.mediacoach.es"
+
+def obtener_token():
+    """Obtiene el token de acceso a la API de MediaCoach"""
     # Configuración de autenticación
     client_id = '58191b89-cee4-11ed-a09d-ee50c5eb4bb5'
     scope = 'b2bapiclub-api'
@@ -436,34 +505,69 @@ def main():
         AccessToken = token_response.get('access_token', '')
         expires_in = token_response.get('expires_in', '')
         logging.info(f'Token obtenido exitosamente (expira en {expires_in}s)')
+        return AccessToken
     else:
         logging.error(f'Error obteniendo token: {response.status_code}')
-        return
+        return None
+
+def ejecutar_curl_comando(comando):
+    """Ejecuta un comando curl y devuelve su salida JSON (None si falla)"""
+    process = subprocess.Popen(comando, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True)
+    stdout, stderr = process.communicate()
+    if process.returncode != 0:
+        logging.error("Error en el comando curl:")
+        logging.error(stderr.decode())
+        return None
+    return json.loads(stdout)
+
+def nombre_carpeta(nombre):
+    """Convierte 'Temporada 24-25' / 'La Liga' en el nombre de carpeta usado en disco"""
+    return nombre.replace(" ", "_").replace("-", "_")
+
+def ejecutar_descarga(indice_temporada, indice_competicion, max_match_day):
+    """
+    Descarga sin interacción los partidos nuevos de una temporada y competición
+    
+    Args:
+        indice_temporada (int): Índice en TEMPORADAS (0 = 24-25, 1 = 23-24)
+        indice_competicion (int): Índice en COMPETICIONES (0 = La Liga, 1 = La Liga 2)
+        max_match_day (int): Se descargan los partidos de jornadas anteriores a este valor
+    
+    Returns:
+        int: Número de partidos procesados exitosamente
+    """
+    temporada_cfg = TEMPORADAS[indice_temporada]
+    competicion_cfg = COMPETICIONES[indice_competicion]
+    temporada = nombre_carpeta(temporada_cfg["nombre"])
+    competicion = nombre_carpeta(competicion_cfg["nombre"])
+    archivo_ids = f'ids_procesados_{competicion}.csv'
+    
+    AccessToken = obtener_token()
+    if not AccessToken:
+        return 0
 
     # Configuración de la API
     SubscriptionKey = '729f9154234d4ff3bb0a692c6a0510c4'
-    api_url_base = "https://club-api.mediacoach.es"
     credenciales = f"--header 'Ocp-Apim-Subscription-Key: {SubscriptionKey}' --header 'Authorization: Bearer {AccessToken}'"
 
-    def ejecutar_curl_comando(comando):
-        process = subprocess.Popen(comando, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True)
-        stdout, stderr = process.communicate()
-        if process.returncode != 0:
-            logging.error("Error en el comando curl:")
-            logging.error(stderr.decode())
-            return None
-        return json.loads(stdout)
-
-    # Configuración de temporadas y competiciones
-    temporadas = [{"nombre": "Temporada 24-25", "id": "3a134240-833f-41dd-c6b0-3d6b87479c15", "input": 0},
-                  {"nombre": "Temporada 23-24", "id": "3a0bf8ee-7f55-aeb6-fd31-273f2d45aefa", "input": 1}]
+    # Obtener y procesar partidos
+    ids = obtener_ids(max_match_day, temporada_cfg["id"], temporada, competicion_cfg["id"], competicion, 
+                     archivo_ids, credenciales, API_URL_BASE, ejecutar_curl_comando)
+    
+    if not ids:
+        logging.info("No hay partidos nuevos para procesar.")
+        return 0
+    
+    return procesar_partidos(ids, temporada, competicion, archivo_ids, 
+                             credenciales, API_URL_BASE, ejecutar_curl_comando)
 
-    competiciones = [{"nombre": "La Liga", "id": "39df9ec8-be91-4be5-1925-4b670a4cbed9", "input": 0},
-                     {"nombre": "La Liga 2", "id": "39df9ec8-becb-86ea-b5e8-600c1b47968d", "input": 1}]
+def main():
+    """Función principal"""
+    logging.info("=== DESCARGADOR MEDIACOACH - ORGANIZACIÓN POR PARTIDO ===")
 
     # Interfaz de usuario
     print("Lista de temporadas disponibles:")
-    for temporada in temporadas:
+    for temporada in TEMPORADAS:
         print(f'{temporada["nombre"]}, seleccione {temporada["input"]}')
 
     input_temporadas = int(input("Seleccione una temporada: "))
@@ -471,13 +575,10 @@ def main():
         print("Esa no es una opción válida, selecciona 0 o 1")
         input_temporadas = int(input("Seleccione una temporada: "))
 
-    season_id = temporadas[input_temporadas]["id"]
-    season_name = temporadas[input_temporadas]["nombre"]
-    temporada = season_name.replace(" ", "_").replace("-", "_")
-    print(f"Ha elegido la temporada {season_name}")
+    print(f"Ha elegido la temporada {TEMPORADAS[input_temporadas]['nombre']}")
 
     print("Lista de competiciones disponibles:")
-    for competicion in competiciones:
+    for competicion in COMPETICIONES:
         print(f'{competicion["nombre"]}, seleccione {competicion["input"]}')
 
     input_competiciones = int(input("Seleccione una competición: "))
@@ -485,25 +586,17 @@ def main():
         print("Esa no es una opción válida, selecciona 0 o 1")
         input_competiciones = int(input("Seleccione una competición: "))
 
-    competition_id = competiciones[input_competiciones]["id"]
-    competition_name = competiciones[input_competiciones]["nombre"]
-    competicion = competition_name.replace(" ", "_").replace("-", "_")
-    print(f"Ha elegido la competición {competition_name}")
+    print(f"Ha elegido la competición {COMPETICIONES[input_competiciones]['nombre']}")
 
-    archivo_ids = f'ids_procesados_{competicion}.csv'
     max_match_day = input("Ingrese la cantidad de días de partidos (Ej: 1, 2, 15, etc.): ")
     print(f"Ha elegido {max_match_day} días de partidos")
 
-    # Obtener y procesar partidos
-    ids = obtener_ids(max_match_day, season_id, temporada, competition_id, competicion, 
-                     archivo_ids, credenciales, api_url_base, ejecutar_curl_comando)
+    partidos_procesados = ejecutar_descarga(input_temporadas, input_competiciones, max_match_day)
     
-    if ids:
-        partidos_procesados = procesar_partidos(ids, temporada, competicion, archivo_ids, 
-                                              credenciales, api_url_base, ejecutar_curl_comando)
+    if partidos_procesados:
         print(f"\n✅ Procesamiento completado: {partidos_procesados} partidos procesados exitosamente")
     else:
         print("No hay partidos nuevos para procesar.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,276 @@
+"""
+Orquestador incremental: descarga -> etiquetado -> extracción -> informes.
+
+Cada etapa declara entradas y salidas (globs). Una etapa solo se vuelve a ejecutar si la
+huella de sus entradas (ruta, tamaño, mtime) o sus parámetros han cambiado desde la última
+ejecución correcta, o si falta alguna de sus salidas. Las entradas de cada etapa incluyen las
+salidas de las anteriores, así que un cambio aguas arriba se detecta por la huella y una etapa
+anterior que se ejecuta sin cambiar nada no arrastra a las siguientes. Las etapas independientes de un mismo
+nivel se ejecutan en paralelo y los tiempos quedan registrados en el manifiesto.
+
+Ejecutar desde prueba_extraccion/:
+    python pipeline_mediacoach.py
+    python pipeline_mediacoach.py --descargar --max-jornada 36 --equipos "Sevilla FC" --jornadas 31-35
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+DIRECTORIO_EXTRACCION = os.path.dirname(os.path.abspath(__file__))
+DIRECTORIO_INFORMES = os.path.dirname(DIRECTORIO_EXTRACCION)
+
+BASE_PATH = 'VCF_Mediacoach_Data/Temporada_24_25/La_Liga/Partidos'
+MANIFEST_PATH = 'data/pipeline_manifest.json'
+LOGS_PATH = 'data/logs'
+
+def definir_etapas(args):
+    """Devuelve las etapas del pipeline con sus entradas, salidas y dependencias"""
+    etapas = []
+
+    if args.descargar:
+        etapas.append({
+            'nombre': 'descargar',
+            'comando': [sys.executable, os.path.join(DIRECTORIO_INFORMES, 'lote_informes.py'), 'descargar',
+                        '--temporada', str(args.temporada), '--competicion', str(args.competicion),
+                        '--max-jornada', str(args.max_jornada)],
+            # Siempre consulta la API; lo que descargue (carpetas de partido) lo detectan las huellas
+            # de las etapas siguientes
+            'entradas': [f'{BASE_PATH}/*'],
+            'salidas': [],
+            'depende_de': [],
+            'siempre': True,
+        })
+
+    dependencia_descarga = ['descargar'] if args.descargar else []
+
+    etapas += [
+        {
+            'nombre': 'etiquetar',
+            'comando': [sys.executable, 'etiquetar_carpetas.py'],
+            # Renombra las carpetas de partido: su lista (nombres) es entrada y salida de la etapa
+            'entradas': [f'{BASE_PATH}/*', f'{BASE_PATH}/*/rendimiento_1*.xlsx', 'etiquetar_carpetas.py'],
+            'salidas': [f'{BASE_PATH}/*'],
+            'depende_de': dependencia_descarga,
+        },
+        {
+            'nombre': 'eventos',
+            'comando': [sys.executable, '2.extraer_eventos_xml.py'],
+            'entradas': [f'{BASE_PATH}/*/*.xml', '2.extraer_eventos_xml.py'],
+            'salidas': ['data/eventos_partido.parquet'],
+            'depende_de': ['etiquetar'],
+        },
+        {
+            'nombre': 'rendimiento',
+            'comando': ['node', '3.extraer_rendimiento_xlsx.js'],
+            'entradas': [f'{BASE_PATH}/*/rendimiento_*.xlsx', '3.extraer_rendimiento_xlsx.js'],
+            'salidas': ['data/rendimiento_fisico.parquet'],
+            'depende_de': ['etiquetar'],
+        },
+        {
+            'nombre': 'maxima_exigencia',
+            'comando': ['node', '4.extraer_maxima_exigencia.js'],
+            'entradas': [f'{BASE_PATH}/*/maxima_exigencia_*.xlsx', f'{BASE_PATH}/*/otro_xlsx*.xlsx',
+                         '4.extraer_maxima_exigencia.js'],
+            'salidas': ['data/maxima_exigencia.parquet'],
+            'depende_de': ['etiquetar'],
+        },
+        {
+            'nombre': 'estadisticas',
+            'comando': [sys.executable, '5.extraer_estadisticas_csv.py'],
+            'entradas': [f'{BASE_PATH}/*/postpartido*.csv', '5.extraer_estadisticas_csv.py'],
+            'salidas': ['data/estadisticas_equipo.parquet', 'data/estadisticas_jugador.parquet'],
+            'depende_de': ['etiquetar'],
+        },
+    ]
+
+    if args.equipos and args.jornadas:
+        comando = [sys.executable, os.path.join(DIRECTORIO_INFORMES, 'lote_informes.py'), 'informes',
+                   '--equipos', *args.equipos, '--jornadas', args.jornadas, '--workers', str(args.workers)]
+        if args.informes:
+            comando += ['--informes', *args.informes]
+        etapas.append({
+            'nombre': 'informes',
+            'comando': comando,
+            # Todo el código de informes: cada informe importa los módulos compartidos
+            # (datos_compartidos, plantillas, registro, caché...) además de su fisico*.py
+            'entradas': ['data/rendimiento_fisico.parquet', os.path.join(DIRECTORIO_INFORMES, '*.py')],
+            'salidas': [],
+            'depende_de': ['rendimiento'],
+            'cwd': DIRECTORIO_INFORMES,
+        })
+
+    return etapas
+
+def huella_entradas(etapa):
+    """Huella de las entradas de una etapa: ruta, tamaño y mtime de cada archivo, más el comando"""
+    h = hashlib.sha256()
+    h.update(json.dumps(etapa['comando']).encode('utf-8'))
+    for patron in etapa['entradas']:
+        for ruta in sorted(glob.glob(patron)):
+            try:
+                st = os.stat(ruta)
+            except OSError:
+                continue
+            h.update(f"{ruta}|{st.st_size}|{st.st_mtime_ns}\n".encode('utf-8'))
+    return h.hexdigest()
+
+def salidas_presentes(etapa):
+    """True si todas las salidas declaradas existen"""
+    return all(glob.glob(patron) for patron in etapa['salidas'])
+
+def cargar_manifest(ruta=MANIFEST_PATH):
+    if os.path.exists(ruta):
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Manifiesto ilegible ({e}), se reconstruye")
+    return {'etapas': {}}
+
+def guardar_manifest(manifest, ruta=MANIFEST_PATH):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    ruta_tmp = ruta + '.tmp'
+    with open(ruta_tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(ruta_tmp, ruta)
+
+def ordenar_por_niveles(etapas):
+    """Agrupa las etapas en niveles topológicos; las de un mismo nivel son independientes"""
+    nombres = {etapa['nombre'] for etapa in etapas}
+    pendientes = {etapa['nombre']: etapa for etapa in etapas}
+    resueltas = set()
+    niveles = []
+
+    while pendientes:
+        nivel = [etapa for etapa in pendientes.values()
+                 if all(dep in resueltas or dep not in nombres for dep in etapa['depende_de'])]
+        if not nivel:
+            raise ValueError(f"Dependencias circulares entre etapas: {sorted(pendientes)}")
+        niveles.append(nivel)
+        for etapa in nivel:
+            resueltas.add(etapa['nombre'])
+            del pendientes[etapa['nombre']]
+
+    return niveles
+
+def necesita_ejecutarse(etapa, manifest, forzar=False):
+    """Decide si la etapa debe ejecutarse y devuelve (bool, motivo)"""
+    if forzar:
+        return True, 'forzado'
+    if etapa.get('siempre'):
+        return True, 'siempre'
+
+    registro = manifest['etapas'].get(etapa['nombre'])
+    if not registro or not registro.get('ok'):
+        return True, 'sin ejecución previa correcta'
+    if not salidas_presentes(etapa):
+        return True, 'faltan salidas'
+    if registro.get('huella') != huella_entradas(etapa):
+        return True, 'entradas modificadas'
+
+    return False, 'sin cambios'
+
+def ejecutar_etapa(etapa):
+    """Ejecuta el comando de la etapa guardando su salida en data/logs/<etapa>.log"""
+    os.makedirs(LOGS_PATH, exist_ok=True)
+    ruta_log = os.path.join(LOGS_PATH, f"{etapa['nombre']}.log")
+    inicio = time.perf_counter()
+
+    try:
+        with open(ruta_log, 'w', encoding='utf-8') as log:
+            proceso = subprocess.run(etapa['comando'], cwd=etapa.get('cwd', DIRECTORIO_EXTRACCION),
+                                     stdout=log, stderr=subprocess.STDOUT)
+        ok = proceso.returncode == 0
+        error = None if ok else f"código de salida {proceso.returncode} (ver {ruta_log})"
+    except Exception as e:
+        ok, error = False, str(e)
+
+    return {'ok': ok, 'error': error, 'segundos': round(time.perf_counter() - inicio, 2)}
+
+def ejecutar_pipeline(etapas, forzar=False, workers=4):
+    """Ejecuta el pipeline nivel a nivel y devuelve el resumen por etapa"""
+    manifest = cargar_manifest()
+    fallidas = set()
+    resumen = {}
+
+    for nivel in ordenar_por_niveles(etapas):
+        a_ejecutar = []
+        for etapa in nivel:
+            if any(dep in fallidas for dep in etapa['depende_de']):
+                resumen[etapa['nombre']] = {'estado': 'omitida', 'motivo': 'dependencia fallida', 'segundos': 0}
+                fallidas.add(etapa['nombre'])
+                continue
+
+            ejecutar, motivo = necesita_ejecutarse(etapa, manifest, forzar)
+            if ejecutar:
+                print(f"▶️  {etapa['nombre']}: {motivo}")
+                a_ejecutar.append(etapa)
+            else:
+                print(f"⏭️  {etapa['nombre']}: {motivo}")
+                resumen[etapa['nombre']] = {'estado': 'al día', 'motivo': motivo, 'segundos': 0}
+
+        if not a_ejecutar:
+            continue
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            resultados = list(executor.map(ejecutar_etapa, a_ejecutar))
+
+        for etapa, resultado in zip(a_ejecutar, resultados):
+            nombre = etapa['nombre']
+            resumen[nombre] = {
+                'estado': 'ok' if resultado['ok'] else 'error',
+                'motivo': resultado['error'] or '',
+                'segundos': resultado['segundos'],
+            }
+            if resultado['ok']:
+                manifest['etapas'][nombre] = {
+                    'ok': True,
+                    'huella': huella_entradas(etapa),
+                    'segundos': resultado['segundos'],
+                    'timestamp': datetime.now().isoformat(),
+                }
+            else:
+                fallidas.add(nombre)
+                manifest['etapas'][nombre] = {
+                    'ok': False,
+                    'error': resultado['error'],
+                    'segundos': resultado['segundos'],
+                    'timestamp': datetime.now().isoformat(),
+                }
+        guardar_manifest(manifest)
+
+    print("\n📊 Resumen del pipeline:")
+    for nombre, info in resumen.items():
+        print(f"   {nombre:<18} {info['estado']:<8} {info['segundos']:7.1f}s  {info['motivo']}")
+
+    return resumen
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pipeline incremental MediaCoach -> informes")
+    parser.add_argument('--descargar', action='store_true', help="Incluir la descarga desde la API")
+    parser.add_argument('--temporada', type=int, default=0)
+    parser.add_argument('--competicion', type=int, default=0)
+    parser.add_argument('--max-jornada', type=int)
+    parser.add_argument('--equipos', nargs='+', help="Equipos para la etapa de informes")
+    parser.add_argument('--jornadas', help="Jornadas para la etapa de informes (ej. 31-35)")
+    parser.add_argument('--informes', nargs='+', help="Subconjunto de informes a generar")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--forzar', action='store_true', help="Ejecutar todas las etapas")
+    args = parser.parse_args(argv)
+
+    if args.descargar and args.max_jornada is None:
+        parser.error("--descargar requiere --max-jornada")
+
+    os.chdir(DIRECTORIO_EXTRACCION)
+    resumen = ejecutar_pipeline(definir_etapas(args), forzar=args.forzar, workers=args.workers)
+    return 1 if any(info['estado'] == 'error' for info in resumen.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
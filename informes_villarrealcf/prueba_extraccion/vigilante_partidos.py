@@ -0,0 +1,205 @@
+"""
+Vigilante de la carpeta Partidos: ingesta automática de cada partido nuevo.
+
+Sondea VCF_Mediacoach_Data/.../Partidos con un índice de mtime/tamaño por carpeta. Una carpeta
+nueva o modificada se procesa cuando deja de cambiar durante --debounce segundos (o antes, si ya
+contiene el resumen_partido_*.json que el descargador escribe al final). Para esa carpeta se ejecuta
+el etiquetado, los cuatro extractores filtrados a ese partido y los agregados registrados en
+agregados_ingesta.py.
+
+Ejecutar desde prueba_extraccion/:
+    python vigilante_partidos.py                    # bucle continuo
+    python vigilante_partidos.py --una-vez          # una pasada (cron)
+    python vigilante_partidos.py --procesar-existentes
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from agregados_ingesta import actualizar_agregados
+from etiquetar_carpetas import cargar_indice, etiquetar_carpeta, guardar_indice
+
+DIRECTORIO_EXTRACCION = os.path.dirname(os.path.abspath(__file__))
+
+BASE_PATH = 'VCF_Mediacoach_Data/Temporada_24_25/La_Liga/Partidos'
+LOGS_PATH = 'data/logs'
+
+EXTRACTORES = {
+    'eventos': [sys.executable, '2.extraer_eventos_xml.py'],
+    'rendimiento': ['node', '3.extraer_rendimiento_xlsx.js'],
+    'maxima_exigencia': ['node', '4.extraer_maxima_exigencia.js'],
+    'estadisticas': [sys.executable, '5.extraer_estadisticas_csv.py'],
+}
+
+def firma_carpeta(carpeta_path):
+    """(nº archivos, tamaño total, mtime máximo) de una carpeta; cambia mientras se está escribiendo"""
+    num_archivos, tamano, mtime = 0, 0, 0
+    completa = False
+    with os.scandir(carpeta_path) as entradas:
+        for entrada in entradas:
+            if not entrada.is_file():
+                continue
+            st = entrada.stat()
+            num_archivos += 1
+            tamano += st.st_size
+            mtime = max(mtime, st.st_mtime_ns)
+            if entrada.name.startswith('resumen_partido_') and entrada.name.endswith('.json'):
+                completa = True
+    return [num_archivos, tamano, mtime], completa
+
+def escanear(base_path=BASE_PATH):
+    """Devuelve {carpeta: (firma, completa)} para las carpetas de partido actuales"""
+    carpetas = {}
+    with os.scandir(base_path) as entradas:
+        for entrada in entradas:
+            if entrada.is_dir():
+                try:
+                    carpetas[entrada.name] = firma_carpeta(entrada.path)
+                except OSError:
+                    continue  # Carpeta renombrada o borrada durante el escaneo
+    return carpetas
+
+def ejecutar_extractor(etapa, comando, carpeta):
+    """Lanza un extractor limitado a una carpeta, con log en data/logs/ingesta_<etapa>.log"""
+    os.makedirs(LOGS_PATH, exist_ok=True)
+    ruta_log = os.path.join(LOGS_PATH, f"ingesta_{etapa}.log")
+    try:
+        with open(ruta_log, 'a', encoding='utf-8') as log:
+            log.write(f"\n=== {datetime.now().isoformat()} {carpeta} ===\n")
+            log.flush()
+            proceso = subprocess.run(comando + [carpeta], cwd=DIRECTORIO_EXTRACCION,
+                                     stdout=log, stderr=subprocess.STDOUT)
+        return proceso.returncode == 0
+    except Exception as e:
+        print(f"❌ {etapa} ({carpeta}): {e}")
+        return False
+
+def ingerir_carpeta(carpeta, base_path=BASE_PATH, cache=None):
+    """Etiqueta, extrae y agrega un único partido; devuelve (nombre final, ok)"""
+    inicio = time.perf_counter()
+    print(f"📥 Ingesta de {carpeta}")
+
+    carpeta_final = etiquetar_carpeta(base_path, carpeta, cache)
+
+    # Los extractores escriben parquets distintos, así que pueden ir en paralelo
+    with ThreadPoolExecutor(max_workers=len(EXTRACTORES)) as executor:
+        futuros = {etapa: executor.submit(ejecutar_extractor, etapa, comando, carpeta_final)
+                   for etapa, comando in EXTRACTORES.items()}
+        resultados = {etapa: futuro.result() for etapa, futuro in futuros.items()}
+
+    fallidos = [etapa for etapa, ok in resultados.items() if not ok]
+    if fallidos:
+        print(f"   ❌ Extractores con error: {', '.join(fallidos)} (ver {LOGS_PATH}/ingesta_*.log)")
+
+    agregados = actualizar_agregados(carpeta_final)
+    ok = not fallidos and all(agregados.values())
+
+    estado = '✅' if ok else '⚠️'
+    print(f"   {estado} {carpeta_final} ingerida en {time.perf_counter() - inicio:.1f}s")
+    return carpeta_final, ok
+
+def pasada(indice, pendientes, debounce, base_path=BASE_PATH):
+    """
+    Una pasada del vigilante: detecta cambios y procesa las carpetas estables
+
+    Args:
+        indice (dict): Índice persistente {'carpetas': {nombre: {'firma', 'ok', 'timestamp'}}}
+        pendientes (dict): Carpetas en espera {nombre: {'firma', 'desde'}} (solo en memoria)
+        debounce (float): Segundos sin cambios para considerar una carpeta completa
+
+    Returns:
+        int: Carpetas ingeridas en esta pasada
+    """
+    ahora = time.monotonic()
+    actuales = escanear(base_path)
+    ingeridas = 0
+
+    for carpeta in list(pendientes):
+        if carpeta not in actuales:
+            del pendientes[carpeta]
+
+    for carpeta, (firma, completa) in actuales.items():
+        registro = indice['carpetas'].get(carpeta)
+        if registro and registro.get('ok') and registro.get('firma') == firma:
+            continue
+
+        espera = pendientes.get(carpeta)
+        if espera is None or espera['firma'] != firma:
+            pendientes[carpeta] = {'firma': firma, 'desde': ahora}
+            if espera is None:
+                print(f"🆕 Cambios en {carpeta}, esperando a que se estabilice")
+            continue
+
+        estable = ahora - espera['desde']
+        if estable < debounce and not (completa and estable > 0):
+            continue
+
+        del pendientes[carpeta]
+        carpeta_final, ok = ingerir_carpeta(carpeta, base_path, indice.setdefault('etiquetas', {}))
+        try:
+            firma_final, _ = firma_carpeta(os.path.join(base_path, carpeta_final))
+        except OSError:
+            firma_final = firma
+
+        indice['carpetas'].pop(carpeta, None)
+        indice['carpetas'][carpeta_final] = {
+            'firma': firma_final,
+            'ok': ok,
+            'timestamp': datetime.now().isoformat(),
+        }
+        guardar_indice(indice)
+        ingeridas += 1
+
+    return ingeridas
+
+def registrar_existentes(indice, base_path=BASE_PATH):
+    """Marca como ingeridas las carpetas actuales (ya cubiertas por pipeline_mediacoach.py)"""
+    for carpeta, (firma, _) in escanear(base_path).items():
+        indice['carpetas'][carpeta] = {'firma': firma, 'ok': True, 'timestamp': datetime.now().isoformat()}
+    guardar_indice(indice)
+    print(f"📋 {len(indice['carpetas'])} carpetas existentes registradas como línea base")
+
+def vigilar(intervalo=5.0, debounce=30.0, una_vez=False, procesar_existentes=False, base_path=BASE_PATH):
+    """Bucle principal del vigilante"""
+    if not os.path.exists(base_path):
+        print(f"❌ No se encuentra la ruta: {base_path}")
+        return 1
+
+    indice = cargar_indice()
+    if not indice.setdefault('carpetas', {}) and not procesar_existentes:
+        registrar_existentes(indice, base_path)
+
+    pendientes = {}
+    print(f"👀 Vigilando {base_path} (cada {intervalo:.0f}s, debounce {debounce:.0f}s)")
+
+    try:
+        while True:
+            pasada(indice, pendientes, debounce, base_path)
+            if una_vez and not pendientes:
+                break
+            time.sleep(intervalo)
+    except KeyboardInterrupt:
+        print("\n⏹️ Vigilante detenido")
+
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingesta automática de carpetas de partido nuevas")
+    parser.add_argument('--intervalo', type=float, default=5.0, help="Segundos entre sondeos")
+    parser.add_argument('--debounce', type=float, default=30.0,
+                        help="Segundos sin cambios para dar una carpeta por completa")
+    parser.add_argument('--una-vez', action='store_true',
+                        help="Procesar lo pendiente y salir (para cron)")
+    parser.add_argument('--procesar-existentes', action='store_true',
+                        help="Sin índice previo, ingerir también las carpetas ya presentes")
+    args = parser.parse_args(argv)
+
+    os.chdir(DIRECTORIO_EXTRACCION)
+    return vigilar(args.intervalo, args.debounce, args.una_vez, args.procesar_existentes)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import os
+from difflib import SequenceMatcher
+
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.offsetbox import OffsetImage
+from PIL import Image
+
+# Registro de imágenes (escudos, balón, fondos) compartido por todos los informes del proceso:
+#   - índice de assets/escudos construido una vez: equipo -> ruta sin sondear el disco
+#   - cada PNG se decodifica una sola vez
+#   - variantes reducidas para que los escudos de las tablas no se incrusten a 1024 px en el PDF
+ESCUDOS_DIR = "assets/escudos"
+DPI_OBJETIVO = 300
+TAMANOS_VARIANTE = (64, 128, 256, 512)
+
+_IMAGENES = {}
+_VARIANTES = {}
+_ORIGEN = {}
+_INDICE_ESCUDOS = {}
+_RUTAS_ESCUDO = {}
+
+def establecer_dpi_objetivo(dpi):
+    """DPI final de los informes; determina el tamaño de las variantes reducidas"""
+    global DPI_OBJETIVO
+    DPI_OBJETIVO = dpi
+
+def _normalizar(nombre):
+    return nombre.lower().replace(' ', '').replace('_', '')
+
+def indice_escudos(directorio=ESCUDOS_DIR):
+    """{nombre normalizado: ruta} de los PNG de escudos; se reconstruye si cambia la carpeta"""
+    try:
+        version = os.stat(directorio).st_mtime_ns
+    except OSError:
+        return {}
+
+    registro = _INDICE_ESCUDOS.get(directorio)
+    if registro is None or registro[0] != version:
+        indice = {}
+        for entrada in sorted(os.scandir(directorio), key=lambda e: e.name):
+            if entrada.is_file() and entrada.name.lower().endswith('.png'):
+                indice.setdefault(_normalizar(entrada.name[:-4]), entrada.path)
+        registro = (version, indice)
+        _INDICE_ESCUDOS[directorio] = registro
+        _RUTAS_ESCUDO.clear()
+    return registro[1]
+
+def ruta_escudo(equipo, alias=(), similitud_minima=None, directorio=ESCUDOS_DIR):
+    """
+    Resuelve la ruta del escudo de un equipo (memoizado)
+
+    Busca el nombre normalizado (sin mayúsculas, espacios ni '_') del equipo y de sus alias en el
+    índice; si se indica similitud_minima, prueba después por similitud con los nombres de archivo.
+    """
+    indice = indice_escudos(directorio)
+    clave = (directorio, equipo, tuple(alias), similitud_minima)
+    if clave in _RUTAS_ESCUDO:
+        return _RUTAS_ESCUDO[clave]
+
+    ruta = None
+    for nombre in (equipo, *alias):
+        ruta = indice.get(_normalizar(nombre))
+        if ruta:
+            break
+
+    if ruta is None and similitud_minima is not None:
+        equipo_limpio = equipo.lower().replace(' ', '').replace('fc', '').replace('cf', '')
+        for ruta_candidata in indice.values():
+            nombre_archivo = os.path.basename(ruta_candidata).lower().replace('.png', '')
+            if SequenceMatcher(None, equipo_limpio, nombre_archivo).ratio() > similitud_minima:
+                ruta = ruta_candidata
+                break
+
+    _RUTAS_ESCUDO[clave] = ruta
+    return ruta
+
+def cargar_imagen(ruta):
+    """plt.imread con caché por proceso: cada escudo/fondo se decodifica una sola vez"""
+    st = os.stat(ruta)
+    clave = (os.path.abspath(ruta), st.st_mtime_ns, st.st_size)
+    if clave not in _IMAGENES:
+        imagen = plt.imread(ruta)
+        _IMAGENES[clave] = imagen
+        _ORIGEN[id(imagen)] = clave
+    return _IMAGENES[clave]
+
+def _reducir(imagen, lado):
+    datos = imagen
+    if datos.dtype != np.uint8:
+        datos = (np.clip(datos, 0, 1) * 255).round().astype(np.uint8)
+    alto, ancho = datos.shape[:2]
+    escala = lado / max(alto, ancho)
+    tamano = (max(1, round(ancho * escala)), max(1, round(alto * escala)))
+    return np.asarray(Image.fromarray(datos).resize(tamano, Image.LANCZOS))
+
+def variante_reducida(imagen, lado):
+    """Copia con el lado mayor reducido a 'lado' px; cacheada si la imagen viene de cargar_imagen"""
+    origen = _ORIGEN.get(id(imagen))
+    if origen is None:
+        return _reducir(imagen, lado)
+
+    clave = (origen, lado)
+    if clave not in _VARIANTES:
+        _VARIANTES[clave] = _reducir(imagen, lado)
+    return _VARIANTES[clave]
+
+def imagen_offset(imagen, zoom=1, **kwargs):
+    """
+    OffsetImage que usa la menor variante suficiente para su tamaño final a DPI_OBJETIVO
+
+    El zoom se corrige para que el tamaño en la página sea el mismo que con la imagen original.
+    """
+    lado_original = max(imagen.shape[:2])
+    lado_necesario = lado_original * zoom * DPI_OBJETIVO / 72
+    lado = next((t for t in TAMANOS_VARIANTE if t >= lado_necesario), None)
+
+    if lado is not None and lado < lado_original:
+        variante = variante_reducida(imagen, lado)
+        zoom *= lado_original / max(variante.shape[:2])
+        imagen = variante
+
+    return OffsetImage(imagen, zoom=zoom, **kwargs)
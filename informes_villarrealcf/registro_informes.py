@@ -0,0 +1,247 @@
+import importlib
+import io
+import threading
+
+# Registro de informes físicos: id -> módulo, función generar_* y firma de parámetros
+#   'equipo_jornadas'        -> funcion(equipo, jornadas, mostrar, guardar, borrador)
+#   'jornadas'               -> funcion(jornadas, mostrar, guardar, borrador)  (solo Villarreal CF)
+#   'equipo_jornada_maxima'  -> funcion(equipo, jornada_maxima, tipo_partido_filter, mostrar, guardar, borrador)
+#   'equipo_jornada'         -> funcion(equipo, jornada, mostrar, guardar, borrador)
+# 'pdf' es el estilo con el que cada informe guarda su página (ver OPCIONES_PDF)
+# 'datos' es el alcance de filas que lee el informe, (equipos, jornadas), usado por cache_informes:
+#   equipos: 'equipo', 'villarreal', 'equipo_y_villarreal' o 'liga'
+#   jornadas: 'seleccion' (las pedidas) o 'temporada' (todas; p.ej. al rellenar demarcaciones vacías)
+# 'ventana_liga' (opcional): el informe usa las últimas n jornadas de toda la liga hasta la de
+#   referencia; esa ventana entra en la clave de caché porque depende de filas de otros equipos
+INFORMES = {
+    'minutos': {
+        'modulo': 'fisico1_mediacoach_minutos_jugados',
+        'funcion': 'generar_reporte_personalizado',
+        'firma': 'equipo_jornadas',
+        'pdf': 'transparente',
+        'datos': ('equipo', 'seleccion'),
+    },
+    'distancias': {
+        'modulo': 'fisico2_mediacoach_distancias_recorridas',
+        'funcion': 'generar_reporte_distancias_personalizado',
+        'firma': 'equipo_jornadas',
+        'pdf': 'transparente',
+        'datos': ('equipo', 'seleccion'),
+    },
+    'distancias_villarreal': {
+        'modulo': 'fisico3_mediacoach_distancias_recorridas_villarrealcf',
+        'funcion': 'generar_reporte_villarreal_personalizado',
+        'firma': 'jornadas',
+        'pdf': 'transparente',
+        'datos': ('villarreal', 'seleccion'),
+    },
+    'zonas': {
+        'modulo': 'fisico4_mediacoach_distancias_por_zonas',
+        'funcion': 'generar_reporte_zonas_personalizado',
+        'firma': 'equipo_jornadas',
+        'pdf': 'transparente',
+        'datos': ('equipo', 'seleccion'),
+    },
+    'sprints': {
+        'modulo': 'fisico5_mediacoach_sprints',
+        'funcion': 'generar_reporte_sprints_personalizado',
+        'firma': 'equipo_jornadas',
+        'pdf': 'transparente',
+        'datos': ('equipo', 'seleccion'),
+    },
+    'sprints_villarreal': {
+        'modulo': 'fisico6_mediacoach_sprints_villarrealcf',
+        'funcion': 'generar_reporte_sprints_villarreal_personalizado',
+        'firma': 'jornadas',
+        'pdf': 'transparente',
+        'datos': ('villarreal', 'seleccion'),
+    },
+    'comparativa_sprints': {
+        'modulo': 'fisico7_mediacoach_comparativa_sprints',
+        'funcion': 'generar_comparativa_sprints_personalizada',
+        'firma': 'equipo_jornadas',
+        'pdf': 'transparente',
+        'datos': ('equipo_y_villarreal', 'seleccion'),
+    },
+    'velocidades': {
+        'modulo': 'fisico8_mediacoach_10jugadores_mas_rapidos',
+        'funcion': 'generar_reporte_velocidades_personalizado',
+        'firma': 'equipo_jornadas',
+        'pdf': 'transparente',
+        'datos': ('liga', 'seleccion'),
+    },
+    'campo_promedio': {
+        'modulo': 'fisico9_mediacoach_datos_promedio',
+        'funcion': 'generar_reporte_campo_personalizado',
+        'firma': 'equipo_jornadas',
+        'pdf': 'blanco',
+        'datos': ('equipo_y_villarreal', 'temporada'),
+    },
+    'campo_graficos': {
+        'modulo': 'fisico10_mediacoach_datos_comparacion',
+        'funcion': 'generar_reporte_graficos_personalizado',
+        'firma': 'equipo_jornadas',
+        'pdf': 'blanco',
+        'datos': ('equipo_y_villarreal', 'temporada'),
+    },
+    'campo_barras': {
+        'modulo': 'fisico11_mediacoach_comparativa_vmax',
+        'funcion': 'generar_reporte_barras_personalizado',
+        'firma': 'equipo_jornadas',
+        'pdf': 'blanco',
+        'datos': ('equipo_y_villarreal', 'temporada'),
+    },
+    'campo_maximos': {
+        'modulo': 'fisico12_mediacoach_datos_maximos',
+        'funcion': 'generar_reporte_campo_maximos',
+        'firma': 'equipo_jornadas',
+        'pdf': 'blanco',
+        'datos': ('equipo_y_villarreal', 'temporada'),
+    },
+    'ultimos_4_partidos': {
+        'modulo': 'fisico13_ultimos4partidos',
+        'funcion': 'generar_4_campos_coordenadas_fijas',
+        'firma': 'equipo_jornada_maxima',
+        'pdf': 'blanco_16_9',
+        'datos': ('equipo', 'temporada'),
+        'ventana_liga': 5,
+    },
+    'posible_11': {
+        'modulo': 'fisico14_mediacoach_posible_11',
+        'funcion': 'generar_posible_11_personalizado',
+        'firma': 'equipo_jornada',
+        'pdf': 'blanco',
+        'datos': ('equipo', 'temporada'),
+    },
+    'campo_completo': {
+        'modulo': 'mapeo_automatico_demarcaciones',
+        'funcion': 'generar_reporte_campo_personalizado',
+        'firma': 'equipo_jornadas',
+        'pdf': 'sin_margenes',
+        'datos': ('equipo_y_villarreal', 'temporada'),
+    },
+}
+
+# Parámetros de savefig que usa cada informe al guardar su propio PDF
+OPCIONES_PDF = {
+    'transparente': dict(bbox_inches='tight', pad_inches=0, facecolor='none', edgecolor='none',
+                         dpi=300, transparent=True),
+    'blanco': dict(dpi=300, bbox_inches='tight', pad_inches=0, facecolor='white', edgecolor='none',
+                   transparent=False),
+    'blanco_16_9': dict(dpi=300, bbox_inches='tight', pad_inches=0, facecolor='white', edgecolor='none',
+                        transparent=False),
+    'sin_margenes': dict(bbox_inches='tight', pad_inches=0, facecolor='none', edgecolor='none',
+                         dpi=300, transparent=False),
+}
+
+FORMATOS_MEMORIA = ('pdf', 'png', 'svg')
+
+# pyplot no es seguro entre hilos: los renders en memoria de un mismo proceso se serializan
+# (para paralelismo real, varios procesos; ver lote_informes)
+_LOCK_RENDER = threading.Lock()
+
+def _preparar_figura(fig, estilo):
+    if estilo == 'transparente':
+        fig.patch.set_alpha(0.0)
+    elif estilo == 'blanco_16_9':
+        fig.set_size_inches(28.8, 16.2)
+
+def guardar_pagina_pdf(pdf, fig, informe_id):
+    """Añade la figura a un PdfPages con el mismo estilo que el PDF individual del informe"""
+    estilo = INFORMES[informe_id]['pdf']
+    _preparar_figura(fig, estilo)
+    pdf.savefig(fig, **OPCIONES_PDF[estilo])
+
+def guardar_figura(fig, informe_id, destino, formato='pdf'):
+    """Guarda la figura con el estilo del informe (PDF de una página, PNG o SVG) en una ruta o en un BytesIO"""
+    if formato == 'pdf':
+        from matplotlib.backends.backend_pdf import PdfPages
+        with PdfPages(destino) as pdf:
+            guardar_pagina_pdf(pdf, fig, informe_id)
+    else:
+        estilo = INFORMES[informe_id]['pdf']
+        _preparar_figura(fig, estilo)
+        fig.savefig(destino, format=formato, **OPCIONES_PDF[estilo])
+
+def cargar_generador(informe_id):
+    """Importa (una sola vez por proceso) el módulo del informe y devuelve su función generar_*"""
+    if informe_id not in INFORMES:
+        raise ValueError(f"Informe desconocido: {informe_id}. Disponibles: {sorted(INFORMES)}")
+
+    config = INFORMES[informe_id]
+    modulo = importlib.import_module(config['modulo'])
+    return getattr(modulo, config['funcion'])
+
+def ejecutar_informe(informe_id, equipo, jornadas, jornada_referencia=None, tipo_partido=None,
+                     mostrar=False, guardar=True, borrador=False):
+    """
+    Ejecuta la función generar_* de un informe adaptando los parámetros a su firma
+
+    Args:
+        informe_id (str): Clave de INFORMES
+        equipo (str): Equipo (ignorado por los informes solo del Villarreal CF)
+        jornadas (list): Jornadas a incluir
+        jornada_referencia (int): Jornada máxima para posible 11 / últimos 4 partidos (por defecto max(jornadas))
+        tipo_partido (str): 'local', 'visitante' o None (solo últimos 4 partidos)
+        borrador (bool): PNG de baja resolución en lugar del PDF final (ver modo_borrador)
+
+    Returns:
+        matplotlib.figure.Figure o None
+    """
+    generador = cargar_generador(informe_id)
+    firma = INFORMES[informe_id]['firma']
+
+    if jornada_referencia is None and jornadas:
+        jornada_referencia = max(jornadas)
+
+    if firma == 'equipo_jornadas':
+        return generador(equipo, jornadas, mostrar=mostrar, guardar=guardar, borrador=borrador)
+    elif firma == 'jornadas':
+        return generador(jornadas, mostrar=mostrar, guardar=guardar, borrador=borrador)
+    elif firma == 'equipo_jornada_maxima':
+        return generador(equipo, jornada_referencia, tipo_partido, mostrar=mostrar, guardar=guardar,
+                         borrador=borrador)
+    elif firma == 'equipo_jornada':
+        return generador(equipo, jornada_referencia, mostrar=mostrar, guardar=guardar, borrador=borrador)
+
+    raise ValueError(f"Firma desconocida para {informe_id}: {firma}")
+
+def renderizar_informe(informe_id, equipo, jornadas, jornada_referencia=None, tipo_partido=None,
+                       formato='pdf', borrador=False):
+    """
+    Renderiza un informe en memoria y devuelve el archivo como bytes
+
+    No escribe en disco ni abre ventanas (backend Agg), así que varias peticiones pueden pedir el
+    mismo informe sin pisarse nombres de archivo. La figura se crea fuera de pyplot (ver
+    ciclo_figuras) y se libera al terminar.
+
+    Args:
+        formato (str): 'pdf', 'png' o 'svg'
+        borrador (bool): PNG de baja resolución (solo con formato='png')
+
+    Returns:
+        bytes o None si no hay datos para la selección
+    """
+    if formato not in FORMATOS_MEMORIA:
+        raise ValueError(f"Formato no soportado: {formato}. Disponibles: {FORMATOS_MEMORIA}")
+    if borrador and formato != 'png':
+        raise ValueError("El modo borrador solo genera PNG")
+
+    from ciclo_figuras import liberar_figura
+
+    with _LOCK_RENDER:
+        fig = ejecutar_informe(informe_id, equipo, jornadas, jornada_referencia, tipo_partido,
+                               mostrar=False, guardar=False, borrador=borrador)
+        if fig is None:
+            return None
+
+        try:
+            buffer = io.BytesIO()
+            if borrador:
+                from modo_borrador import escribir_borrador
+                escribir_borrador(fig, buffer)
+            else:
+                guardar_figura(fig, informe_id, buffer, formato)
+            return buffer.getvalue()
+        finally:
+            liberar_figura(fig)
@@ -0,0 +1,140 @@
+from matplotlib import cbook, rcParams
+from matplotlib.artist import Artist, allow_rasterization
+from matplotlib.collections import PatchCollection
+from matplotlib.colors import to_rgba
+from matplotlib.font_manager import FontProperties
+from matplotlib.patches import Rectangle
+from matplotlib.transforms import Bbox
+
+# Renderizado por lotes de las tablas de jugadores.
+# Cada celda era un Rectangle y cada valor un Text: cientos de artistas por tabla, cada uno con su
+# propio ciclo de dibujo. TablaLote acumula las celdas y los textos y los añade al final como una
+# PatchCollection (fondos y bordes, conservando color, alpha y grosor de cada celda) y un único
+# artista de textos que comparte fuentes y métricas. El resultado es el mismo que con
+# ax.add_patch/ax.text (parches bajo los textos, zorder 1 y 3), pero con unos pocos artistas.
+
+_HA = {'center': 0.5, 'left': 0.0, 'right': 1.0}
+_VA = ('center', 'top', 'bottom', 'baseline')
+
+class TextosLote(Artist):
+    """Artista que dibuja muchos textos de una línea sin rotación con un solo ciclo de dibujo"""
+
+    def __init__(self, textos, zorder=3):
+        super().__init__()
+        self.textos = textos
+        self.set_zorder(zorder)
+        self.set_clip_on(False)  # Igual que ax.text: los textos no se recortan al eje
+
+    def _colocar(self, renderer):
+        """Posición de la línea base, tamaño y fuente de cada texto en coordenadas de pantalla"""
+        dpi = self.figure.dpi
+        fuentes = {}
+        metricas = {}
+        puntos = self.axes.transData.transform([(t['x'], t['y']) for t in self.textos])
+
+        colocados = []
+        for texto, (px, py) in zip(self.textos, puntos):
+            clave_fuente = (texto['fontsize'], texto['weight'])
+            if clave_fuente not in fuentes:
+                fuente = FontProperties(size=texto['fontsize'], weight=texto['weight'])
+                # Altura mínima de línea como Text ('lp'), para que todas las celdas alineen igual
+                _, lp_alto, lp_descenso = renderer.get_text_width_height_descent('lp', fuente, ismath=False)
+                fuentes[clave_fuente] = (fuente, lp_alto, lp_descenso)
+            fuente, lp_alto, lp_descenso = fuentes[clave_fuente]
+
+            clave_metrica = (texto['s'], clave_fuente, dpi)
+            if clave_metrica not in metricas:
+                ancho, alto, descenso = renderer.get_text_width_height_descent(texto['s'], fuente, ismath=False)
+                metricas[clave_metrica] = (ancho, max(alto, lp_alto), max(descenso, lp_descenso))
+            ancho, alto, descenso = metricas[clave_metrica]
+
+            x = px - ancho * _HA[texto['ha']]
+            if texto['va'] == 'center':
+                y = py - alto / 2 + descenso
+            elif texto['va'] == 'top':
+                y = py - alto + descenso
+            elif texto['va'] == 'bottom':
+                y = py + descenso
+            else:
+                y = py
+            colocados.append((texto, fuente, x, y, ancho, alto, descenso))
+        return colocados
+
+    @allow_rasterization
+    def draw(self, renderer):
+        if not self.get_visible() or not self.textos:
+            return
+
+        renderer.open_group('textos_tabla', self.get_gid())
+        _, alto_lienzo = renderer.get_canvas_width_height()
+        gc = renderer.new_gc()
+        gc.set_antialiased(rcParams['text.antialiased'])
+
+        for texto, fuente, x, y, _, _, _ in self._colocar(renderer):
+            if renderer.flipy():
+                y = alto_lienzo - y
+            gc.set_foreground(to_rgba(texto['color']), isRGBA=True)
+            gc.set_alpha(texto['alpha'])
+            renderer.draw_text(gc, x, y, texto['s'], fuente, 0, ismath=False)
+
+        gc.restore()
+        renderer.close_group('textos_tabla')
+        self.stale = False
+
+    def get_window_extent(self, renderer=None):
+        if renderer is None:
+            renderer = self.figure._get_renderer()
+        if not self.textos:
+            return Bbox.null()
+        cajas = [Bbox.from_bounds(x, y - descenso, ancho, alto)
+                 for _, _, x, y, ancho, alto, descenso in self._colocar(renderer)]
+        return Bbox.union(cajas)
+
+class TablaLote:
+    """
+    Acumula las celdas y textos de una tabla y los dibuja con pocos artistas
+
+    Uso:
+        tabla = TablaLote(ax)
+        tabla.celda(x, y, ancho, alto, facecolor='#2c3e50', edgecolor='white', linewidth=1)
+        tabla.texto(x + ancho/2, y + alto/2, '90', fontsize=8, weight='bold', color='white')
+        tabla.dibujar()
+    """
+
+    def __init__(self, ax):
+        self.ax = ax
+        self.celdas = {}
+        self.textos = {}
+
+    def celda(self, x, y, ancho, alto, facecolor='none', edgecolor='none', linewidth=1.0, alpha=None, zorder=1):
+        """Rectángulo de fondo (mismos argumentos que plt.Rectangle)"""
+        rectangulo = Rectangle((x, y), ancho, alto, facecolor=facecolor, edgecolor=edgecolor,
+                               linewidth=linewidth, alpha=alpha)
+        self.celdas.setdefault(zorder, []).append(rectangulo)
+
+    def texto(self, x, y, s, fontsize=None, color=None, weight='normal', ha='center', va='center',
+              alpha=None, zorder=3, **kwargs):
+        """Texto de una línea; con otros estilos (path_effects, rotation, bbox...) usa ax.text"""
+        s = str(s)
+        fontsize = fontsize if fontsize is not None else rcParams['font.size']
+        color = color if color is not None else rcParams['text.color']
+
+        if kwargs or '\n' in s or ha not in _HA or va not in _VA or cbook.is_math_text(s):
+            self.ax.text(x, y, s, fontsize=fontsize, color=color, weight=weight, ha=ha, va=va,
+                         alpha=alpha, zorder=zorder, **kwargs)
+            return
+        if s:
+            self.textos.setdefault(zorder, []).append({
+                'x': x, 'y': y, 's': s, 'fontsize': fontsize, 'weight': weight,
+                'color': color, 'ha': ha, 'va': va, 'alpha': alpha,
+            })
+
+    def dibujar(self):
+        """Añade al eje una PatchCollection y un TextosLote por zorder"""
+        for zorder, rectangulos in self.celdas.items():
+            coleccion = PatchCollection(rectangulos, match_original=True, zorder=zorder, joinstyle='miter')
+            self.ax.add_collection(coleccion, autolim=False)
+        for zorder, textos in self.textos.items():
+            self.ax.add_artist(TextosLote(textos, zorder))
+        self.celdas = {}
+        self.textos = {}